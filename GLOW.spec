@@ -45,11 +45,23 @@ a = Analysis(
         'jupyter',
         'notebook',
         'IPython',
+        'tkinter',
+        'test',
+        'pytest',
+        'PIL.ImageQt',
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.QtQml',
+        'PyQt6.QtQuick',
+        'PyQt6.Qt3DCore',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    # Drop asserts; optimize=2 would also strip the docstrings the agent
+    # turns into tool descriptions (needs PyInstaller 6.6+)
+    optimize=1,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
@@ -57,17 +69,15 @@ pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,  # one-dir build: libraries go in COLLECT below
     name='GLOW',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    # UPX-packed DLLs are unpacked in memory on every load and are a
+    # common antivirus false-positive trigger
+    upx=False,
     console=False,  # No console window
     disable_windowed_traceback=False,
     target_arch=None,
@@ -76,3 +86,14 @@ exe = EXE(
     icon='assets/glow_icon.ico' if os.path.exists('assets/glow_icon.ico') else None,
     version_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='GLOW',
+)
@@ -0,0 +1,145 @@
+"""
+Agent Cache - Disk persistence for learned plans and generated tools
+Keeps planner output across restarts so repeat requests skip the LLM
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+# Default location for cache files
+CACHE_DIR = Path.home() / ".glow"
+
+# Set GLOW_DISABLE_CACHE=1 to turn off plan/tool caching (useful while
+# iterating on prompts, where cached plans would hide the change)
+CACHE_DISABLED = os.getenv("GLOW_DISABLE_CACHE", "").strip().lower() in ("1", "true", "yes")
+
+
+class CacheStore:
+    """
+    Small SQLite key/value store with per-table LRU limits
+
+    Writes are queued and applied by a background thread so callers never
+    wait on disk; load() shares that thread's connection under a lock.
+    """
+
+    def __init__(self, path: Path, tables: Tuple[str, ...]):
+        """
+        Args:
+            path: SQLite file to use (created if missing)
+            tables: Names of the key/value tables to keep in it
+        """
+        self.path = Path(path)
+        self.tables = tables
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # Serialises load() against the writer's transactions on _conn
+        self._lock = threading.Lock()
+        for table in tables:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+        self._conn.commit()
+
+        self._write_q: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="cache-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+        atexit.register(self.close)
+
+    def load(self, table: str, limit: int) -> List[Tuple[str, str]]:
+        """Return up to limit (key, value) rows, least recently used first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM {table} ORDER BY used_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def put(self, table: str, key: str, value: str, limit: int):
+        """Queue an insert/replace, then trim the table to limit rows"""
+        self._write_q.put(("put", table, key, value, limit))
+
+    def touch(self, table: str, key: str):
+        """Queue a last-used update so hits survive LRU trimming"""
+        self._write_q.put(("touch", table, key))
+
+    def delete(self, table: str, key: str):
+        """Queue removal of a row"""
+        self._write_q.put(("delete", table, key))
+
+    def _writer_loop(self):
+        """Background writer: apply queued operations in one transaction per batch"""
+        while True:
+            ops = [self._write_q.get()]
+            while True:
+                try:
+                    ops.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._apply([op for op in ops if op is not None])
+            except Exception as e:
+                print(f"[CACHE] Background write failed: {e}")
+
+            if None in ops:
+                return
+
+    def _apply(self, ops: List[tuple]):
+        if not ops:
+            return
+        now = time.time()
+        trims = {}
+        with self._lock, self._conn:
+            for op in ops:
+                if op[0] == "put":
+                    _, table, key, value, limit = op
+                    self._conn.execute(
+                        f"INSERT INTO {table} (key, value, created_at, used_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, used_at = excluded.used_at",
+                        (key, value, now, now)
+                    )
+                    trims[table] = limit
+                elif op[0] == "delete":
+                    _, table, key = op
+                    self._conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+                else:
+                    _, table, key = op
+                    self._conn.execute(f"UPDATE {table} SET used_at = ? WHERE key = ?", (now, key))
+            for table, limit in trims.items():
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE key NOT IN "
+                    f"(SELECT key FROM {table} ORDER BY used_at DESC LIMIT ?)",
+                    (limit,)
+                )
+
+    def close(self):
+        """Apply pending writes, stop the writer thread and close the database"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_q.put(None)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache_store(filename: str, tables: Tuple[str, ...], cache_dir: Optional[Path] = None) -> Optional[CacheStore]:
+    """Open a cache file under cache_dir, or return None if caching is disabled or unavailable"""
+    if CACHE_DISABLED:
+        return None
+    try:
+        return CacheStore(Path(cache_dir or CACHE_DIR) / filename, tables)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[CACHE] Persistent cache unavailable: {e}")
+        return None
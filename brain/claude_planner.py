@@ -5,7 +5,7 @@ Uses Claude API for planning, compatible with GeminiPlanner interface
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import anthropic
 
@@ -146,7 +146,7 @@ RESPONSE FORMAT (JSON):
     }},
     ...
   ],
-  "final_response": "What to tell the user when done",
+  "final_response": "What to tell the user when done; include $stepN_result wherever a step returns information the user asked for (e.g. \"Your battery: $step1_result\")",
   "requires_confirmation": false,
   "confirmation_message": "Optional message if confirmation needed"
 }}
@@ -220,7 +220,8 @@ Generate the JSON plan now:"""
     def conversational_response(
         self,
         user_input: str,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate a conversational response without tool execution
@@ -229,6 +230,8 @@ Generate the JSON plan now:"""
         Args:
             user_input: User's message
             context: Conversation context
+            on_delta: If given, the reply is streamed and each text piece
+                is passed to it as it arrives
 
         Returns:
             AI response
@@ -255,15 +258,28 @@ User: {user_input}
 Respond conversationally and helpfully. If the user is asking about your capabilities, explain what you can do. If they're asking a question, answer it. Be friendly and concise."""
 
         try:
-            response = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=1000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            assistant_response = response.content[0].text
+            if on_delta is None:
+                response = self.client.messages.create(
+                    model=self.model_name,
+                    max_tokens=1000,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                assistant_response = response.content[0].text
+            else:
+                parts = []
+                with self.client.messages.stream(
+                    model=self.model_name,
+                    max_tokens=1000,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                ) as stream:
+                    for piece in stream.text_stream:
+                        parts.append(piece)
+                        on_delta(piece)
+                assistant_response = "".join(parts)
 
             # Add to history
             self.conversation_history.append({
@@ -5,12 +5,36 @@ Uses Gemini for complex planning, then FunctionGemma for execution
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import google.generativeai as genai
 from google.generativeai.types import HarmBlockThreshold, HarmCategory
 
 
+# Appended to the planning prompt so one call also classifies the request
+INTENT_SUFFIX = """
+
+ALSO CLASSIFY THE REQUEST. Add an "intent" object at the top level of the JSON:
+"intent": {
+  "intent_type": "action|question|conversation",
+  "needs_tools": true|false,
+  "confidence": 0.0-1.0,
+  "explanation": "Brief explanation"
+}
+If needs_tools is false (just chatting), return "steps": []."""
+
+
+def _stream_text(response, on_delta: Callable[[str], None]) -> str:
+    """Pass each chunk of a streamed Gemini response to on_delta and return the full text"""
+    parts = []
+    for chunk in response:
+        piece = chunk.text
+        if piece:
+            parts.append(piece)
+            on_delta(piece)
+    return "".join(parts)
+
+
 class GeminiPlanner:
     """
     Uses Gemini API for intelligent planning and task breakdown
@@ -83,6 +107,47 @@ class GeminiPlanner:
                 "plan": None
             }
 
+    def analyze_and_plan(
+        self,
+        user_request: str,
+        available_tools: List[str],
+        context: Dict[str, Any] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Analyze intent and create the execution plan in a single round trip
+
+        Args:
+            user_request: What the user wants to do
+            available_tools: List of available tool names
+            context: Current context
+
+        Returns:
+            Dict with "intent" (as analyze_intent) and "plan_result" (as
+            create_execution_plan), or None if the response could not be
+            split, in which case callers should make the two calls separately
+        """
+        prompt = self._build_planning_prompt(user_request, available_tools, context) + INTENT_SUFFIX
+
+        try:
+            response = self.model.generate_content(prompt)
+            plan_text = response.text
+        except Exception:
+            return None
+
+        plan = self._parse_plan(plan_text)
+        intent = plan.pop("intent", None)
+        if not isinstance(intent, dict) or "needs_tools" not in intent:
+            return None
+
+        return {
+            "intent": intent,
+            "plan_result": {
+                "success": True,
+                "plan": plan,
+                "raw_response": plan_text
+            }
+        }
+
     def _build_planning_prompt(
         self,
         user_request: str,
@@ -201,7 +266,7 @@ RESPONSE FORMAT (JSON):
     }},
     ...
   ],
-  "final_response": "What to tell the user when done",
+  "final_response": "What to tell the user when done; include $stepN_result wherever a step returns information the user asked for (e.g. \"Your battery: $step1_result\")",
   "requires_confirmation": false,
   "confirmation_message": "Optional message if confirmation needed"
 }}
@@ -301,7 +366,8 @@ Generate the JSON plan now:"""
     def conversational_response(
         self,
         user_input: str,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate a conversational response without tool execution
@@ -310,6 +376,8 @@ Generate the JSON plan now:"""
         Args:
             user_input: User's message
             context: Conversation context
+            on_delta: If given, the reply is streamed and each text piece
+                is passed to it as it arrives
 
         Returns:
             AI response
@@ -336,8 +404,10 @@ User: {user_input}
 Respond conversationally and helpfully. If the user is asking about your capabilities, explain what you can do. If they're asking a question, answer it. Be friendly and concise."""
 
         try:
-            response = self.model.generate_content(prompt)
-            assistant_response = response.text
+            if on_delta is None:
+                assistant_response = self.model.generate_content(prompt).text
+            else:
+                assistant_response = _stream_text(self.model.generate_content(prompt, stream=True), on_delta)
 
             # Add to history
             self.conversation_history.append({
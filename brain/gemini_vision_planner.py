@@ -3,17 +3,108 @@ Gemini Vision Planner - Uses Gemini 2.5 Flash with Native Vision
 Sees the screen in real-time and plans actions based on what it sees
 """
 
+import functools
+import io
 import json
 import os
-import time
-from typing import Any, Dict, List, Optional
+import re
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Union
 import pyautogui
-import base64
-from io import BytesIO
 
 import google.generativeai as genai
 from google.generativeai.types import HarmBlockThreshold, HarmCategory
 
+from .gemini_planner import _stream_text
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# genai.configure is process-global; only re-run it when the key changes
+_configured_api_key: Optional[str] = None
+
+# Words that suggest a chat message is about the screen (substring match, so
+# "seeing" or "what's" count too); one pass instead of a scan per word
+_SCREEN_WORDS_RE = re.compile(r"see|screen|what|where|show|look|find", re.IGNORECASE)
+
+SAFETY_SETTINGS = {
+    "block_none": {
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+    }
+}
+
+
+def _extract_json(text: str) -> Optional[Any]:
+    """
+    Parse the outermost {...} in a model reply, using orjson when it is installed
+
+    Returns None if the reply has no JSON object; raises ValueError if it is malformed.
+    """
+    start = text.find('{')
+    end = text.rfind('}') + 1
+    if start == -1 or end <= start:
+        return None
+    if orjson is not None:
+        return orjson.loads(text[start:end])
+    return json.loads(text[start:end])
+
+
+def _read_until_json_closes(stream) -> str:
+    """
+    Collect text from a streamed response, stopping once the first top-level
+    JSON object is complete (anything the model writes after it is never read)
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+
+    for chunk in stream:
+        text = chunk.text
+        for i, ch in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"' and depth:
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}' and depth:
+                depth -= 1
+                if not depth:
+                    parts.append(text[:i + 1])
+                    return "".join(parts)
+        parts.append(text)
+
+    return "".join(parts)
+
+
+def _configure_genai(api_key: str):
+    """Configure the Gemini SDK once per API key"""
+    global _configured_api_key
+    if _configured_api_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+        _get_gemini_model.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_model(model_name: str, safety_settings_key: str = "block_none") -> genai.GenerativeModel:
+    """Shared GenerativeModel per (model, safety settings) so planners skip the cold start"""
+    return genai.GenerativeModel(
+        model_name=model_name,
+        safety_settings=SAFETY_SETTINGS[safety_settings_key]
+    )
+
 
 class GeminiVisionPlanner:
     """
@@ -37,32 +128,23 @@ class GeminiVisionPlanner:
         if not self.api_key:
             raise ValueError("Gemini API key required")
 
-        genai.configure(api_key=self.api_key)
+        _configure_genai(self.api_key)
         self.model_name = model
-        self.model = genai.GenerativeModel(
-            model_name=self.model_name,
-            safety_settings={
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
-        )
+        self.model = _get_gemini_model(self.model_name)
 
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=64)
 
-    def take_screenshot(self) -> str:
+    def take_screenshot(self) -> bytes:
         """
-        Take a screenshot and return as base64
+        Take a screenshot and return the raw PNG bytes
 
         Returns:
-            Base64 encoded screenshot
+            PNG encoded screenshot (the SDK handles transport encoding)
         """
         screenshot = pyautogui.screenshot()
-        buffered = BytesIO()
+        buffered = io.BytesIO()
         screenshot.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        return img_str
+        return buffered.getvalue()
 
     def analyze_screen(self, question: str) -> str:
         """
@@ -99,37 +181,44 @@ Be specific and accurate."""
 
         return response.text
 
-    def analyze_screen_and_decide(self, prompt: str, screenshot_b64: Optional[str] = None) -> Dict[str, Any]:
+    def analyze_screen_and_decide(
+        self,
+        prompt: str,
+        screenshot_b64: Optional[Union[bytes, str]] = None,
+        mime_type: str = "image/png"
+    ) -> Dict[str, Any]:
         """
         Analyze screen with vision and decide next action (for vision-first orchestrator)
 
         Args:
             prompt: Analysis prompt with context
-            screenshot_b64: Optional base64 screenshot (if not provided, takes new one)
+            screenshot_b64: Optional screenshot, raw bytes or base64 (if not provided, takes new one)
+            mime_type: Image format of screenshot_b64
 
         Returns:
             Dict with observation, next_action, goal_achieved, progress
         """
         if not screenshot_b64:
             screenshot_b64 = self.take_screenshot()
+            mime_type = "image/png"
 
         try:
-            response = self.model.generate_content([
+            # Stream, and stop reading as soon as the decision object is complete
+            stream = self.model.generate_content([
                 prompt,
                 {
-                    'mime_type': 'image/png',
+                    'mime_type': mime_type,
                     'data': screenshot_b64
                 }
-            ])
+            ], stream=True)
 
             # Parse JSON response
-            response_text = response.text.strip()
+            response_text = _read_until_json_closes(stream).strip()
 
             # Extract JSON from response
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
+            decision = _extract_json(response_text)
 
-            if start == -1 or end == 0:
+            if decision is None:
                 # If no JSON found, create a default response
                 return {
                     'observation': response_text,
@@ -138,9 +227,6 @@ Be specific and accurate."""
                     'progress': 'Analyzing...'
                 }
 
-            json_str = response_text[start:end]
-            decision = json.loads(json_str)
-
             return decision
 
         except Exception as e:
@@ -200,26 +286,21 @@ Respond ONLY with valid JSON, no other text."""
 
         try:
             # Parse JSON response
-            result_text = response.text.strip()
-            start = result_text.find('{')
-            end = result_text.rfind('}') + 1
-
-            if start != -1 and end > 0:
-                result = json.loads(result_text[start:end])
-
-                if result.get('found'):
-                    # Convert percentage to pixels
-                    x_percent = result['x']
-                    y_percent = result['y']
-                    x_pixel = int((x_percent / 100) * screen_width)
-                    y_pixel = int((y_percent / 100) * screen_height)
-
-                    return {
-                        'x': x_pixel,
-                        'y': y_pixel,
-                        'confidence': result.get('confidence', 0.5),
-                        'description': result.get('description', '')
-                    }
+            result = _extract_json(response.text.strip())
+
+            if result is not None and result.get('found'):
+                # Convert percentage to pixels
+                x_percent = result['x']
+                y_percent = result['y']
+                x_pixel = int((x_percent / 100) * screen_width)
+                y_pixel = int((y_percent / 100) * screen_height)
+
+                return {
+                    'x': x_pixel,
+                    'y': y_pixel,
+                    'confidence': result.get('confidence', 0.5),
+                    'description': result.get('description', '')
+                }
         except Exception as e:
             print(f"[VISION] Error parsing Gemini response: {e}")
 
@@ -291,7 +372,7 @@ RESPONSE FORMAT (JSON):
       "expected_outcome": "What should happen"
     }}
   ],
-  "final_response": "What to tell user when done",
+  "final_response": "What to tell the user when done; include $stepN_result wherever a step returns information the user asked for (e.g. \"Your battery: $step1_result\")",
   "requires_confirmation": false
 }}
 
@@ -336,10 +417,9 @@ Generate the JSON plan now:"""
     def _parse_plan(self, plan_text: str) -> Dict[str, Any]:
         """Parse plan from Gemini response"""
         try:
-            start = plan_text.find('{')
-            end = plan_text.rfind('}') + 1
+            plan = _extract_json(plan_text)
 
-            if start == -1 or end == 0:
+            if plan is None:
                 return {
                     "analysis": plan_text,
                     "steps": [],
@@ -347,11 +427,9 @@ Generate the JSON plan now:"""
                     "requires_confirmation": False
                 }
 
-            json_str = plan_text[start:end]
-            plan = json.loads(json_str)
             return plan
 
-        except json.JSONDecodeError:
+        except ValueError:
             return {
                 "analysis": plan_text,
                 "steps": [],
@@ -362,13 +440,12 @@ Generate the JSON plan now:"""
     def conversational_response(
         self,
         user_input: str,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
-        """Generate conversational response with screen awareness"""
+        """Generate conversational response with screen awareness, streamed to on_delta if given"""
         # Optionally include screenshot for context
-        include_screenshot = any(word in user_input.lower() for word in [
-            'see', 'screen', 'what', 'where', 'show', 'look', 'find'
-        ])
+        include_screenshot = _SCREEN_WORDS_RE.search(user_input) is not None
 
         self.conversation_history.append({
             "role": "user",
@@ -384,17 +461,20 @@ Respond conversationally and helpfully. Be friendly and concise."""
         try:
             if include_screenshot:
                 screenshot = self.take_screenshot()
-                response = self.model.generate_content([
+                contents = [
                     prompt,
                     {
                         'mime_type': 'image/png',
                         'data': screenshot
                     }
-                ])
+                ]
             else:
-                response = self.model.generate_content(prompt)
+                contents = prompt
 
-            assistant_response = response.text
+            if on_delta is None:
+                assistant_response = self.model.generate_content(contents).text
+            else:
+                assistant_response = _stream_text(self.model.generate_content(contents, stream=True), on_delta)
 
             self.conversation_history.append({
                 "role": "assistant",
@@ -426,13 +506,9 @@ Respond in JSON format:
 
         try:
             response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-
-            start = result_text.find('{')
-            end = result_text.rfind('}') + 1
-
-            if start != -1 and end != 0:
-                return json.loads(result_text[start:end])
+            intent = _extract_json(response.text.strip())
+            if intent is not None:
+                return intent
 
         except Exception:
             pass
@@ -3,13 +3,112 @@ Groq API Integration for Planning
 Uses Groq API for ultra-fast planning, compatible with GeminiPlanner interface
 """
 
+import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
 
 from groq import Groq
 
 
+# One client (and HTTP connection pool) per API key, shared by all planners
+_groq_client_cache: Dict[str, Groq] = {}
+
+
+def _get_groq_client(api_key: str) -> Groq:
+    """Return the shared Groq client for this API key"""
+    client = _groq_client_cache.get(api_key)
+    if client is None:
+        client = Groq(api_key=api_key)
+        _groq_client_cache[api_key] = client
+    return client
+
+
+# Completion budget for one plan, and the most a batched call may ask for
+# (some Groq models cap completions at 8k tokens and reject anything above)
+PLAN_MAX_TOKENS = 2000
+BATCH_MAX_TOKENS = 8192
+
+
+def _request_index(value: Any) -> Optional[int]:
+    """The 1-based request number of a batch entry ("for_request" may come back as a string)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+TOOL_SIGNATURES = """
+TOOL SIGNATURES (use EXACT parameter names):
+  - send_whatsapp_message(contact_name: str, message: str)
+  - open_chrome(url: Optional[str] = None)
+  - search_google(query: str)
+  - open_youtube(query: Optional[str] = None)  # Searches YouTube but does NOT click
+  - click_first_result()  # Click first video/search result
+  - launch_application(app_path: str)  # Use "app_path" not "application_name"
+  - create_folder(path: str)
+  - create_word_document(filename: str, content: str, save_path: Optional[str] = None)
+  - write_file(file_path: str, content: str, append: bool = False)  # Use "file_path" NOT "filename" or "path"
+  - find_large_files(min_size_mb: int = 100, search_path: Optional[str] = None)  # Use "search_path" NOT "path"
+  - read_screen_text()  # Read text from screen using OCR (basic text only)
+  - analyze_screen_with_ai(task: str = "Describe what you see")  # AI vision analysis - BEST for charts, images, complex UI
+  - analyze_code_on_screen()  # Returns the code from screen as a string
+  - optimize_code(code: str, optimization_goal: str = "performance")  # Takes code string, returns AI-optimized version
+  - get_desktop_path()  # Returns desktop path as string
+  - get_resource_usage()  # Returns CPU/RAM usage
+  - open_in_vscode(file_path: str)  # Opens file in VS Code
+  - list_all_windows()
+  - focus_window(title_substring: str)
+  - extract_key_points(text: str, num_points: int = 5)  # Extract key points from text
+  - summarize_text(text: str, max_sentences: int = 3)  # Summarize text - use "max_sentences" NOT "max_length"
+  - draft_email(to: str, subject: str, content: str)  # Draft an email
+  - type_text(text: str, interval: float = 0.05)  # Type text in active window
+  - type_in_active_window(text: str, interval: float = 0.03)  # Type text live in active window
+"""
+
+PLAN_SCHEMA = """{
+  "analysis": "Brief analysis of what the user wants",
+  "steps": [
+    {
+      "step": 1,
+      "description": "What this step does",
+      "tool": "tool_name_to_use",
+      "parameters": {"param1": "value1"},
+      "expected_outcome": "What should happen"
+    },
+    ...
+  ],
+  "final_response": "What to tell the user when done; include $stepN_result wherever a step returns information the user asked for (e.g. \"Your battery: $step1_result\")",
+  "requires_confirmation": false
+}"""
+
+PLANNING_RULES = """IMPORTANT RULES:
+1. **USE EXACT PARAMETER NAMES** - Check tool signatures above
+   Example: send_whatsapp_message uses "contact_name" NOT "recipient"
+   Example: write_file uses "file_path" NOT "path" or "filename"
+2. Break complex tasks into simple steps
+3. For YouTube video playback (open browser, search YouTube, play video):
+   - Step 1: open_youtube(query="search term")  # This searches YouTube
+   - Step 2: click_first_result()  # This clicks and plays the first video
+4. **VARIABLE SUBSTITUTION** - Chain results from previous steps:
+   - Use $step1_result, $step2_result, $step3_result, etc. to reference previous step outputs
+   - Example workflow:
+     Step 1: analyze_code_on_screen() -> stores result in $step1_result
+     Step 2: optimize_code(code="$step1_result", optimization_goal="performance")
+     Step 3: get_desktop_path() -> stores path in $step3_result
+     Step 4: write_file(file_path="$step3_result/optimized.py", content="$step2_result")
+   - NEVER use {result from step N} or <step N result> - ONLY use $stepN_result
+5. **REAL EXAMPLE** - Screen analysis to Notepad:
+   Step 1: analyze_screen_with_ai(task="Analyze this chart and extract key trends") -> $step1_result contains analysis
+   Step 2: summarize_text(text="$step1_result", max_sentences=3) -> $step2_result contains summary
+   Step 3: open_notepad() -> Opens Notepad
+   Step 4: type_in_active_window(text="$step2_result") -> Types the summary into Notepad
+
+   TIP: For charts/images/UI, use analyze_screen_with_ai() instead of read_screen_text() for better results!
+6. ALWAYS use $stepN_result syntax for chaining - the system automatically substitutes with actual values"""
+
+
 class GroqPlanner:
     """
     Uses Groq API for intelligent planning and task breakdown
@@ -28,9 +127,15 @@ class GroqPlanner:
         if not self.api_key:
             raise ValueError("Groq API key required. Set GROQ_API_KEY environment variable or pass api_key parameter")
 
-        self.client = Groq(api_key=self.api_key)
+        self.client = _get_groq_client(self.api_key)
         self.model_name = model
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=64)
+
+        # Micro-batching for concurrent async plan requests
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._batch_wait_ms = 20
+        self._max_batch = BATCH_MAX_TOKENS // PLAN_MAX_TOKENS
 
     def create_execution_plan(
         self,
@@ -50,7 +155,7 @@ class GroqPlanner:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=2000
+                max_tokens=PLAN_MAX_TOKENS
             )
 
             plan_text = response.choices[0].message.content
@@ -69,53 +174,172 @@ class GroqPlanner:
                 "plan": None
             }
 
-    def _build_planning_prompt(
+    async def create_execution_plan_async(
         self,
         user_request: str,
         available_tools: List[str],
         context: Dict[str, Any] = None
-    ) -> str:
-        """Build the planning prompt"""
+    ) -> Dict[str, Any]:
+        """
+        Async variant of create_execution_plan
 
-        tools_list = "\n".join([f"  - {tool}" for tool in available_tools])
+        Requests arriving within _batch_wait_ms of each other are coalesced
+        (up to _max_batch) into a single Groq call that returns one plan per request.
+        """
+        loop = asyncio.get_running_loop()
+        if self._batch_task is None or self._batch_task.done() or self._batch_task.get_loop() is not loop:
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = loop.create_task(self._batch_worker(self._batch_queue))
+
+        future = loop.create_future()
+        await self._batch_queue.put((user_request, available_tools, context, future))
+        return await future
+
+    def close(self):
+        """Stop the batching task; requests still waiting on it are cancelled"""
+        task, self._batch_task = self._batch_task, None
+        if task is None or task.done():
+            return
+        loop = task.get_loop()
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel)
+
+    async def _batch_worker(self, queue: asyncio.Queue):
+        """Collect queued plan requests and resolve them batch by batch"""
+        batch = []
+        try:
+            await self._run_batches(queue, batch)
+        finally:
+            # Cancelled by close(): don't leave callers awaiting forever
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for item in batch:
+                if not item[3].done():
+                    item[3].cancel()
+
+    async def _run_batches(self, queue: asyncio.Queue, batch: list):
+        """Batch loop of _batch_worker; batch holds the requests in flight"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch.clear()
+            batch.append(await queue.get())
+            deadline = loop.time() + self._batch_wait_ms / 1000
+
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            requests = [item[:3] for item in batch]
+            try:
+                results = await loop.run_in_executor(None, self._execute_plan_batch, requests)
+            except Exception as e:
+                results = [{"success": False, "error": str(e), "plan": None}] * len(batch)
+
+            for item, result in zip(batch, results):
+                future = item[3]
+                if not future.done():
+                    future.set_result(result)
+
+    def _execute_plan_batch(self, requests: List[tuple]) -> List[Dict[str, Any]]:
+        """Plan several requests with one Groq call, falling back to single calls"""
+        if len(requests) == 1:
+            return [self.create_execution_plan(*requests[0])]
+
+        prompt = self._build_batch_planning_prompt(requests)
 
-        tool_signatures = """
-TOOL SIGNATURES (use EXACT parameter names):
-  - send_whatsapp_message(contact_name: str, message: str)
-  - open_chrome(url: Optional[str] = None)
-  - search_google(query: str)
-  - open_youtube(query: Optional[str] = None)  # Searches YouTube but does NOT click
-  - click_first_result()  # Click first video/search result
-  - launch_application(app_path: str)  # Use "app_path" not "application_name"
-  - create_folder(path: str)
-  - create_word_document(filename: str, content: str, save_path: Optional[str] = None)
-  - write_file(file_path: str, content: str, append: bool = False)  # Use "file_path" NOT "filename" or "path"
-  - find_large_files(min_size_mb: int = 100, search_path: Optional[str] = None)  # Use "search_path" NOT "path"
-  - read_screen_text()  # Read text from screen using OCR (basic text only)
-  - analyze_screen_with_ai(task: str = "Describe what you see")  # AI vision analysis - BEST for charts, images, complex UI
-  - analyze_code_on_screen()  # Returns the code from screen as a string
-  - optimize_code(code: str, optimization_goal: str = "performance")  # Takes code string, returns AI-optimized version
-  - get_desktop_path()  # Returns desktop path as string
-  - get_resource_usage()  # Returns CPU/RAM usage
-  - open_in_vscode(file_path: str)  # Opens file in VS Code
-  - list_all_windows()
-  - focus_window(title_substring: str)
-  - extract_key_points(text: str, num_points: int = 5)  # Extract key points from text
-  - summarize_text(text: str, max_sentences: int = 3)  # Summarize text - use "max_sentences" NOT "max_length"
-  - draft_email(to: str, subject: str, content: str)  # Draft an email
-  - type_text(text: str, interval: float = 0.05)  # Type text in active window
-  - type_in_active_window(text: str, interval: float = 0.03)  # Type text live in active window
-"""
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=min(PLAN_MAX_TOKENS * len(requests), BATCH_MAX_TOKENS),
+                response_format={"type": "json_object"}
+            )
 
-        tools_list = tool_signatures + "\nALL AVAILABLE TOOLS:\n" + tools_list
+            batch_text = response.choices[0].message.content
+            plans = {
+                _request_index(entry.get("for_request")): entry.get("plan")
+                for entry in json.loads(batch_text).get("plans", [])
+                if isinstance(entry, dict)
+            }
+        except Exception:
+            plans = {}
+
+        results = []
+        for index, request in enumerate(requests, start=1):
+            plan = plans.get(index)
+            if isinstance(plan, dict):
+                results.append({
+                    "success": True,
+                    "plan": plan,
+                    "raw_response": json.dumps(plan)
+                })
+            else:
+                # Missing or malformed entry - plan this request on its own
+                results.append(self.create_execution_plan(*request))
+
+        return results
+
+    def _build_batch_planning_prompt(self, requests: List[tuple]) -> str:
+        """Build one prompt covering several independent planning requests"""
+        all_tools = []
+        for _, available_tools, _ in requests:
+            for tool in available_tools:
+                if tool not in all_tools:
+                    all_tools.append(tool)
+
+        tools_list = self._format_tools(all_tools)
+
+        request_list = ""
+        for index, (user_request, _, context) in enumerate(requests, start=1):
+            request_list += f'\nREQUEST {index}: "{user_request}"{self._format_context(context)}\n'
 
-        context_info = ""
-        if context:
-            if context.get("conversation_history"):
-                recent = context["conversation_history"][-3:]
-                context_info += "\n\nRECENT CONVERSATION:\n"
-                for msg in recent:
-                    context_info += f"{msg['role']}: {msg['content']}\n"
+        prompt = f"""You are an intelligent task planner for GLOW, a Windows PC assistant.
+
+You will plan {len(requests)} INDEPENDENT user requests.
+{request_list}
+AVAILABLE TOOLS:
+{tools_list}
+
+YOUR TASK:
+Create a detailed, step-by-step execution plan for EACH request above.
+
+RESPONSE FORMAT (JSON):
+{{
+  "plans": [
+    {{"for_request": 1, "plan": <plan object>}},
+    ...
+  ]
+}}
+
+Each <plan object> uses this format:
+{PLAN_SCHEMA}
+
+{PLANNING_RULES}
+7. Return exactly one entry in "plans" for every request number
+
+Generate the JSON now:"""
+
+        return prompt
+
+    def _build_planning_prompt(
+        self,
+        user_request: str,
+        available_tools: List[str],
+        context: Dict[str, Any] = None
+    ) -> str:
+        """Build the planning prompt"""
+
+        tools_list = self._format_tools(available_tools)
+        context_info = self._format_context(context)
 
         prompt = f"""You are an intelligent task planner for GLOW, a Windows PC assistant.
 
@@ -129,51 +353,30 @@ YOUR TASK:
 Create a detailed, step-by-step execution plan to accomplish the user's request.
 
 RESPONSE FORMAT (JSON):
-{{
-  "analysis": "Brief analysis of what the user wants",
-  "steps": [
-    {{
-      "step": 1,
-      "description": "What this step does",
-      "tool": "tool_name_to_use",
-      "parameters": {{"param1": "value1"}},
-      "expected_outcome": "What should happen"
-    }},
-    ...
-  ],
-  "final_response": "What to tell the user when done",
-  "requires_confirmation": false
-}}
-
-IMPORTANT RULES:
-1. **USE EXACT PARAMETER NAMES** - Check tool signatures above
-   Example: send_whatsapp_message uses "contact_name" NOT "recipient"
-   Example: write_file uses "file_path" NOT "path" or "filename"
-2. Break complex tasks into simple steps
-3. For YouTube video playback (open browser, search YouTube, play video):
-   - Step 1: open_youtube(query="search term")  # This searches YouTube
-   - Step 2: click_first_result()  # This clicks and plays the first video
-4. **VARIABLE SUBSTITUTION** - Chain results from previous steps:
-   - Use $step1_result, $step2_result, $step3_result, etc. to reference previous step outputs
-   - Example workflow:
-     Step 1: analyze_code_on_screen() -> stores result in $step1_result
-     Step 2: optimize_code(code="$step1_result", optimization_goal="performance")
-     Step 3: get_desktop_path() -> stores path in $step3_result
-     Step 4: write_file(file_path="$step3_result/optimized.py", content="$step2_result")
-   - NEVER use {{result from step N}} or <step N result> - ONLY use $stepN_result
-5. **REAL EXAMPLE** - Screen analysis to Notepad:
-   Step 1: analyze_screen_with_ai(task="Analyze this chart and extract key trends") -> $step1_result contains analysis
-   Step 2: summarize_text(text="$step1_result", max_sentences=3) -> $step2_result contains summary
-   Step 3: open_notepad() -> Opens Notepad
-   Step 4: type_in_active_window(text="$step2_result") -> Types the summary into Notepad
+{PLAN_SCHEMA}
 
-   TIP: For charts/images/UI, use analyze_screen_with_ai() instead of read_screen_text() for better results!
-6. ALWAYS use $stepN_result syntax for chaining - the system automatically substitutes with actual values
+{PLANNING_RULES}
 
 Generate the JSON plan now:"""
 
         return prompt
 
+    def _format_tools(self, available_tools: List[str]) -> str:
+        """Format tool signatures plus the full tool list for a prompt"""
+        tools_list = "\n".join([f"  - {tool}" for tool in available_tools])
+        return TOOL_SIGNATURES + "\nALL AVAILABLE TOOLS:\n" + tools_list
+
+    def _format_context(self, context: Dict[str, Any] = None) -> str:
+        """Format recent conversation turns for a prompt"""
+        context_info = ""
+        if context:
+            if context.get("conversation_history"):
+                recent = list(context["conversation_history"])[-3:]
+                context_info += "\n\nRECENT CONVERSATION:\n"
+                for msg in recent:
+                    context_info += f"{msg['role']}: {msg['content']}\n"
+        return context_info
+
     def _parse_plan(self, plan_text: str) -> Dict[str, Any]:
         """Parse the plan from response"""
         try:
@@ -200,19 +403,34 @@ Generate the JSON plan now:"""
                 "requires_confirmation": False
             }
 
-    def conversational_response(self, user_input: str, context: Dict[str, Any] = None) -> str:
-        """Generate conversational response"""
+    def conversational_response(
+        self,
+        user_input: str,
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Generate conversational response, passing text pieces to on_delta as they arrive"""
         self.conversation_history.append({"role": "user", "content": user_input})
 
         try:
             response = self.client.chat.completions.create(
                 model=self.model_name,
-                messages=self.conversation_history,
+                messages=list(self.conversation_history),
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=500,
+                stream=on_delta is not None
             )
 
-            assistant_response = response.choices[0].message.content
+            if on_delta is None:
+                assistant_response = response.choices[0].message.content
+            else:
+                parts = []
+                for chunk in response:
+                    piece = chunk.choices[0].delta.content if chunk.choices else None
+                    if piece:
+                        parts.append(piece)
+                        on_delta(piece)
+                assistant_response = "".join(parts)
             self.conversation_history.append({"role": "assistant", "content": assistant_response})
 
             return assistant_response
@@ -3,8 +3,10 @@ LLM Client for connecting to Ollama with FunctionGemma
 """
 
 import json
+from collections import deque
+
 import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 
 class OllamaClient:
@@ -19,7 +21,7 @@ class OllamaClient:
         """
         self.base_url = base_url.rstrip("/")
         self.model = model
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=64)
 
     def is_available(self):
         """Check if Ollama server is running"""
@@ -48,6 +50,70 @@ class OllamaClient:
         Returns:
             Dict with response and tool calls
         """
+        try:
+            content_parts = []
+            tool_calls = []
+            result = {}
+
+            for chunk in self._stream_chat(message, tools, system_prompt, temperature):
+                chunk_message = chunk.get("message", {})
+                content_parts.append(chunk_message.get("content", ""))
+                tool_calls.extend(chunk_message.get("tool_calls") or [])
+                result = chunk
+
+            content = "".join(content_parts)
+            result["message"] = {
+                "role": "assistant",
+                "content": content,
+                "tool_calls": tool_calls
+            }
+
+            return {
+                "content": content,
+                "tool_calls": tool_calls,
+                "raw_response": result
+            }
+
+        except Exception as e:
+            print(f"Error calling Ollama: {e}")
+            return {
+                "content": f"Error: {str(e)}",
+                "tool_calls": [],
+                "error": str(e)
+            }
+
+    def chat_stream(
+        self,
+        message: str,
+        tools: Optional[List[Dict]] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Send a chat message and yield the response text as it is generated
+
+        Args:
+            message: User message
+            tools: List of available tool definitions
+            system_prompt: System prompt to guide the model
+            temperature: Sampling temperature
+
+        Yields:
+            Pieces of the assistant's response content
+        """
+        for chunk in self._stream_chat(message, tools, system_prompt, temperature):
+            content = chunk.get("message", {}).get("content", "")
+            if content:
+                yield content
+
+    def _stream_chat(
+        self,
+        message: str,
+        tools: Optional[List[Dict]],
+        system_prompt: Optional[str],
+        temperature: float
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream NDJSON chunks from Ollama and record the exchange in history"""
         # Build the messages array
         messages = []
 
@@ -70,7 +136,7 @@ class OllamaClient:
         payload = {
             "model": self.model,
             "messages": messages,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": temperature
             }
@@ -80,42 +146,41 @@ class OllamaClient:
         if tools:
             payload["tools"] = tools
 
-        # Make the request
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=60
-            )
+        content_parts = []
+        tool_calls = []
+
+        with requests.post(
+            f"{self.base_url}/api/chat",
+            json=payload,
+            stream=True,
+            timeout=60
+        ) as response:
             response.raise_for_status()
-            result = response.json()
 
-            # Extract the assistant's response
-            assistant_message = result.get("message", {})
-            content = assistant_message.get("content", "")
-            tool_calls = assistant_message.get("tool_calls", [])
+            for line in response.iter_lines():
+                if not line:
+                    continue
 
-            # Update conversation history
-            self.conversation_history.append({"role": "user", "content": message})
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": content,
-                "tool_calls": tool_calls if tool_calls else None
-            })
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
 
-            return {
-                "content": content,
-                "tool_calls": tool_calls,
-                "raw_response": result
-            }
+                chunk_message = chunk.get("message", {})
+                content_parts.append(chunk_message.get("content", ""))
+                tool_calls.extend(chunk_message.get("tool_calls") or [])
 
-        except Exception as e:
-            print(f"Error calling Ollama: {e}")
-            return {
-                "content": f"Error: {str(e)}",
-                "tool_calls": [],
-                "error": str(e)
-            }
+                yield chunk
+
+                if chunk.get("done"):
+                    break
+
+        # Update conversation history
+        self.conversation_history.append({"role": "user", "content": message})
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": "".join(content_parts),
+            "tool_calls": tool_calls if tool_calls else None
+        })
 
     def add_tool_result(self, tool_name: str, result: Any):
         """
@@ -133,7 +198,7 @@ class OllamaClient:
 
     def reset_conversation(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
 
     def get_conversation_length(self):
         """Get the number of messages in conversation history"""
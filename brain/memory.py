@@ -3,13 +3,125 @@ Memory and RAG (Retrieval Augmented Generation) System
 Provides conversational context and long-term memory
 """
 
+import atexit
+import hashlib
+import io
+import itertools
 import json
+import os
 import pickle
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from collections import deque
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Shared sentence embedder, loaded on first semantic search (False = unavailable)
+_embedder = None
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _iter_json_items(path, prefix: str) -> Iterator[Any]:
+    """
+    Yield the items of the JSON array at prefix ("item", "interactions.item", ...)
+
+    Streams with ijson when it is installed so large files are never fully loaded.
+    """
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, prefix, use_float=True)
+            return
+        data = _loads(f.read())
+
+    for key in prefix.split(".")[:-1]:
+        data = data.get(key, []) if isinstance(data, dict) else []
+    yield from data
+
+
+def _read_json_value(path, key: str, default: Any) -> Any:
+    """Read one top-level value of a JSON object, streaming with ijson when installed"""
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            return next(ijson.items(f, key, use_float=True), default)
+        return _loads(f.read()).get(key, default)
+
+
+# (epoch milliseconds, ISO string) of the last timestamp handed out
+_last_timestamp = (0, "")
+
+
+def _timestamp() -> str:
+    """Current time as ISO text, reused for appends within the same millisecond"""
+    global _last_timestamp
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _last_timestamp[0]:
+        seconds, millis = divmod(now_ms, 1000)
+        iso = datetime.fromtimestamp(seconds).replace(microsecond=millis * 1000).isoformat()
+        _last_timestamp = (now_ms, iso)
+    return _last_timestamp[1]
+
+
+def _get_embedder():
+    """Load the sentence embedding model once, or return None if it is not installed"""
+    global _embedder
+    if _embedder is None:
+        try:
+            if np is None:
+                raise ImportError("numpy")
+            from sentence_transformers import SentenceTransformer
+            _embedder = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception as e:
+            print(f"[MEMORY] Semantic search unavailable, using keyword search: {e}")
+            _embedder = False
+    return _embedder or None
+
+
+# Field positions in ConversationMemory.messages / .tools tuples:
+# (role, content, timestamp) or (role, content, timestamp, tool) for tool entries
+ROLE, CONTENT, TS, TOOL = 0, 1, 2, 3
+
+# Interned role names and message keys shared by every history entry
+_USER = sys.intern("user")
+_ASSISTANT = sys.intern("assistant")
+_TOOL = sys.intern("tool")
+_ROLE = sys.intern("role")
+_CONTENT = sys.intern("content")
+
 
 class ConversationMemory:
     """Manages short-term conversation history"""
@@ -22,55 +134,235 @@ class ConversationMemory:
             max_turns: Maximum number of conversation turns to remember
         """
         self.max_turns = max_turns
-        self.history = deque(maxlen=max_turns * 2)  # User + Assistant per turn
+        self.messages = deque(maxlen=max_turns * 2)  # User + Assistant per turn
+        self.tools = deque(maxlen=max_turns * 2)  # Tool executions, never sent to the LLM
+
+        # {"role", "content"} dicts for the LLM. Replaced (never mutated) on
+        # append, so get_context_messages can hand out the list itself
+        self._llm_view: List[Dict[str, str]] = []
 
     def add_user_message(self, message: str):
         """Add user message to history"""
-        self.history.append({
-            "role": "user",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.messages.append((_USER, message, _timestamp()))
+        self._append_llm_message(_USER, message)
 
     def add_assistant_message(self, message: str):
         """Add assistant message to history"""
-        self.history.append({
-            "role": "assistant",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.messages.append((_ASSISTANT, message, _timestamp()))
+        self._append_llm_message(_ASSISTANT, message)
 
     def add_tool_execution(self, tool_name: str, result: str):
         """Add tool execution to history"""
-        self.history.append({
-            "role": "tool",
-            "tool": tool_name,
-            "content": result,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.tools.append((_TOOL, result, _timestamp(), tool_name))
+
+    def _append_llm_message(self, role: str, message: str):
+        """Build the next LLM view as a new list, keeping the last max_turns * 2 messages"""
+        limit = self.max_turns * 2
+        if limit <= 0:
+            return
+        view = self._llm_view[-(limit - 1):] if limit > 1 else []
+        view.append({_ROLE: role, _CONTENT: message})
+        self._llm_view = view
 
     def get_context_messages(self) -> List[Dict]:
-        """Get conversation history formatted for LLM"""
-        return [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in self.history
-            if msg["role"] in ["user", "assistant"]
-        ]
+        """
+        Get conversation history formatted for LLM (user and assistant turns only)
+
+        The returned list and its dicts are shared, not copied: callers must
+        not mutate them. Later appends build a new list, so a returned list
+        never changes underneath the caller.
+        """
+        return self._llm_view
 
     def get_recent_context(self, num_turns: int = 3) -> str:
         """Get recent conversation as text summary"""
-        recent = list(self.history)[-(num_turns * 2):]
+        total = len(self.messages)
         context = []
-        for msg in recent:
-            if msg["role"] == "user":
-                context.append(f"User: {msg['content']}")
-            elif msg["role"] == "assistant":
-                context.append(f"Assistant: {msg['content']}")
+        for i in range(total - min(num_turns * 2, total), total):
+            msg = self.messages[i]
+            prefix = "User" if msg[ROLE] is _USER else "Assistant"
+            context.append(f"{prefix}: {msg[CONTENT]}")
         return "\n".join(context)
 
     def clear(self):
         """Clear conversation history"""
-        self.history.clear()
+        self.messages.clear()
+        self.tools.clear()
+        self._llm_view = []
+
+
+class InteractionStore:
+    """
+    SQLite-backed interaction log with FTS5 keyword search
+
+    Behaves like a read-mostly list of interaction dicts (append, extend,
+    indexing, iteration, len) without holding the history in memory.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the interaction database
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS interactions("
+            "id INTEGER PRIMARY KEY, ts TEXT, user TEXT, assistant TEXT, tools TEXT, "
+            "user_lower TEXT, assistant_lower TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(interactions)")}
+        for column in ("user_lower", "assistant_lower"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE interactions ADD COLUMN {column} TEXT")
+
+        self._conn.create_function("py_lower", 1, lambda text: text.lower() if text else text)
+
+        # Keyword search is a case-insensitive substring match. An FTS5 index
+        # with the trigram tokenizer answers exactly that for queries of 3+
+        # characters; it needs FTS5 and SQLite 3.34+, so other builds fall
+        # back to LIKE scans over text lowercased once at insert time.
+        # Indexes from older versions used whole-word tokens and are rebuilt
+        existing = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'interactions_fts'"
+        ).fetchone()
+        if existing and "trigram" not in existing[0]:
+            self._conn.execute("DROP TRIGGER IF EXISTS interactions_ai")
+            self._conn.execute("DROP TABLE interactions_fts")
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS interactions_fts USING "
+                "fts5(user, assistant, content='interactions', content_rowid='id', tokenize='trigram')"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS interactions_ai AFTER INSERT ON interactions BEGIN "
+                "INSERT INTO interactions_fts(rowid, user, assistant) "
+                "VALUES (new.id, new.user, new.assistant); END"
+            )
+            if existing and "trigram" not in existing[0]:
+                self._conn.execute("INSERT INTO interactions_fts(interactions_fts) VALUES ('rebuild')")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+            self._conn.execute(
+                "UPDATE interactions SET user_lower = py_lower(user), "
+                "assistant_lower = py_lower(assistant) WHERE user_lower IS NULL"
+            )
+
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: Tuple) -> Dict:
+        """Convert a (ts, user, assistant, tools) row to an interaction dict"""
+        return {
+            "timestamp": row[0],
+            "user": row[1],
+            "assistant": row[2],
+            "tools": _loads(row[3]) if row[3] else []
+        }
+
+    def append(self, interaction: Dict):
+        """Store one interaction"""
+        self.extend([interaction])
+
+    def extend(self, interactions: List[Dict]):
+        """Store several interactions in one transaction"""
+        rows = []
+        for interaction in interactions:
+            user = interaction.get("user", "")
+            assistant = interaction.get("assistant", "")
+            rows.append((
+                interaction.get("timestamp"),
+                user,
+                assistant,
+                _dumps(interaction.get("tools") or []).decode("utf-8"),
+                None if self.has_fts else user.lower(),
+                None if self.has_fts else assistant.lower()
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO interactions(ts, user, assistant, tools, user_lower, assistant_lower) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM interactions LIMIT 1").fetchone() is not None
+
+    def __getitem__(self, index: int) -> Dict:
+        index = int(index)  # Accept NumPy integers from the semantic search
+        if index < 0:
+            sql = "SELECT ts, user, assistant, tools FROM interactions ORDER BY id DESC LIMIT 1 OFFSET ?"
+            offset = -index - 1
+        else:
+            sql = "SELECT ts, user, assistant, tools FROM interactions ORDER BY id LIMIT 1 OFFSET ?"
+            offset = index
+        with self._lock:
+            row = self._conn.execute(sql, (offset,)).fetchone()
+        if row is None:
+            raise IndexError("interaction index out of range")
+        return self._to_dict(row)
+
+    def __iter__(self) -> Iterator[Dict]:
+        # Page through by id so only page_size rows are held at a time
+        page_size = 500
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, ts, user, assistant, tools FROM interactions "
+                    "WHERE id > ? ORDER BY id LIMIT ?", (last_id, page_size)
+                ).fetchall()
+            for row in rows:
+                yield self._to_dict(row[1:])
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+
+    def search(self, query: str, limit: int = 5) -> List[Dict]:
+        """Newest interactions whose user or assistant text contains the query (any case)"""
+        if not query.strip():
+            return []
+
+        if self.has_fts and len(query) >= 3:
+            # Trigram index: a quoted phrase matches as a substring
+            phrase = '"' + query.replace('"', '""') + '"'
+            sql = (
+                "SELECT i.ts, i.user, i.assistant, i.tools FROM interactions_fts "
+                "JOIN interactions i ON i.id = interactions_fts.rowid "
+                "WHERE interactions_fts MATCH ? ORDER BY interactions_fts.rowid DESC LIMIT ?"
+            )
+            params = (phrase, limit)
+        else:
+            query_lower = query.lower()
+            pattern = "%" + query_lower.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            # Shorter queries than a trigram scan the table; with FTS the
+            # lowercased columns aren't stored, so lowercase on the fly
+            user_col, assistant_col = (
+                ("py_lower(user)", "py_lower(assistant)") if self.has_fts
+                else ("user_lower", "assistant_lower")
+            )
+            sql = (
+                "SELECT ts, user, assistant, tools FROM interactions "
+                f"WHERE {user_col} LIKE ? ESCAPE '\\' OR {assistant_col} LIKE ? ESCAPE '\\' "
+                "ORDER BY id DESC LIMIT ?"
+            )
+            params = (pattern, pattern, limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
 
 
 class LongTermMemory:
@@ -90,53 +382,254 @@ class LongTermMemory:
         self.storage_path.mkdir(exist_ok=True)
 
         self.facts_file = self.storage_path / "facts.json"
-        self.interactions_file = self.storage_path / "interactions.json"
-
-        self.facts = self._load_facts()
-        self.interactions = self._load_interactions()
+        self.interactions_db = self.storage_path / "interactions.db"
+        self.embeddings_file = self.storage_path / "embeddings.npy"
+
+        # Fact/embedding writes happen on a background thread: callers only
+        # queue a request, and bursts are coalesced into one atomic write
+        self._dirty = False
+        self._state_lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._write_q: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="memory-writer", daemon=True)
+        self._closed = False
+
+        # User preferences (name -> value) are kept apart from other facts
+        self.facts: Dict[str, Dict[str, Any]] = {}
+        self.prefs: Dict[str, Any] = {}
+        self._summary_cache: Optional[str] = None
+        self._pack_cache: Optional[Tuple[str, str]] = None
+        self._merge_facts(self._load_facts())
+
+        # Semantic search: float32 (capacity, D) matrix, one row per interaction,
+        # built on the first semantic search and grown by doubling
+        self._emb = None
+        self._emb_count = 0
+        self._emb_dirty = False
+
+        self.interactions = InteractionStore(self.interactions_db)
+        if not self.interactions:
+            self._migrate_interactions()
+
+        self._writer.start()
+        atexit.register(self.close)
 
     def _load_facts(self) -> Dict[str, Any]:
         """Load stored facts"""
         if self.facts_file.exists():
             try:
-                with open(self.facts_file, 'r') as f:
-                    return json.load(f)
+                with open(self.facts_file, 'rb') as f:
+                    return _loads(f.read())
             except:
                 return {}
         return {}
 
-    def _load_interactions(self) -> List[Dict]:
-        """Load interaction history"""
-        if self.interactions_file.exists():
+    def _migrate_interactions(self):
+        """Import interactions from the JSONL / JSON files used before SQLite"""
+        jsonl_file = self.storage_path / "interactions.jsonl"
+        json_file = self.storage_path / "interactions.json"
+
+        try:
+            if jsonl_file.exists():
+                self._add_interaction_stream(self._iter_jsonl(jsonl_file))
+            elif json_file.exists():
+                self._add_interaction_stream(_iter_json_items(json_file, "item"))
+        except Exception as e:
+            print(f"[MEMORY] Could not migrate old interactions: {e}")
+
+    @staticmethod
+    def _iter_jsonl(path: Path) -> Iterator[Dict]:
+        """Yield the records of a JSONL file one line at a time"""
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    continue  # Skip a line torn by an interrupted write
+
+    def _add_interaction_stream(self, interactions: Iterable[Dict], batch_size: int = 500):
+        """Add interactions from an iterator in fixed-size batches"""
+        iterator = iter(interactions)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                break
+            self._add_interactions(batch)
+
+    def _atomic_write(self, path: Path, data: bytes):
+        """Write a file via a temp file in the same directory and os.replace"""
+        tmp = tempfile.NamedTemporaryFile(
+            dir=self.storage_path, prefix=path.name, suffix=".tmp", delete=False
+        )
+        try:
+            with tmp:
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, path)
+        except BaseException:
             try:
-                with open(self.interactions_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            raise
 
     def _save_facts(self):
         """Save facts to disk"""
-        with open(self.facts_file, 'w') as f:
-            json.dump(self.facts, f, indent=2)
+        with self._io_lock:
+            with self._state_lock:
+                data = _dumps({"facts": self.facts, "prefs": self.prefs}, indent=True)
+                self._dirty = False
+            self._atomic_write(self.facts_file, data)
+
+    def _save_embeddings(self):
+        """Save the embedding matrix to disk"""
+        with self._io_lock:
+            with self._state_lock:
+                buffer = io.BytesIO()
+                np.save(buffer, self._emb[:self._emb_count])
+                self._emb_dirty = False
+            self._atomic_write(self.embeddings_file, buffer.getvalue())
+
+    def _queue_facts_save(self):
+        """Mark facts dirty and ask the writer thread to save them"""
+        self._dirty = True
+        self._write_q.put("facts")
+
+    def _writer_loop(self):
+        """Background writer: drain queued requests and save each file at most once"""
+        while True:
+            kinds = {self._write_q.get()}
+            while True:
+                try:
+                    kinds.add(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
 
-    def _save_interactions(self):
-        """Save interactions to disk"""
-        # Keep only last 100 interactions
-        recent_interactions = self.interactions[-100:]
-        with open(self.interactions_file, 'w') as f:
-            json.dump(recent_interactions, f, indent=2)
+            try:
+                if "facts" in kinds and self._dirty:
+                    self._save_facts()
+            except Exception as e:
+                print(f"[MEMORY] Background write failed: {e}")
+
+            if None in kinds:
+                return
+
+    def _add_interactions(self, interactions: List[Dict]):
+        """Append interactions to the store and the embedding matrix"""
+        self.interactions.extend(interactions)
+        if self._emb is not None and interactions:
+            self._append_embeddings(self._embed(interactions))
+
+    def _embed(self, interactions: List[Dict]):
+        """Embed interactions as L2-normalized float32 rows"""
+        embedder = _get_embedder()
+        texts = [f"{interaction['user']}\n{interaction['assistant']}" for interaction in interactions]
+        if not texts:
+            return np.zeros((0, embedder.get_sentence_embedding_dimension()), dtype=np.float32)
+        vectors = embedder.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32, copy=False)
+
+    def _append_embeddings(self, vectors):
+        """Copy rows into the embedding matrix, doubling its capacity as needed"""
+        with self._state_lock:
+            needed = self._emb_count + len(vectors)
+            if self._emb is None or needed > len(self._emb):
+                capacity = max(needed, 64, 2 * (len(self._emb) if self._emb is not None else 0))
+                grown = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+                if self._emb is not None:
+                    grown[:self._emb_count] = self._emb[:self._emb_count]
+                self._emb = grown
+            self._emb[self._emb_count:needed] = vectors
+            self._emb_count = needed
+            self._emb_dirty = True
+
+    def _ensure_embeddings(self) -> bool:
+        """Load or build the embedding matrix; False if semantic search is unavailable"""
+        if self._emb is not None:
+            return True
+        if _get_embedder() is None:
+            return False
+
+        vectors = None
+        if self.embeddings_file.exists():
+            try:
+                vectors = np.load(self.embeddings_file)
+            except (OSError, ValueError):
+                vectors = None
+            if vectors is not None and len(vectors) != len(self.interactions):
+                vectors = None  # Out of sync with the interaction store
+
+        self._emb_count = 0
+        if vectors is not None:
+            self._append_embeddings(vectors.astype(np.float32, copy=False))
+        else:
+            iterator = iter(self.interactions)
+            while True:
+                batch = list(itertools.islice(iterator, 500))
+                if not batch:
+                    break
+                self._append_embeddings(self._embed(batch))
+            if self._emb is None:
+                self._append_embeddings(self._embed([]))
+        return True
+
+    def _merge_facts(self, data: Dict[str, Any]):
+        """Merge saved or imported facts, routing legacy pref_ keys into self.prefs"""
+        if set(data) == {"facts", "prefs"}:
+            facts, prefs = data["facts"], data["prefs"]
+        else:
+            facts, prefs = data, {}  # Older flat facts.json
+
+        with self._state_lock:
+            for key, fact in facts.items():
+                if key.startswith("pref_"):
+                    self.prefs[key[5:]] = fact["value"]
+                else:
+                    self.facts[key] = fact
+            self.prefs.update(prefs)
+
+            self._summary_cache = None
+            self._pack_cache = None
+
+    def flush(self):
+        """Synchronously write facts (and embeddings) if they changed since the last save"""
+        if self._dirty:
+            self._save_facts()
+        if self._emb_dirty:
+            self._save_embeddings()
+
+    def close(self):
+        """Flush pending writes, stop the writer thread and close the database"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_q.put(None)
+        self._writer.join()
+        self.flush()
+        self.interactions.close()
 
     def remember_fact(self, key: str, value: Any):
         """Remember a fact about the user or context"""
-        self.facts[key] = {
-            "value": value,
-            "timestamp": datetime.now().isoformat()
-        }
-        self._save_facts()
+        with self._state_lock:
+            if key.startswith("pref_"):
+                self.prefs[key[5:]] = value
+            else:
+                self.facts[key] = {
+                    "value": value,
+                    "timestamp": _timestamp()
+                }
+            self._summary_cache = None
+            self._pack_cache = None
+        self._queue_facts_save()
 
     def recall_fact(self, key: str) -> Optional[Any]:
         """Recall a stored fact"""
+        if key.startswith("pref_"):
+            return self.prefs.get(key[5:])
         if key in self.facts:
             return self.facts[key]["value"]
         return None
@@ -144,58 +637,90 @@ class LongTermMemory:
     def store_interaction(self, user_input: str, assistant_response: str, tools_used: List[str] = None):
         """Store an interaction for future reference"""
         interaction = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "user": user_input,
             "assistant": assistant_response,
             "tools": tools_used or []
         }
-        self.interactions.append(interaction)
-        self._save_interactions()
-
-    def search_interactions(self, query: str, limit: int = 5) -> List[Dict]:
-        """Search past interactions (simple keyword match)"""
-        query_lower = query.lower()
-        matches = []
-
-        for interaction in reversed(self.interactions):
-            if (query_lower in interaction["user"].lower() or
-                query_lower in interaction["assistant"].lower()):
-                matches.append(interaction)
-                if len(matches) >= limit:
-                    break
+        self._add_interactions([interaction])
 
-        return matches
+    def search_interactions(self, query: str, limit: int = 5, mode: str = "keyword") -> List[Dict]:
+        """
+        Search past interactions
+
+        Args:
+            query: Text to look for
+            limit: Maximum number of results
+            mode: "keyword" (case-insensitive substring match, newest first) or "semantic"
+                  (top-k by embedding similarity; falls back to keyword if no
+                  embedder is installed)
+        """
+        if mode == "semantic" and self._ensure_embeddings():
+            return self._semantic_search(query, limit)
+
+        return self.interactions.search(query, limit)
+
+    def _semantic_search(self, query: str, limit: int) -> List[Dict]:
+        """Top-k interactions by cosine similarity to the query"""
+        k = min(limit, self._emb_count)
+        if k <= 0:
+            return []
+
+        query_vector = _get_embedder().encode([query], normalize_embeddings=True, convert_to_numpy=True)[0]
+        scores = self._emb[:self._emb_count] @ query_vector.astype(np.float32, copy=False)
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.interactions[i] for i in top]
 
     def get_user_preferences(self) -> Dict[str, Any]:
-        """Get all stored user preferences"""
-        return {k: v["value"] for k, v in self.facts.items() if k.startswith("pref_")}
+        """Get all stored user preferences (returned directly; do not mutate)"""
+        return self.prefs
 
     def get_context_summary(self) -> str:
         """Get a summary of what we know about the user"""
-        summary_parts = []
-
-        # User preferences
-        prefs = self.get_user_preferences()
-        if prefs:
-            summary_parts.append("User Preferences:")
-            for key, value in prefs.items():
-                clean_key = key.replace("pref_", "").replace("_", " ").title()
-                summary_parts.append(f"  - {clean_key}: {value}")
-
-        # Important facts
-        important_facts = {k: v["value"] for k, v in self.facts.items()
-                          if not k.startswith("pref_")}
-        if important_facts:
-            summary_parts.append("\nKnown Facts:")
-            for key, value in important_facts.items():
-                summary_parts.append(f"  - {key}: {value}")
+        if self._summary_cache is None:
+            summary_parts = []
+
+            # User preferences
+            if self.prefs:
+                summary_parts.append("User Preferences:")
+                for key, value in self.prefs.items():
+                    clean_key = key.replace("_", " ").title()
+                    summary_parts.append(f"  - {clean_key}: {value}")
+
+            # Important facts
+            if self.facts:
+                summary_parts.append("\nKnown Facts:")
+                for key, fact in self.facts.items():
+                    summary_parts.append(f"  - {key}: {fact['value']}")
+
+            self._summary_cache = "\n".join(summary_parts)
+
+        summary = self._summary_cache
 
         # Recent activity
         if self.interactions:
-            last_interaction = self.interactions[-1]
-            summary_parts.append(f"\nLast Interaction: {last_interaction['timestamp']}")
+            last_interaction = f"\nLast Interaction: {self.interactions[-1]['timestamp']}"
+            summary = f"{summary}\n{last_interaction}" if summary else last_interaction
+
+        return summary or "No stored information yet."
+
+    def build_memory_pack(self) -> Tuple[str, str]:
+        """
+        Render all facts in key order for use as a stable prompt prefix
 
-        return "\n".join(summary_parts) if summary_parts else "No stored information yet."
+        Returns:
+            (text, version) where version is a short hash of text, so callers
+            can tell when the pack changed
+        """
+        if self._pack_cache is None:
+            lines = [f"pref_{key}: {value}" for key, value in sorted(self.prefs.items())]
+            lines += [f"{key}: {fact['value']}" for key, fact in sorted(self.facts.items())]
+            text = "\n".join(lines)
+            version = hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+            self._pack_cache = (text, version)
+        return self._pack_cache
 
 
 class MemoryManager:
@@ -222,11 +747,15 @@ class MemoryManager:
 
     def get_context_for_llm(self) -> Dict[str, Any]:
         """Get complete context for LLM"""
+        memory_pack, memory_version = self.long_term.build_memory_pack()
         return {
             "conversation_history": self.conversation.get_context_messages(),
             "recent_context": self.conversation.get_recent_context(),
             "user_info": self.long_term.get_context_summary(),
-            "facts": self.long_term.facts
+            "facts": self.long_term.facts,
+            "preferences": self.long_term.prefs,
+            "memory_pack": memory_pack,
+            "memory_version": memory_version
         }
 
     def remember_user_preference(self, preference: str, value: Any):
@@ -241,9 +770,9 @@ class MemoryManager:
         """Recall a fact"""
         return self.long_term.recall_fact(key)
 
-    def search_history(self, query: str, limit: int = 5) -> List[Dict]:
+    def search_history(self, query: str, limit: int = 5, mode: str = "keyword") -> List[Dict]:
         """Search conversation history"""
-        return self.long_term.search_interactions(query, limit)
+        return self.long_term.search_interactions(query, limit, mode)
 
     def clear_conversation(self):
         """Clear short-term conversation memory"""
@@ -253,23 +782,23 @@ class MemoryManager:
         """Export all memory to a file"""
         export_data = {
             "facts": self.long_term.facts,
-            "interactions": self.long_term.interactions,
+            "prefs": self.long_term.prefs,
+            "interactions": list(self.long_term.interactions),
             "exported_at": datetime.now().isoformat()
         }
 
-        with open(path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        with open(path, 'wb') as f:
+            f.write(_dumps(export_data, indent=True))
 
     def import_memory(self, path: str):
-        """Import memory from a file"""
-        with open(path, 'r') as f:
-            import_data = json.load(f)
-
-        self.long_term.facts.update(import_data.get("facts", {}))
-        self.long_term.interactions.extend(import_data.get("interactions", []))
+        """Import memory from a file (interactions are streamed in batches)"""
+        self.long_term._merge_facts({
+            "facts": _read_json_value(path, "facts", {}),
+            "prefs": _read_json_value(path, "prefs", {})
+        })
+        self.long_term._queue_facts_save()
 
-        self.long_term._save_facts()
-        self.long_term._save_interactions()
+        self.long_term._add_interaction_stream(_iter_json_items(path, "interactions.item"))
 
 
 if __name__ == "__main__":
@@ -7,16 +7,300 @@ Multi-Agent System for GLOW
 - Execution Agent: Executes tools (FunctionGemma)
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import inspect
+import itertools
 import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Any, List, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+from .agent_cache import CACHE_DISABLED, open_cache_store
 from .gemini_planner import GeminiPlanner
 from .llm_client import OllamaClient
 from .vision_first_orchestrator import VisionFirstOrchestrator
 
 
+# Read-only tools that don't touch window focus or input, so steps using them
+# can run side by side. Anything else is treated as a GUI action and keeps
+# strict plan order.
+PARALLEL_SAFE_TOOLS = frozenset({
+    "get_desktop_path",
+    "get_documents_path",
+    "list_directory",
+    "read_file",
+    "get_running_processes",
+    "get_active_window",
+    "list_all_windows",
+    "get_system_info",
+    "get_resource_usage",
+    "get_battery_status",
+    "get_network_info",
+    "check_internet_connection",
+    "get_screen_resolution",
+    "get_clipboard",
+    "get_mouse_position",
+    "get_volume",
+    "list_reminders",
+    "find_large_files",
+})
+
+# GUI actions whose result is only a confirmation ("Notepad opened"), so the
+# verifier can judge them from the step description before they finish.
+# A final layer with any other tool is verified on its real results: the
+# reply to the user is built from the data those steps return
+CONFIRMATION_ONLY_TOOLS = frozenset({
+    "launch_application",
+    "focus_window",
+    "minimize_window",
+    "maximize_window",
+    "open_chrome",
+    "open_youtube",
+    "open_website",
+    "open_whatsapp",
+    "open_word",
+    "open_excel",
+    "open_powerpoint",
+    "open_notepad",
+    "open_calculator",
+    "open_calendar",
+    "open_task_manager",
+    "open_file_explorer",
+    "open_in_vscode",
+    "save_notepad",
+    "type_text",
+    "type_gui",
+    "type_in_active_window",
+    "press_key",
+    "hotkey",
+    "keyboard_shortcut",
+    "click_at",
+    "click_coordinates",
+    "scroll",
+    "set_clipboard",
+    "set_volume",
+    "mute_volume",
+    "unmute_volume",
+})
+
+# Planner results remembered per (request, tools, context)
+PLAN_CACHE_SIZE = 256
+# Cosine similarity needed for a reworded request to reuse a cached plan
+FUZZY_CACHE_THRESHOLD = 0.92
+# Learned plan templates kept per PlanningAgent
+PLAN_TEMPLATE_LIMIT = 128
+# Generated tool sources remembered by ToolCreationAgent
+TOOL_CACHE_SIZE = 128
+# Recently used tool names remembered by ExecutionAgent for startup warm-up
+TOOL_HISTORY_SIZE = 32
+# Literal words a request shape needs before it may become a template
+# ("open X" is too generic to trust, "search youtube for X" is not)
+TEMPLATE_MIN_LITERAL_WORDS = 2
+
+# Variable placeholders that plan steps use to reference earlier results
+_DOLLAR_RE = re.compile(r'\$([a-zA-Z0-9_]+)')
+_CURLY_RE = re.compile(r'\{(?:result from step |step )?(\d+)(?: result)?\}')
+_ANGLE_RE = re.compile(r'<(?:result from step |step )?(\d+)(?: result)?>')
+_DESKTOP_RE = re.compile(r'[<{\$]desktop_path[>}]?')
+# All three step-reference forms in one alternation, for dependency scans
+_STEP_REF_RE = re.compile(
+    r'\$step(\d+)_(?:result|tool|error)(?![a-zA-Z0-9_])'
+    r'|\{(?:result from step |step )?(\d+)(?: result)?\}'
+    r'|<(?:result from step |step )?(\d+)(?: result)?>'
+)
+_PLACEHOLDER_CHARS = frozenset('${<')
+# Politeness and trailing punctuation that never change the plan
+_REQUEST_FILLER_RE = re.compile(
+    r"^(?:please|can you|could you)\s+|[\s,]+please[\s.!?]*$|[\s.!?]+$", re.IGNORECASE
+)
+# Words and punctuation that start another clause ("... and save it"); a
+# template slot containing one has probably swallowed an extra instruction
+_CLAUSE_RE = re.compile(r"[,;]|\b(?:and|then|also|after|before|but|or|while|when)\b", re.IGNORECASE)
+
+# Verifier prompt; filled with str.format_map, so literal braces are doubled
+_VERIFY_PROMPT = """You are a verification agent. Analyze if the execution results meet the user's request.
+
+**User Request:** {user_request}
+
+**Expected Outcome:** {expected_outcome}
+
+**Execution Results:**
+{results_summary}
+
+**Your Task:**
+1. Verify if the results satisfy the user's request
+2. Identify any errors or issues
+3. Suggest improvements if needed
+4. Generate a user-friendly response
+
+**Response Format (JSON):**
+{{
+  "verification_status": "success|partial|failed",
+  "issues": ["list of any issues found"],
+  "user_response": "Friendly message to the user",
+  "suggestions": ["optional suggestions for improvement"]
+}}
+
+Generate the verification result now:"""
+
+# Reused decoder for pulling the JSON object out of verifier replies
+_JSON_DEC = json.JSONDecoder()
+
+# Worker threads shared by all agents for parallel steps and speculation
+AGENT_POOL_WORKERS = 16
+
+
+def _foreground_title() -> Optional[str]:
+    """Title of the foreground window, or None when it can't be read"""
+    try:
+        import win32gui
+        return win32gui.GetWindowText(win32gui.GetForegroundWindow())
+    except Exception:
+        return None
+
+
+def _window_probe(title_hint: Optional[str] = None) -> Callable[[], Callable[[], bool]]:
+    """
+    Build a readiness probe factory for a window-opening tool
+
+    Arming the probe snapshots the foreground window; it reports ready once a
+    different window (whose title contains title_hint, if given) takes focus.
+    """
+    def arm() -> Callable[[], bool]:
+        before = _foreground_title()
+
+        def ready() -> bool:
+            title = _foreground_title()
+            if not title or title == before:
+                return False
+            return title_hint is None or title_hint in title
+
+        return ready
+
+    return arm
+
+
+# Tools whose effect lands asynchronously (a window or page still loading when
+# the call returns). Probes are armed before the step and polled afterwards;
+# tools not listed here don't wait at all.
+READINESS_PROBES: Dict[str, Callable[[], Callable[[], bool]]] = {
+    "open_chrome": _window_probe("Google Chrome"),
+    "open_youtube": _window_probe("YouTube"),
+    "search_google": _window_probe("Google"),
+    "open_website": _window_probe(),
+    "launch_application": _window_probe(),
+    "open_notepad": _window_probe(),
+    "open_word": _window_probe(),
+    "open_excel": _window_probe(),
+    "open_powerpoint": _window_probe(),
+    "open_whatsapp": _window_probe(),
+    "open_calculator": _window_probe(),
+    "open_calendar": _window_probe(),
+    "open_task_manager": _window_probe(),
+    "open_file_explorer": _window_probe(),
+    "open_in_vscode": _window_probe(),
+    "focus_window": _window_probe(),
+}
+
+
+def _wait_until_ready(probe: Callable[[], bool], timeout: float) -> bool:
+    """Poll probe with exponential backoff (50 ms start) until it passes or timeout expires"""
+    deadline = time.monotonic() + timeout
+    backoff = 0.05
+    while not probe():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(backoff, remaining))
+        backoff *= 1.5
+    return True
+
+
+class RequestCoalescer:
+    """
+    Single-flight guard for planner round trips
+
+    Concurrent callers asking for the same thing (same key) wait on the call
+    already in flight instead of issuing a duplicate request. Distinct calls
+    are not serialized.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs), or join an identical call already running"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+# Shared by every agent in the process, since they all talk to the same planner
+_coalescer = RequestCoalescer()
+
+
+def _call_key(kind: str, *parts: Any) -> str:
+    """Stable key for a planner call, used to coalesce duplicates"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return kind + ":" + hashlib.sha1(payload.encode()).hexdigest()
+
+
+# Progress lines of all agents. Records go through a queue to a listener
+# thread, so console writes (slow on Windows) happen off the agent threads;
+# one logger keeps every agent's lines in order
+log = logging.getLogger("glow.orch")
+_log_lock = threading.Lock()
+
+
+def _start_log_listener():
+    """Attach the queue handler and start its listener thread, once per process"""
+    with _log_lock:
+        if log.handlers:
+            return
+        records: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter("%(message)s"))
+        listener = logging.handlers.QueueListener(records, console)
+        listener.start()
+        atexit.register(listener.stop)
+
+        log.addHandler(logging.handlers.QueueHandler(records))
+        log.setLevel(logging.INFO)
+        log.propagate = False
+
+
 class AgentRole(Enum):
     """Agent roles in the system"""
     ORCHESTRATOR = "orchestrator"
@@ -26,14 +310,119 @@ class AgentRole(Enum):
     EXECUTOR = "executor"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
     """Message passed between agents"""
     from_agent: AgentRole
     to_agent: AgentRole
     message_type: str  # "request", "response", "error", "feedback"
-    content: Dict[str, Any]
-    metadata: Dict[str, Any] = None
+    content: Any  # One of the payload classes below (verifier responses are a dict)
+    metadata: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class PlanRequest:
+    """Orchestrator -> Planner: plan a user request"""
+    user_request: str
+    available_tools: Sequence[str] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+    tools_digest: Optional[str] = None  # Precomputed digest of available_tools
+    on_delta: Optional[Callable[[str], None]] = None  # Receives conversational reply text as it streams
+
+
+@dataclass(slots=True)
+class PlanResponse:
+    """Planner -> Orchestrator: an execution plan or a conversational reply"""
+    type: str  # "plan" or "conversation"
+    intent: Dict[str, Any]
+    plan: Optional[Dict[str, Any]] = None
+    response: Optional[str] = None
+    cache_key: Optional[str] = None  # Plan cache entry the plan is stored under
+
+
+@dataclass(slots=True)
+class ToolCreationRequest:
+    """Orchestrator -> Tool Creator: generate a new tool"""
+    tool_description: Optional[str]
+    suggested_name: Optional[str]
+    user_request: str
+
+
+@dataclass(slots=True)
+class ToolCreationResponse:
+    """Tool Creator -> Orchestrator: generated tool source"""
+    tool_name: str
+    tool_code: str
+
+
+@dataclass(slots=True)
+class ExecRequest:
+    """Orchestrator -> Executor: run one tool"""
+    tool_name: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ExecResponse:
+    """Outcome of one plan step (also sent as the content of executor errors)"""
+    tool: Optional[str]
+    success: bool
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class VerifyRequest:
+    """Orchestrator -> Verifier: check step outcomes against the request"""
+    user_request: str
+    execution_results: List[ExecResponse]
+    expected_outcome: str = ""
+
+
+@dataclass(slots=True)
+class ErrorPayload:
+    """Content of an error message that isn't tied to a tool"""
+    error: str
+
+
+@dataclass(slots=True)
+class PlanTemplate:
+    """A learned plan with the request-specific values cut out as slots"""
+    pattern: "re.Pattern"  # Matches requests of this shape, one group per slot
+    signature: str  # Templated tools + parameters, to confirm the shape is stable
+    plan: Dict[str, Any]  # Plan with slot markers in place of the values
+    intent: Dict[str, Any]
+    source: str  # Request the template was last learned from
+    confirmed: bool = False
+
+
+def _canonical_request(user_request: str) -> str:
+    """
+    Collapse whitespace and drop filler so rephrasings share a cache key
+
+    Case is kept: plans copy literal text from the request into type_text,
+    write_file and the like, so "type Hello" and "type hello" need their
+    own plans.
+    """
+    text = " ".join(user_request.split())
+    return _REQUEST_FILLER_RE.sub("", text) or text
+
+
+def _slot_marker(n: int) -> str:
+    return f"{{slot_{n}}}"
+
+
+def _replace_strings(obj: Any, replacements: List[Tuple[str, str]]) -> Any:
+    """Copy a JSON-like structure applying str.replace pairs to every string"""
+    if isinstance(obj, str):
+        for old, new in replacements:
+            obj = obj.replace(old, new)
+        return obj
+    if isinstance(obj, dict):
+        return {k: _replace_strings(v, replacements) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_strings(v, replacements) for v in obj]
+    return obj
 
 
 class PlanningAgent:
@@ -42,67 +431,455 @@ class PlanningAgent:
     Uses Gemini for intelligent planning
     """
 
-    def __init__(self, gemini_planner: GeminiPlanner):
+    def __init__(self, gemini_planner: GeminiPlanner, fuzzy_cache: bool = False, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            gemini_planner: Planner used for intent analysis and planning
+            fuzzy_cache: Also reuse plans for reworded requests via sentence
+                embeddings (needs sentence-transformers)
+            cache_dir: Where plan_cache.sqlite lives (default ~/.glow)
+        """
+        _start_log_listener()
         self.planner = gemini_planner
         self.role = AgentRole.PLANNER
 
+        # key -> (intent, plan_result); plan_result is None for conversation
+        self._plan_cache: "OrderedDict[str, Tuple[Dict, Optional[Dict]]]" = OrderedDict()
+        # key -> (scope, normalized embedding) for the fuzzy tier
+        self._plan_vectors: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        # key -> (scope, canonical request) loaded from disk, embedded in one
+        # batch the first time the fuzzy tier is consulted
+        self._unembedded: Dict[str, Tuple[str, str]] = {}
+        # scope -> (keys, stacked vectors), rebuilt after _plan_vectors changes
+        # so one lookup is a single matrix-vector product
+        self._scope_index: Dict[str, Tuple[List[str], Any]] = {}
+        self._cache_lock = threading.Lock()
+        self.fuzzy_cache = fuzzy_cache
+        # (scope, request pattern) -> PlanTemplate
+        self._plan_templates: "OrderedDict[Tuple[str, str], PlanTemplate]" = OrderedDict()
+
+        # Warm start from plans learned in earlier sessions
+        self._store = open_cache_store("plan_cache.sqlite", ("plans", "templates"), cache_dir)
+        if self._store:
+            self._load_persisted()
+
+    def _load_persisted(self):
+        """Fill the in-memory caches from the persistent store"""
+        for key, value in self._store.load("plans", PLAN_CACHE_SIZE):
+            try:
+                # [intent, plan_result, scope, request]; older rows lack the last two
+                intent, plan_result, *origin = json.loads(value)
+            except (ValueError, TypeError):
+                continue
+            self._plan_cache[key] = (intent, plan_result)
+            if len(origin) == 2:
+                self._unembedded[key] = tuple(origin)
+
+        for key, value in self._store.load("templates", PLAN_TEMPLATE_LIMIT):
+            try:
+                scope, pattern = key.split("|", 1)
+                data = json.loads(value)
+                self._plan_templates[(scope, pattern)] = PlanTemplate(
+                    pattern=re.compile(pattern, re.IGNORECASE),
+                    signature=data["signature"],
+                    plan=data["plan"],
+                    intent=data["intent"],
+                    source=data["source"],
+                    confirmed=data["confirmed"]
+                )
+            except (ValueError, KeyError, re.error):
+                continue
+
+    def _learn_template(self, user_request: str, scope: str, intent: Dict, plan: Dict[str, Any]):
+        """
+        Turn a fresh plan into a reusable template
+
+        Parameter values that appear verbatim in the request become slots, and
+        the rest of the request becomes the pattern. A template is only used
+        once a second, different request of the same shape produced the same
+        templated steps, which rules out values the planner derived from the
+        request rather than copied.
+        """
+        text = " ".join(user_request.split())
+        lowered = text.lower()
+
+        values = set()
+        for step in plan.get("steps", []):
+            for value in (step.get("parameters") or {}).values():
+                if isinstance(value, str) and len(value.strip()) >= 2:
+                    values.add(value)
+
+        # Claim request spans for values, longest first
+        spans = []
+        for value in sorted(values, key=len, reverse=True):
+            needle = " ".join(value.split()).lower()
+            start = lowered.find(needle)
+            while start != -1:
+                end = start + len(needle)
+                if all(end <= s or start >= e for s, e, _ in spans):
+                    spans.append((start, end, value))
+                    break
+                start = lowered.find(needle, start + 1)
+        if not spans:
+            return
+        spans.sort()
+
+        parts, literal, pos = [], [], 0
+        for start, end, _ in spans:
+            gap = lowered[pos:start]
+            if pos and not gap.strip():
+                return  # Adjacent slots can't be told apart
+            parts.append(re.escape(gap))
+            literal.append(gap)
+            parts.append("(.+?)")
+            pos = end
+        parts.append(re.escape(lowered[pos:]))
+        literal.append(lowered[pos:])
+        if len(" ".join(literal).split()) < TEMPLATE_MIN_LITERAL_WORDS:
+            return
+
+        replacements = [(value, _slot_marker(n)) for n, (_, _, value) in enumerate(spans)]
+        templated = _replace_strings(plan, replacements)
+        signature = json.dumps(
+            [(step.get("tool"), step.get("parameters") or {}) for step in templated.get("steps", [])],
+            sort_keys=True, default=str
+        )
+        pattern = "".join(parts)
+
+        with self._cache_lock:
+            key = (scope, pattern)
+            existing = self._plan_templates.get(key)
+            confirmed = bool(
+                existing
+                and (existing.confirmed or existing.source.lower() != lowered)
+                and existing.signature == signature
+            )
+            self._plan_templates[key] = PlanTemplate(
+                pattern=re.compile(pattern, re.IGNORECASE),
+                signature=signature,
+                plan=templated,
+                intent=intent,
+                source=text,
+                confirmed=confirmed
+            )
+            self._plan_templates.move_to_end(key)
+            while len(self._plan_templates) > PLAN_TEMPLATE_LIMIT:
+                self._plan_templates.popitem(last=False)
+
+        if self._store:
+            self._store.put("templates", f"{scope}|{pattern}", json.dumps({
+                "signature": signature,
+                "plan": templated,
+                "intent": intent,
+                "source": text,
+                "confirmed": confirmed
+            }, default=str), PLAN_TEMPLATE_LIMIT)
+
+    def _match_template(self, user_request: str, scope: str) -> Optional[Tuple[Dict, Dict]]:
+        """Instantiate a confirmed template for this request, if one fits"""
+        if CACHE_DISABLED:
+            return None
+        text = " ".join(user_request.split())
+        with self._cache_lock:
+            for (template_scope, _), template in reversed(self._plan_templates.items()):
+                if template_scope != scope or not template.confirmed:
+                    continue
+                match = template.pattern.fullmatch(text)
+                if match and self._slots_fit(template, match.groups()):
+                    replacements = [(_slot_marker(n), value) for n, value in enumerate(match.groups())]
+                    plan = _replace_strings(template.plan, replacements)
+                    return template.intent, {"success": True, "plan": plan}
+        return None
+
+    @staticmethod
+    def _slots_fit(template: PlanTemplate, values: Tuple[str, ...]) -> bool:
+        """
+        Check that slot values are plain values, not extra instructions
+
+        Slots match any text, so "type X and save it" would fit a template
+        learned from "type X" with "X and save it" as the value, silently
+        dropping the save. A slot may only contain a clause boundary if the
+        value it was learned from had one too.
+        """
+        source = template.pattern.fullmatch(template.source)
+        if source is None:
+            return False
+        return all(
+            not _CLAUSE_RE.search(value) or _CLAUSE_RE.search(learned)
+            for value, learned in zip(values, source.groups())
+        )
+
+    def _plan_cache_key(
+        self,
+        user_request: str,
+        available_tools: Sequence[str],
+        context: Dict[str, Any],
+        tools_digest: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Build the exact-match cache key and its scope
+
+        The scope covers everything but the request text (tools + context),
+        so fuzzy matches are only made between requests planned under the
+        same conditions.
+        """
+        if tools_digest is None:
+            tools_digest = hashlib.blake2b(",".join(sorted(available_tools)).encode(), digest_size=16).hexdigest()
+        context_json = json.dumps(context or {}, sort_keys=True, default=str)
+        scope = hashlib.blake2b(
+            tools_digest.encode() + b"|" + context_json.encode(),
+            digest_size=16
+        ).hexdigest()
+        normalized = _canonical_request(user_request)
+        key = hashlib.blake2b(
+            normalized.encode() + b"|" + scope.encode(),
+            digest_size=16
+        ).hexdigest()
+        return key, scope
+
+    def _embed_request(self, user_request: str):
+        """Normalized sentence embedding for the fuzzy tier, or None if unavailable"""
+        from .memory import _get_embedder
+        embedder = _get_embedder()
+        if embedder is None:
+            self.fuzzy_cache = False
+            return None
+        return embedder.encode([_canonical_request(user_request)], normalize_embeddings=True)[0]
+
+    def _embed_persisted(self):
+        """Give plans loaded from disk their fuzzy-tier vectors, in one encode call"""
+        with self._cache_lock:
+            pending = [(k, v) for k, v in self._unembedded.items() if k in self._plan_cache]
+            self._unembedded.clear()
+        if not pending:
+            return
+
+        from .memory import _get_embedder
+        embedder = _get_embedder()
+        if embedder is None:
+            self.fuzzy_cache = False
+            return
+        vectors = embedder.encode([text for _, (_, text) in pending], normalize_embeddings=True)
+
+        with self._cache_lock:
+            for (key, (scope, _)), vector in zip(pending, vectors):
+                if key in self._plan_cache:
+                    self._plan_vectors.setdefault(key, (scope, vector))
+            self._scope_index.clear()
+
+    def _scope_vectors(self, scope: str) -> Optional[Tuple[List[str], Any]]:
+        """Keys and stacked fuzzy-tier vectors for one scope (call with _cache_lock held)"""
+        if scope not in self._scope_index:
+            keys = [k for k, (s, _) in self._plan_vectors.items() if s == scope]
+            if not keys:
+                return None
+            import numpy as np
+            matrix = np.stack([self._plan_vectors[k][1] for k in keys])
+            self._scope_index[scope] = (keys, matrix)
+        return self._scope_index[scope]
+
+    def _cache_lookup(
+        self, key: str, scope: str, user_request: str
+    ) -> Optional[Tuple[str, Tuple[Dict, Optional[Dict]]]]:
+        """
+        Return (key it is stored under, (intent, plan_result)) for this request, if cached
+
+        A fuzzy hit is stored under the reworded request's key, not this one.
+        """
+        if CACHE_DISABLED:
+            return None
+
+        with self._cache_lock:
+            if key in self._plan_cache:
+                self._plan_cache.move_to_end(key)
+                if self._store:
+                    self._store.touch("plans", key)
+                return key, self._plan_cache[key]
+
+        if not self.fuzzy_cache:
+            return None
+
+        if self._unembedded:
+            self._embed_persisted()
+        vector = self._embed_request(user_request)
+        if vector is None:
+            return None
+
+        with self._cache_lock:
+            indexed = self._scope_vectors(scope)
+            if indexed is None:
+                return None
+            keys, matrix = indexed
+            # Vectors are normalized, so the dot products are cosine similarities
+            scores = matrix @ vector
+            best = int(scores.argmax())
+            best_key = keys[best]
+            if scores[best] < FUZZY_CACHE_THRESHOLD or best_key not in self._plan_cache:
+                return None
+            self._plan_cache.move_to_end(best_key)
+            if self._store:
+                self._store.touch("plans", best_key)
+            return best_key, self._plan_cache[best_key]
+
+    def _cache_store(self, key: str, scope: str, user_request: str, intent: Dict, plan_result: Optional[Dict]):
+        """Remember planner output, evicting the least recently used entries"""
+        vector = self._embed_request(user_request) if self.fuzzy_cache else None
+        with self._cache_lock:
+            self._plan_cache[key] = (intent, plan_result)
+            self._plan_cache.move_to_end(key)
+            if vector is not None:
+                self._plan_vectors[key] = (scope, vector)
+                self._scope_index.pop(scope, None)
+            while len(self._plan_cache) > PLAN_CACHE_SIZE:
+                evicted, _ = self._plan_cache.popitem(last=False)
+                dropped = self._plan_vectors.pop(evicted, None)
+                if dropped is not None:
+                    self._scope_index.pop(dropped[0], None)
+
+        if self._store:
+            self._store.put(
+                "plans", key,
+                json.dumps([intent, plan_result, scope, _canonical_request(user_request)], default=str),
+                PLAN_CACHE_SIZE
+            )
+
+    def forget(self, key: str, user_request: str):
+        """
+        Drop a cached plan that didn't work, so the next attempt replans
+
+        Removes the exact entry, its fuzzy-tier vector and every template that
+        was learned from or matches this request, in memory and on disk.
+        """
+        text = " ".join(user_request.split())
+        with self._cache_lock:
+            self._plan_cache.pop(key, None)
+            self._unembedded.pop(key, None)
+            dropped = self._plan_vectors.pop(key, None)
+            if dropped is not None:
+                self._scope_index.pop(dropped[0], None)
+            stale = [
+                template_key for template_key, template in self._plan_templates.items()
+                if template.source.lower() == text.lower() or template.pattern.fullmatch(text)
+            ]
+            for template_key in stale:
+                del self._plan_templates[template_key]
+
+        if self._store:
+            self._store.delete("plans", key)
+            for scope, pattern in stale:
+                self._store.delete("templates", f"{scope}|{pattern}")
+
     def process(self, message: AgentMessage) -> AgentMessage:
         """Process incoming message and create plan"""
         if message.message_type == "request":
-            user_request = message.content.get("user_request")
-            available_tools = message.content.get("available_tools", [])
-            context = message.content.get("context", {})
+            user_request = message.content.user_request
+            available_tools = message.content.available_tools
+            context = message.content.context
+
+            # Identical requests under the same tools/context reuse earlier
+            # planner output instead of repeating the LLM round trips
+            key, scope = self._plan_cache_key(
+                user_request, available_tools, context, message.content.tools_digest
+            )
+            hit = self._cache_lookup(key, scope, user_request)
+            cached = None
+            if hit:
+                # A fuzzy hit comes back with the reworded request's key, so a
+                # failing replay evicts the plan that actually ran
+                key, cached = hit
+                log.info("[PLAN] Plan cache hit")
+            else:
+                # Same request shape with different values ("search youtube
+                # for X") reuses a learned plan with the new values filled in
+                cached = self._match_template(user_request, scope)
+                if cached:
+                    log.info("[PLAN] Plan template hit")
+                    self._cache_store(key, scope, user_request, *cached)
+
+            if cached:
+                intent, plan_result = cached
+            else:
+                # Planners that can classify and plan in one call save a round trip
+                fused = None
+                if hasattr(self.planner, "analyze_and_plan"):
+                    fused = _coalescer.call(
+                        f"fused:{id(self.planner)}:{key}",
+                        self.planner.analyze_and_plan, user_request, available_tools, context
+                    )
 
-            # Analyze intent
-            intent = self.planner.analyze_intent(user_request, context)
+                if fused:
+                    intent, plan_result = fused["intent"], fused["plan_result"]
+                    if intent.get("needs_tools"):
+                        self._cache_store(key, scope, user_request, intent, plan_result)
+                        self._learn_template(user_request, scope, intent, plan_result["plan"])
+                else:
+                    # Analyze intent
+                    intent = _coalescer.call(
+                        f"intent:{id(self.planner)}:{key}",
+                        self.planner.analyze_intent, user_request, context
+                    )
+                    plan_result = None
 
             # If just conversation, return conversational response
+            # (the reply itself is never cached, only the intent)
             if not intent.get("needs_tools"):
-                response = self.planner.conversational_response(user_request, context)
+                if not cached:
+                    self._cache_store(key, scope, user_request, intent, None)
+                if message.content.on_delta is not None:
+                    response = self.planner.conversational_response(
+                        user_request, context, on_delta=message.content.on_delta
+                    )
+                else:
+                    response = self.planner.conversational_response(user_request, context)
                 return AgentMessage(
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="response",
-                    content={
-                        "type": "conversation",
-                        "response": response,
-                        "intent": intent
-                    }
+                    content=PlanResponse(
+                        type="conversation",
+                        intent=intent,
+                        response=response
+                    )
                 )
 
             # Create execution plan
-            plan_result = self.planner.create_execution_plan(
-                user_request=user_request,
-                available_tools=available_tools,
-                context=context
-            )
+            if plan_result is None:
+                plan_result = _coalescer.call(
+                    f"plan:{id(self.planner)}:{key}",
+                    self.planner.create_execution_plan,
+                    user_request=user_request,
+                    available_tools=available_tools,
+                    context=context
+                )
+                if plan_result["success"]:
+                    self._cache_store(key, scope, user_request, intent, plan_result)
+                    self._learn_template(user_request, scope, intent, plan_result["plan"])
 
             if plan_result["success"]:
                 return AgentMessage(
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="response",
-                    content={
-                        "type": "plan",
-                        "plan": plan_result["plan"],
-                        "intent": intent
-                    }
+                    content=PlanResponse(
+                        type="plan",
+                        intent=intent,
+                        plan=plan_result["plan"],
+                        cache_key=key
+                    )
                 )
             else:
                 return AgentMessage(
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="error",
-                    content={
-                        "error": plan_result["error"]
-                    }
+                    content=ErrorPayload(plan_result["error"])
                 )
 
         return AgentMessage(
             from_agent=self.role,
             to_agent=message.from_agent,
             message_type="error",
-            content={"error": "Unknown message type"}
+            content=ErrorPayload("Unknown message type")
         )
 
 
@@ -112,49 +889,83 @@ class ToolCreationAgent:
     Uses Gemini to generate tool code
     """
 
-    def __init__(self, gemini_planner: GeminiPlanner):
+    def __init__(self, gemini_planner: GeminiPlanner, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            gemini_planner: Planner used to generate tool code
+            cache_dir: Where tool_code.sqlite lives (default ~/.glow)
+        """
+        _start_log_listener()
         self.planner = gemini_planner
         self.role = AgentRole.TOOL_CREATOR
 
+        # (description, name) key -> {"tool_name", "tool_code"}, kept across restarts
+        self._tool_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._store = open_cache_store("tool_code.sqlite", ("tools",), cache_dir)
+        if self._store:
+            for key, value in self._store.load("tools", TOOL_CACHE_SIZE):
+                try:
+                    self._tool_cache[key] = json.loads(value)
+                except ValueError:
+                    continue
+
     def process(self, message: AgentMessage) -> AgentMessage:
         """Process tool creation request"""
         if message.message_type == "request":
-            tool_description = message.content.get("tool_description")
-            suggested_name = message.content.get("suggested_name")
-            user_request = message.content.get("user_request")
-
-            # Generate tool code
-            result = self.planner.create_new_tool(
-                tool_description=tool_description,
-                suggested_name=suggested_name,
-                user_request=user_request
-            )
+            tool_description = message.content.tool_description
+            suggested_name = message.content.suggested_name
+            user_request = message.content.user_request
+
+            # The same tool description yields the same tool; reuse it
+            cache_key = _call_key("tool", tool_description, suggested_name)
+            cached = None if CACHE_DISABLED else self._tool_cache.get(cache_key)
+
+            if cached:
+                log.info(f"  [TOOL] Reusing generated tool '{cached['tool_name']}'")
+                self._tool_cache.move_to_end(cache_key)
+                if self._store:
+                    self._store.touch("tools", cache_key)
+                result = {"success": True, **cached}
+            else:
+                # Generate tool code
+                result = _coalescer.call(
+                    _call_key(f"tool:{id(self.planner)}", tool_description, suggested_name, user_request),
+                    self.planner.create_new_tool,
+                    tool_description=tool_description,
+                    suggested_name=suggested_name,
+                    user_request=user_request
+                )
+                if result["success"]:
+                    entry = {"tool_name": result["tool_name"], "tool_code": result["tool_code"]}
+                    self._tool_cache[cache_key] = entry
+                    while len(self._tool_cache) > TOOL_CACHE_SIZE:
+                        self._tool_cache.popitem(last=False)
+                    if self._store:
+                        self._store.put("tools", cache_key, json.dumps(entry), TOOL_CACHE_SIZE)
 
             if result["success"]:
                 return AgentMessage(
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="response",
-                    content={
-                        "tool_name": result["tool_name"],
-                        "tool_code": result["tool_code"]
-                    }
+                    content=ToolCreationResponse(
+                        tool_name=result["tool_name"],
+                        tool_code=result["tool_code"]
+                    )
                 )
             else:
                 return AgentMessage(
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="error",
-                    content={
-                        "error": result["error"]
-                    }
+                    content=ErrorPayload(result["error"])
                 )
 
         return AgentMessage(
             from_agent=self.role,
             to_agent=message.from_agent,
             message_type="error",
-            content={"error": "Unknown message type"}
+            content=ErrorPayload("Unknown message type")
         )
 
 
@@ -171,51 +982,41 @@ class VerificationAgent:
     def process(self, message: AgentMessage) -> AgentMessage:
         """Process verification request"""
         if message.message_type == "request":
-            user_request = message.content.get("user_request")
-            execution_results = message.content.get("execution_results", [])
-            expected_outcome = message.content.get("expected_outcome", "")
+            user_request = message.content.user_request
+            execution_results = message.content.execution_results
+            expected_outcome = message.content.expected_outcome
 
             # Build verification prompt
-            results_summary = "\n".join([
-                f"- {r.get('tool', 'Unknown')}: {r.get('result', r.get('error', 'No result'))} ({'[OK] Success' if r.get('success', False) else '[FAIL] Failed'})"
-                for r in execution_results
-            ])
-
-            prompt = f"""You are a verification agent. Analyze if the execution results meet the user's request.
-
-**User Request:** {user_request}
-
-**Expected Outcome:** {expected_outcome}
-
-**Execution Results:**
-{results_summary}
-
-**Your Task:**
-1. Verify if the results satisfy the user's request
-2. Identify any errors or issues
-3. Suggest improvements if needed
-4. Generate a user-friendly response
+            lines = []
+            for r in execution_results:
+                outcome = r.result if r.result is not None else (r.error or 'No result')
+                lines.append(f"- {r.tool or 'Unknown'}: {outcome} ({'[OK] Success' if r.success else '[FAIL] Failed'})")
+            results_summary = "\n".join(lines)
 
-**Response Format (JSON):**
-{{
-  "verification_status": "success|partial|failed",
-  "issues": ["list of any issues found"],
-  "user_response": "Friendly message to the user",
-  "suggestions": ["optional suggestions for improvement"]
-}}
 
-Generate the verification result now:"""
+            prompt = _VERIFY_PROMPT.format_map({
+                "user_request": user_request,
+                "expected_outcome": expected_outcome,
+                "results_summary": results_summary
+            })
 
             try:
-                response = self.planner.model.generate_content(prompt)
+                response = _coalescer.call(
+                    _call_key(f"verify:{id(self.planner)}", prompt),
+                    self.planner.model.generate_content, prompt
+                )
                 result_text = response.text.strip()
 
-                # Parse JSON
+                # Parse the first JSON object in one pass; raw_decode stops at
+                # its matching brace, so prose or fences around it don't matter
+                result_json = None
                 start = result_text.find('{')
-                end = result_text.rfind('}') + 1
-                if start != -1 and end > 0:
-                    result_json = json.loads(result_text[start:end])
-                else:
+                if start != -1:
+                    try:
+                        result_json, _ = _JSON_DEC.raw_decode(result_text, start)
+                    except ValueError:
+                        result_json = None
+                if not isinstance(result_json, dict):
                     result_json = {
                         "verification_status": "success",
                         "issues": [],
@@ -235,14 +1036,14 @@ Generate the verification result now:"""
                     from_agent=self.role,
                     to_agent=AgentRole.ORCHESTRATOR,
                     message_type="error",
-                    content={"error": str(e)}
+                    content=ErrorPayload(str(e))
                 )
 
         return AgentMessage(
             from_agent=self.role,
             to_agent=message.from_agent,
             message_type="error",
-            content={"error": "Unknown message type"}
+            content=ErrorPayload("Unknown message type")
         )
 
 
@@ -252,60 +1053,145 @@ class ExecutionAgent:
     Uses FunctionGemma for precise tool calling
     """
 
-    def __init__(self, llm_client: OllamaClient, tool_registry: Dict):
+    def __init__(
+        self,
+        llm_client: OllamaClient,
+        tool_registry: Dict,
+        pool: Optional[ThreadPoolExecutor] = None,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            llm_client: Unused; tools are called directly
+            tool_registry: Tool name -> function
+            pool: Runs blocking tools for aprocess (asyncio's default executor if None)
+            cache_dir: Where tool_history.sqlite lives (default ~/.glow)
+        """
         self.llm = llm_client
         self.tool_registry = tool_registry
         self.role = AgentRole.EXECUTOR
+        self.pool = pool
+
+        # Which tools were used most recently, kept across sessions so the
+        # app can import their modules ahead of the first command
+        self._history = open_cache_store("tool_history.sqlite", ("tools",), cache_dir)
+
+        # Bumped whenever a tool is registered; invalidates the name snapshot
+        self._tools_version = 0
+        self._tools_cache: Optional[Tuple[Tuple[str, ...], str]] = None
+        self._tools_cache_len = -1
+
+    def register_tool(self, name: str, fn: Callable):
+        """Add (or replace) a tool and invalidate the cached name snapshot"""
+        self.tool_registry[name] = fn
+        self._tools_version += 1
+        self._tools_cache = None
+
+    def recent_tools(self, limit: int) -> List[str]:
+        """Names of up to limit tools used in this or earlier sessions, most recent first"""
+        if not self._history:
+            return []
+        return [name for name, _ in reversed(self._history.load("tools", limit))]
+
+    def _record_use(self, tool_name: str):
+        """Note that a tool was just used (written by the store's background thread)"""
+        if self._history:
+            self._history.put("tools", tool_name, "", TOOL_HISTORY_SIZE)
+
+    def tool_names_snapshot(self) -> Tuple[Tuple[str, ...], str]:
+        """
+        Registered tool names and a digest of them
+
+        Names keep registry order (the planners list them grouped by
+        category); the digest is order-independent. Both are reused until a
+        tool is registered, or the registry is resized behind our back.
+        """
+        if self._tools_cache is None or self._tools_cache_len != len(self.tool_registry):
+            names = tuple(self.tool_registry)
+            digest = hashlib.blake2b(",".join(sorted(names)).encode(), digest_size=16).hexdigest()
+            self._tools_cache = (names, digest)
+            self._tools_cache_len = len(names)
+        return self._tools_cache
+
+    def _tool_response(self, tool_name: str, result: Any) -> AgentMessage:
+        return AgentMessage(
+            from_agent=self.role,
+            to_agent=AgentRole.ORCHESTRATOR,
+            message_type="response",
+            content=ExecResponse(tool=tool_name, success=True, result=result)
+        )
+
+    def _tool_error(self, tool_name: str, error: str) -> AgentMessage:
+        return AgentMessage(
+            from_agent=self.role,
+            to_agent=AgentRole.ORCHESTRATOR,
+            message_type="error",
+            content=ExecResponse(tool=tool_name, success=False, error=error)
+        )
+
+    def _unknown_message(self, message: AgentMessage) -> AgentMessage:
+        return AgentMessage(
+            from_agent=self.role,
+            to_agent=message.from_agent,
+            message_type="error",
+            content=ErrorPayload("Unknown message type")
+        )
 
     def process(self, message: AgentMessage) -> AgentMessage:
         """Process tool execution request"""
         if message.message_type == "request":
-            tool_name = message.content.get("tool_name")
-            parameters = message.content.get("parameters", {})
+            tool_name = message.content.tool_name
+            parameters = message.content.parameters
 
             # Execute tool
             if tool_name in self.tool_registry:
                 try:
-                    result = self.tool_registry[tool_name](**parameters)
-                    return AgentMessage(
-                        from_agent=self.role,
-                        to_agent=AgentRole.ORCHESTRATOR,
-                        message_type="response",
-                        content={
-                            "tool": tool_name,
-                            "result": result,
-                            "success": True
-                        }
-                    )
+                    # Inside the try: the lookup may import the tool's module
+                    tool = self.tool_registry[tool_name]
+                    self._record_use(tool_name)
+                    if inspect.iscoroutinefunction(tool):
+                        # Coroutine tool called from a plain worker thread
+                        result = asyncio.run(tool(**parameters))
+                    else:
+                        result = tool(**parameters)
+                    return self._tool_response(tool_name, result)
                 except Exception as e:
-                    return AgentMessage(
-                        from_agent=self.role,
-                        to_agent=AgentRole.ORCHESTRATOR,
-                        message_type="error",
-                        content={
-                            "tool": tool_name,
-                            "error": str(e),
-                            "success": False
-                        }
-                    )
+                    return self._tool_error(tool_name, str(e))
             else:
-                return AgentMessage(
-                    from_agent=self.role,
-                    to_agent=AgentRole.ORCHESTRATOR,
-                    message_type="error",
-                    content={
-                        "tool": tool_name,
-                        "error": f"Tool '{tool_name}' not found",
-                        "success": False
-                    }
-                )
+                return self._tool_error(tool_name, f"Tool '{tool_name}' not found")
 
-        return AgentMessage(
-            from_agent=self.role,
-            to_agent=message.from_agent,
-            message_type="error",
-            content={"error": "Unknown message type"}
-        )
+        return self._unknown_message(message)
+
+    async def aprocess(self, message: AgentMessage) -> AgentMessage:
+        """
+        Async variant of process for callers that run an event loop
+
+        Coroutine tools are awaited directly; blocking tools run in a worker
+        thread so several tool calls can be in flight on one loop.
+        """
+        if message.message_type == "request":
+            tool_name = message.content.tool_name
+            parameters = message.content.parameters
+
+            if tool_name in self.tool_registry:
+                try:
+                    # Inside the try: the lookup may import the tool's module
+                    tool = self.tool_registry[tool_name]
+                    self._record_use(tool_name)
+                    if inspect.iscoroutinefunction(tool):
+                        result = await tool(**parameters)
+                    elif self.pool is not None:
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(self.pool, functools.partial(tool, **parameters))
+                    else:
+                        result = await asyncio.to_thread(tool, **parameters)
+                    return self._tool_response(tool_name, result)
+                except Exception as e:
+                    return self._tool_error(tool_name, str(e))
+            else:
+                return self._tool_error(tool_name, f"Tool '{tool_name}' not found")
+
+        return self._unknown_message(message)
 
 
 class OrchestratorAgent:
@@ -319,36 +1205,69 @@ class OrchestratorAgent:
         planner: PlanningAgent,
         tool_creator: ToolCreationAgent,
         verifier: VerificationAgent,
-        executor: ExecutionAgent
+        executor: ExecutionAgent,
+        speculative_verification: bool = True,
+        verify_sample_rate: int = 0,
+        pool: Optional[ThreadPoolExecutor] = None
     ):
+        """
+        Args:
+            pool: Thread pool for parallel steps and speculation; a private
+                one is created if not given
+            speculative_verification: Overlap the verifier call with the final plan layer
+            verify_sample_rate: Still verify every Nth fully successful plan that
+                has its own final_response (0 = never), to catch planner drift
+        """
+        _start_log_listener()
         self.planner = planner
         self.tool_creator = tool_creator
         self.verifier = verifier
         self.executor = executor
         self.role = AgentRole.ORCHESTRATOR
+        self.speculative_verification = speculative_verification
+        self.verify_sample_rate = verify_sample_rate
+        # Counts plans that skipped the verifier; next() on it is atomic, so
+        # concurrent requests never lose a sample
+        self._plans_with_response = itertools.count(1)
+        self.pool = pool or ThreadPoolExecutor(max_workers=AGENT_POOL_WORKERS, thread_name_prefix="glow-agent")
+        # sha1(tool source) -> compiled code, so regenerated tools skip compile
+        self._tool_code_cache: Dict[str, types.CodeType] = {}
+
+    def _load_tool(self, tool_name: str, tool_code: str) -> Callable:
+        """
+        Compile generated tool source and return the named function
+
+        Each tool runs in its own namespace instead of this module's globals.
+        """
+        key = hashlib.sha1(tool_code.encode()).hexdigest()
+        code = self._tool_code_cache.get(key)
+        if code is None:
+            code = compile(tool_code, f"<tool:{tool_name}>", "exec")
+            self._tool_code_cache[key] = code
+        namespace = {"__name__": f"glow_tool_{tool_name}"}
+        exec(code, namespace)
+        return namespace[tool_name]
 
     def _substitute_variables(self, parameters: Dict[str, Any], step_outputs: Dict[str, str]) -> Dict[str, Any]:
         """
         Substitute variables in parameters with actual values from previous steps
         Supports: $step1_result, {result from step 1}, <step 1 result>, etc.
         """
-        import re
-
         def replace_dollar_var(match):
             var_name = match.group(1)
-            return step_outputs.get(var_name, match.group(0))
+            return str(step_outputs.get(var_name, match.group(0)))
 
         def replace_curly_var(match):
             # Matches {result from step N}, {step N result}, etc.
             step_num = match.group(1)
             var_name = f"step{step_num}_result"
-            return step_outputs.get(var_name, match.group(0))
+            return str(step_outputs.get(var_name, match.group(0)))
 
         def replace_angle_var(match):
             # Matches <result from step N>, <step N result>, etc.
             step_num = match.group(1)
             var_name = f"step{step_num}_result"
-            return step_outputs.get(var_name, match.group(0))
+            return str(step_outputs.get(var_name, match.group(0)))
 
         def replace_desktop_path(match):
             # Matches <desktop_path>, $desktop_path, {desktop_path}
@@ -362,18 +1281,19 @@ class OrchestratorAgent:
         # Process each parameter
         substituted = {}
         for key, value in parameters.items():
-            if isinstance(value, str):
+            # Most parameters are plain literals; skip the regex passes for them
+            if isinstance(value, str) and not _PLACEHOLDER_CHARS.isdisjoint(value):
                 # Replace $stepN_result
-                value = re.sub(r'\$([a-zA-Z0-9_]+)', replace_dollar_var, value)
+                value = _DOLLAR_RE.sub(replace_dollar_var, value)
 
                 # Replace {result from step N} or {step N result}
-                value = re.sub(r'\{(?:result from step |step )?(\d+)(?: result)?\}', replace_curly_var, value)
+                value = _CURLY_RE.sub(replace_curly_var, value)
 
                 # Replace <result from step N> or <step N result>
-                value = re.sub(r'<(?:result from step |step )?(\d+)(?: result)?>', replace_angle_var, value)
+                value = _ANGLE_RE.sub(replace_angle_var, value)
 
                 # Replace desktop_path placeholders
-                value = re.sub(r'[<{\$]desktop_path[>}]?', replace_desktop_path, value)
+                value = _DESKTOP_RE.sub(replace_desktop_path, value)
 
                 substituted[key] = value
             else:
@@ -381,185 +1301,353 @@ class OrchestratorAgent:
 
         return substituted
 
-    def run(self, user_input: str, context: Dict[str, Any] = None) -> str:
+    def _step_dependencies(self, parameters: Dict[str, Any]) -> Set[int]:
+        """Collect the step numbers a step's parameters reference"""
+        refs = set()
+        for value in parameters.values():
+            if not isinstance(value, str) or _PLACEHOLDER_CHARS.isdisjoint(value):
+                continue
+            # One pass over the string instead of one per placeholder form
+            for match in _STEP_REF_RE.finditer(value):
+                refs.add(int(match.group(match.lastindex)))
+        return refs
+
+    def _layer_steps(self, steps: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group plan steps (1-based) into layers that can run concurrently
+
+        A step waits for every step it references. GUI actions additionally
+        wait for everything before them and block everything after them, so
+        only runs of read-only steps ever share a layer.
+        """
+        levels: Dict[int, int] = {}
+        last_barrier = 0  # Most recent step that isn't parallel-safe
+        desktop_steps = []
+
+        for i, step in enumerate(steps, 1):
+            tool_name = step.get("tool")
+            parameters = step.get("parameters") or {}
+
+            deps = {d for d in self._step_dependencies(parameters) if 0 < d < i}
+            if any(isinstance(v, str) and "desktop_path" in v for v in parameters.values()):
+                deps.update(desktop_steps)
+
+            if tool_name in PARALLEL_SAFE_TOOLS:
+                if last_barrier:
+                    deps.add(last_barrier)
+            else:
+                deps.update(range(1, i))
+                last_barrier = i
+
+            if tool_name == "get_desktop_path":
+                desktop_steps.append(i)
+
+            levels[i] = 1 + max((levels[d] for d in deps), default=-1)
+
+        layers: List[List[int]] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for i, level in levels.items():
+            layers[level].append(i)
+        return layers
+
+    def _execute_step(
+        self,
+        i: int,
+        steps: List[Dict[str, Any]],
+        parameters: Dict[str, Any],
+        user_input: str
+    ) -> Tuple[ExecResponse, Dict[str, Any]]:
+        """
+        Run a single plan step
+
+        Returns:
+            (execution result, step outputs to merge for later steps)
+        """
+        step = steps[i - 1]
+        tool_name = step.get("tool")
+        description = step.get("description", "")
+        step_outputs = {}
+
+        log.info(f"\n  Step {i}/{len(steps)}: {description}")
+
+        # Handle tool creation
+        if tool_name == "CREATE_NEW_TOOL":
+            log.info(f"  [TOOL] ORCHESTRATOR -> TOOL_CREATOR: Create new tool")
+
+            creator_msg = AgentMessage(
+                from_agent=self.role,
+                to_agent=AgentRole.TOOL_CREATOR,
+                message_type="request",
+                content=ToolCreationRequest(
+                    tool_description=parameters.get("tool_description"),
+                    suggested_name=parameters.get("suggested_name"),
+                    user_request=user_input
+                )
+            )
+
+            creator_response = self.tool_creator.process(creator_msg)
+
+            if creator_response.message_type == "response":
+                # Register new tool
+                tool_code = creator_response.content.tool_code
+                new_tool_name = creator_response.content.tool_name
+
+                try:
+                    self.executor.register_tool(new_tool_name, self._load_tool(new_tool_name, tool_code))
+                    log.info(f"  [OK] TOOL_CREATOR -> ORCHESTRATOR: Created '{new_tool_name}'")
+
+                    return ExecResponse(
+                        tool="CREATE_NEW_TOOL",
+                        success=True,
+                        result=f"Created tool: {new_tool_name}"
+                    ), step_outputs
+                except Exception as e:
+                    log.info(f"  [FAIL] TOOL_CREATOR -> ORCHESTRATOR: Failed - {e}")
+                    return ExecResponse(
+                        tool="CREATE_NEW_TOOL",
+                        success=False,
+                        result=f"Error: {str(e)}"
+                    ), step_outputs
+            else:
+                log.info(f"  [FAIL] TOOL_CREATOR -> ORCHESTRATOR: {creator_response.content.error}")
+                return ExecResponse(
+                    tool="CREATE_NEW_TOOL",
+                    success=False,
+                    result=creator_response.content.error
+                ), step_outputs
+
+        # Regular tool execution
+        log.info(f"  [EXEC] ORCHESTRATOR -> EXECUTOR: Execute '{tool_name}'")
+
+        executor_msg = AgentMessage(
+            from_agent=self.role,
+            to_agent=AgentRole.EXECUTOR,
+            message_type="request",
+            content=ExecRequest(tool_name=tool_name, parameters=parameters)
+        )
+
+        executor_response = self.executor.process(executor_msg)
+
+        if executor_response.message_type == "response":
+            log.info(f"  [OK] EXECUTOR -> ORCHESTRATOR: Step {i} success")
+            # Store result for potential use in subsequent steps
+            step_outputs[f"step{i}_result"] = executor_response.content.result
+            step_outputs[f"step{i}_tool"] = tool_name
+        else:
+            log.info(f"  [FAIL] EXECUTOR -> ORCHESTRATOR: {executor_response.content.error}")
+            step_outputs[f"step{i}_result"] = ""
+            step_outputs[f"step{i}_error"] = executor_response.content.error or ''
+
+        return executor_response.content, step_outputs
+
+    def _verification_message(
+        self,
+        user_input: str,
+        execution_results: List[ExecResponse],
+        plan: Dict[str, Any]
+    ) -> AgentMessage:
+        """Build the request sent to the verifier"""
+        return AgentMessage(
+            from_agent=self.role,
+            to_agent=AgentRole.VERIFIER,
+            message_type="request",
+            content=VerifyRequest(
+                user_request=user_input,
+                execution_results=execution_results,
+                expected_outcome=plan.get("final_response", "")
+            )
+        )
+
+    def run(
+        self,
+        user_input: str,
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> str:
         """
         Run the complete multi-agent workflow
 
         Args:
             user_input: User's request
             context: Optional context
+            on_delta: Receives a conversational reply piece by piece as the
+                planner streams it (plans and tool results are not streamed)
 
         Returns:
             Final response to user
         """
-        print(f"\n{'='*60}")
-        print(f"[ORCH] ORCHESTRATOR: Processing request")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"[ORCH] ORCHESTRATOR: Processing request")
+        log.info(f"{'='*60}\n")
 
         context = context or {}
 
         # Step 1: Send to Planning Agent
-        print("[PLAN] ORCHESTRATOR -> PLANNER: Create execution plan")
+        log.info("[PLAN] ORCHESTRATOR -> PLANNER: Create execution plan")
+        tool_names, tools_digest = self.executor.tool_names_snapshot()
         planner_msg = AgentMessage(
             from_agent=self.role,
             to_agent=AgentRole.PLANNER,
             message_type="request",
-            content={
-                "user_request": user_input,
-                "available_tools": list(self.executor.tool_registry.keys()),
-                "context": context
-            }
+            content=PlanRequest(
+                user_request=user_input,
+                available_tools=tool_names,
+                context=context,
+                tools_digest=tools_digest,
+                on_delta=on_delta
+            )
         )
 
         plan_response = self.planner.process(planner_msg)
 
         # Check for errors
         if plan_response.message_type == "error":
-            error_msg = plan_response.content.get("error", "Unknown error")
-            print(f"[FAIL] PLANNER -> ORCHESTRATOR: Error - {error_msg}")
+            error_msg = plan_response.content.error or "Unknown error"
+            log.info(f"[FAIL] PLANNER -> ORCHESTRATOR: Error - {error_msg}")
             return f"Error: {error_msg}"
 
         # If just conversation, return response
-        if plan_response.content.get("type") == "conversation":
-            print("[MSG] PLANNER -> ORCHESTRATOR: Conversational response")
-            return plan_response.content.get("response")
+        if plan_response.content.type == "conversation":
+            log.info("[MSG] PLANNER -> ORCHESTRATOR: Conversational response")
+            return plan_response.content.response
 
         # Get execution plan
-        plan = plan_response.content.get("plan", {})
+        plan = plan_response.content.plan or {}
         steps = plan.get("steps", [])
 
-        print(f"[PLAN] PLANNER -> ORCHESTRATOR: Plan created ({len(steps)} steps)")
+        log.info(f"[PLAN] PLANNER -> ORCHESTRATOR: Plan created ({len(steps)} steps)")
+
+        # A plan that ships its own final_response doesn't need the verifier
+        # when every step succeeds, apart from the occasional sampled check.
+        # The planner writes it before anything runs, so it can only stand in
+        # for the verifier if it quotes the step results or there is no data
+        # to report (every step is a GUI action that only confirms)
+        final_response = plan.get("final_response")
+        self_answering = bool(final_response) and (
+            _STEP_REF_RE.search(final_response) is not None
+            or all(step.get("tool") in CONFIRMATION_ONLY_TOOLS for step in steps)
+        )
+        needs_verification = not self_answering
+        if self_answering and self.verify_sample_rate > 0:
+            needs_verification = next(self._plans_with_response) % self.verify_sample_rate == 0
 
-        # Step 2: Execute plan
-        execution_results = []
+        # Step 2: Execute plan, one dependency layer at a time
+        speculation = None
+        execution_results: List[Optional[ExecResponse]] = [None] * len(steps)
         step_outputs = {}  # Store outputs from each step for chaining
 
-        for i, step in enumerate(steps, 1):
-            tool_name = step.get("tool")
-            parameters = step.get("parameters", {})
-            description = step.get("description", "")
-
+        layers = self._layer_steps(steps)
+        for layer_num, layer in enumerate(layers, 1):
             # Substitute variables from previous step results
             # Example: "$step1_result" gets replaced with actual result from step 1
-            if parameters:
-                parameters = self._substitute_variables(parameters, step_outputs)
-
-            print(f"\n  Step {i}/{len(steps)}: {description}")
-
-            # Handle tool creation
-            if tool_name == "CREATE_NEW_TOOL":
-                print(f"  [TOOL] ORCHESTRATOR -> TOOL_CREATOR: Create new tool")
-
-                creator_msg = AgentMessage(
-                    from_agent=self.role,
-                    to_agent=AgentRole.TOOL_CREATOR,
-                    message_type="request",
-                    content={
-                        "tool_description": parameters.get("tool_description"),
-                        "suggested_name": parameters.get("suggested_name"),
-                        "user_request": user_input
-                    }
+            # Every reference points into an earlier layer, so outputs are ready
+            prepared = []
+            for i in layer:
+                parameters = steps[i - 1].get("parameters", {})
+                if parameters:
+                    parameters = self._substitute_variables(parameters, step_outputs)
+                prepared.append((i, parameters))
+
+            # Verification only needs the final results, so while the last
+            # layer runs, verify speculatively assuming every step in it
+            # succeeds; the outcome is used only if that assumption holds.
+            # Only for pure GUI actions: a step that returns data has to be
+            # verified on that data, or the reply would leave it out
+            speculation = None
+            if (
+                layer_num == len(layers)
+                and needs_verification
+                and self.speculative_verification
+                and all(steps[i - 1].get("tool") in CONFIRMATION_ONLY_TOOLS for i in layer)
+            ):
+                assumed = list(execution_results)
+                for i in layer:
+                    assumed[i - 1] = ExecResponse(
+                        tool=steps[i - 1].get("tool"),
+                        success=True,
+                        result=steps[i - 1].get("description") or "Completed"
+                    )
+                speculation = self.pool.submit(
+                    self.verifier.process,
+                    self._verification_message(user_input, assumed, plan)
                 )
 
-                creator_response = self.tool_creator.process(creator_msg)
-
-                if creator_response.message_type == "response":
-                    # Register new tool
-                    tool_code = creator_response.content.get("tool_code")
-                    new_tool_name = creator_response.content.get("tool_name")
-
-                    try:
-                        exec(tool_code, globals())
-                        self.executor.tool_registry[new_tool_name] = globals()[new_tool_name]
-                        print(f"  [OK] TOOL_CREATOR -> ORCHESTRATOR: Created '{new_tool_name}'")
-
-                        execution_results.append({
-                            "tool": "CREATE_NEW_TOOL",
-                            "result": f"Created tool: {new_tool_name}",
-                            "success": True
-                        })
-                    except Exception as e:
-                        print(f"  [FAIL] TOOL_CREATOR -> ORCHESTRATOR: Failed - {e}")
-                        execution_results.append({
-                            "tool": "CREATE_NEW_TOOL",
-                            "result": f"Error: {str(e)}",
-                            "success": False
-                        })
-                else:
-                    print(f"  [FAIL] TOOL_CREATOR -> ORCHESTRATOR: {creator_response.content.get('error')}")
-                    execution_results.append({
-                        "tool": "CREATE_NEW_TOOL",
-                        "result": creator_response.content.get("error"),
-                        "success": False
-                    })
-
+            probe = None
+            if len(prepared) == 1:
+                i, parameters = prepared[0]
+                tool_name = steps[i - 1].get("tool")
+                # Arm before running so the probe sees the window it replaces
+                if layer_num < len(layers) and tool_name in READINESS_PROBES:
+                    probe = READINESS_PROBES[tool_name]()
+                outcomes = [(i, self._execute_step(i, steps, parameters, user_input))]
             else:
-                # Regular tool execution
-                print(f"  [EXEC] ORCHESTRATOR -> EXECUTOR: Execute '{tool_name}'")
-
-                executor_msg = AgentMessage(
-                    from_agent=self.role,
-                    to_agent=AgentRole.EXECUTOR,
-                    message_type="request",
-                    content={
-                        "tool_name": tool_name,
-                        "parameters": parameters
-                    }
-                )
-
-                executor_response = self.executor.process(executor_msg)
-
-                if executor_response.message_type == "response":
-                    print(f"  [OK] EXECUTOR -> ORCHESTRATOR: Success")
-                    execution_results.append(executor_response.content)
-                    # Store result for potential use in subsequent steps
-                    step_outputs[f"step{i}_result"] = executor_response.content.get("result", "")
-                    step_outputs[f"step{i}_tool"] = tool_name
-                else:
-                    print(f"  [FAIL] EXECUTOR -> ORCHESTRATOR: {executor_response.content.get('error')}")
-                    execution_results.append(executor_response.content)
-                    step_outputs[f"step{i}_result"] = ""
-                    step_outputs[f"step{i}_error"] = executor_response.content.get('error', '')
-
-                # IMPORTANT: Wait for step to complete before starting next step
-                # This ensures pages load, apps open, etc. before next action
-                import time
-                if i < len(steps):  # Don't wait after last step
-                    wait_time = 1.5  # Default wait between steps
-                    # Longer wait for browser/app opening actions
-                    if tool_name in ['open_chrome', 'open_youtube', 'search_google', 'launch_application']:
-                        wait_time = 2.0
-                    print(f"  [WAIT] Waiting {wait_time}s for step to complete...")
-                    time.sleep(wait_time)
-
-        # Step 3: Verify results
-        print(f"\n[VERIFY] ORCHESTRATOR -> VERIFIER: Verify results")
-
-        verifier_msg = AgentMessage(
-            from_agent=self.role,
-            to_agent=AgentRole.VERIFIER,
-            message_type="request",
-            content={
-                "user_request": user_input,
-                "execution_results": execution_results,
-                "expected_outcome": plan.get("final_response", "")
-            }
-        )
-
-        verification_response = self.verifier.process(verifier_msg)
+                log.info(f"\n  [PAR] Running steps {', '.join(str(i) for i, _ in prepared)} in parallel")
+                outcomes = []
+                futures = {
+                    self.pool.submit(self._execute_step, i, steps, parameters, user_input): i
+                    for i, parameters in prepared
+                }
+                for future in as_completed(futures):
+                    outcomes.append((futures[future], future.result()))
+
+            for i, (result, outputs) in outcomes:
+                execution_results[i - 1] = result
+                step_outputs.update(outputs)
+
+            # IMPORTANT: Wait for launched windows/pages before starting next layer
+            # so the next action doesn't land in the wrong place. Polls a cheap
+            # probe instead of sleeping, capped at the old fixed delays.
+            if probe and execution_results[layer[0] - 1].success:
+                # Longer cap for browser/app opening actions
+                timeout = 2.0 if tool_name in ['open_chrome', 'open_youtube', 'search_google', 'launch_application'] else 1.5
+                log.info(f"  [WAIT] Waiting up to {timeout}s for '{tool_name}' to be ready...")
+                if not _wait_until_ready(probe, timeout):
+                    log.info(f"  [WAIT] '{tool_name}' not confirmed ready, continuing")
+
+        # A cached plan that failed would be replayed on every retry (and
+        # after restarts), so make the next attempt go back to the planner
+        plan_failed = not all(r.success for r in execution_results)
+        if plan_failed and plan_response.content.cache_key:
+            log.info("[PLAN] ORCHESTRATOR: Plan failed, dropping it from the plan cache")
+            self.planner.forget(plan_response.content.cache_key, user_input)
+
+        # Step 3: Verify results (skipped on the happy path)
+        if not needs_verification and not plan_failed:
+            log.info(f"\n[OK] ORCHESTRATOR: All steps succeeded, using plan's final response")
+            response = self._substitute_variables({"text": final_response}, step_outputs)["text"]
+
+            log.info(f"\n{'='*60}")
+            log.info(f"[ORCH] ORCHESTRATOR: Task completed - success")
+            log.info(f"{'='*60}\n")
+
+            return response
+
+        if speculation is not None and all(execution_results[i - 1].success for i in layers[-1]):
+            log.info(f"\n[VERIFY] ORCHESTRATOR -> VERIFIER: Using speculative verification")
+            verification_response = speculation.result()
+        else:
+            if speculation is not None:
+                speculation.cancel()  # Last layer failed; its assumption is wrong
+            log.info(f"\n[VERIFY] ORCHESTRATOR -> VERIFIER: Verify results")
+            verification_response = self.verifier.process(
+                self._verification_message(user_input, execution_results, plan)
+            )
 
         if verification_response.message_type == "response":
             status = verification_response.content.get("verification_status")
             user_response = verification_response.content.get("user_response")
             issues = verification_response.content.get("issues", [])
 
-            print(f"[OK] VERIFIER -> ORCHESTRATOR: {status.upper()}")
+            log.info(f"[OK] VERIFIER -> ORCHESTRATOR: {status.upper()}")
             if issues:
-                print(f"  Issues: {', '.join(issues)}")
+                log.info(f"  Issues: {', '.join(issues)}")
+
+            if status != "success" and not plan_failed and plan_response.content.cache_key:
+                log.info("[PLAN] ORCHESTRATOR: Plan not verified, dropping it from the plan cache")
+                self.planner.forget(plan_response.content.cache_key, user_input)
 
-            print(f"\n{'='*60}")
-            print(f"[ORCH] ORCHESTRATOR: Task completed - {status}")
-            print(f"{'='*60}\n")
+            log.info(f"\n{'='*60}")
+            log.info(f"[ORCH] ORCHESTRATOR: Task completed - {status}")
+            log.info(f"{'='*60}\n")
 
             return user_response
         else:
@@ -576,7 +1664,9 @@ class MultiAgentSystem:
         self,
         planner,  # Any planner (Gemini, Groq, Claude, GeminiVision)
         tool_registry: Dict,
-        use_vision_first: bool = None  # Auto-detect if None
+        use_vision_first: bool = None,  # Auto-detect if None
+        verify_sample_rate: int = 0,
+        fuzzy_plan_cache: bool = False
     ):
         """
         Initialize multi-agent system
@@ -585,14 +1675,22 @@ class MultiAgentSystem:
             planner: AI planner (Gemini/Groq/Claude/GeminiVision)
             tool_registry: Available tools
             use_vision_first: Force vision-first mode (auto-detects if None)
+            verify_sample_rate: Verify every Nth successful plan even when it
+                has a final response (0 = never)
+            fuzzy_plan_cache: Reuse cached plans for reworded requests by
+                sentence-embedding similarity (needs sentence-transformers)
         """
+        _start_log_listener()
         self.base_planner = planner  # Store raw planner
 
+        # One pool for the process lifetime, so requests don't respawn threads
+        self._pool = ThreadPoolExecutor(max_workers=AGENT_POOL_WORKERS, thread_name_prefix="glow-agent")
+
         # Create agents
-        self.planner = PlanningAgent(planner)
+        self.planner = PlanningAgent(planner, fuzzy_cache=fuzzy_plan_cache)
         self.tool_creator = ToolCreationAgent(planner)
         self.verifier = VerificationAgent(planner)
-        self.executor = ExecutionAgent(None, tool_registry)  # No LLM needed for execution
+        self.executor = ExecutionAgent(None, tool_registry, pool=self._pool)  # No LLM needed for execution
 
         # Detect if planner has vision capabilities
         has_vision = hasattr(planner, 'analyze_screen_and_decide')
@@ -603,7 +1701,7 @@ class MultiAgentSystem:
         self.use_vision_first = use_vision_first and has_vision
 
         if self.use_vision_first:
-            print("[SYSTEM] Vision-first mode ENABLED")
+            log.info("[SYSTEM] Vision-first mode ENABLED")
             # Create vision-first orchestrator
             self.vision_orchestrator = VisionFirstOrchestrator(
                 planner=self.base_planner,
@@ -611,22 +1709,31 @@ class MultiAgentSystem:
                 verifier=self.verifier
             )
         else:
-            print("[SYSTEM] Standard orchestration mode")
+            log.info("[SYSTEM] Standard orchestration mode")
             # Create standard orchestrator
             self.orchestrator = OrchestratorAgent(
                 planner=self.planner,
                 tool_creator=self.tool_creator,
                 verifier=self.verifier,
-                executor=self.executor
+                executor=self.executor,
+                verify_sample_rate=verify_sample_rate,
+                pool=self._pool
             )
 
-    def process_request(self, user_input: str, context: Dict[str, Any] = None) -> str:
+    def process_request(
+        self,
+        user_input: str,
+        context: Dict[str, Any] = None,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> str:
         """
         Process user input through multi-agent system
 
         Args:
             user_input: User's request
             context: Optional context
+            on_delta: Receives a conversational reply piece by piece as it
+                streams; the full text is still returned
 
         Returns:
             Final response
@@ -636,4 +1743,8 @@ class MultiAgentSystem:
             return self.vision_orchestrator.process_request_vision_first(user_input)
         else:
             # Use standard orchestrator
-            return self.orchestrator.run(user_input, context)
+            return self.orchestrator.run(user_input, context, on_delta=on_delta)
+
+    def close(self):
+        """Shut down the shared worker pool"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
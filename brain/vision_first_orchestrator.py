@@ -2,11 +2,164 @@
 Vision-First Orchestrator
 Uses visual feedback loop: See → Decide → Act → Repeat
 """
+import asyncio
+import inspect
 import time
 import base64
+import hashlib
+import threading
+from collections import OrderedDict, deque
 from io import BytesIO
-from typing import Dict, Any, Optional
-from PIL import ImageGrab
+from typing import Dict, Any, Optional, Tuple
+from PIL import Image, ImageChops, ImageGrab, ImageStat
+
+
+# Mean per-pixel difference (0-255) above which the screen counts as changed
+SCREEN_CHANGE_THRESHOLD = 1.0
+
+# Change detection compares small grayscale thumbnails, not full frames
+CHANGE_FRAME_SIZE = (320, 180)
+
+# Differing dHash bits that count as a change without running the pixel diff
+DHASH_CHANGE_BITS = 5
+
+# How often to re-check the screen while waiting for an action to land
+SCREEN_POLL_INTERVAL = 0.25
+
+# Screenshots sent to the vision model: JPEG, long edge capped (models gain
+# nothing from native resolution and PNG encoding is slow and large)
+SCREENSHOT_MAX_EDGE = 1280
+SCREENSHOT_JPEG_QUALITY = 75
+
+# Capture rate of the background screenshot pump while a request runs; matches
+# the change-detection poll so every captured frame gets used
+PUMP_INTERVAL = SCREEN_POLL_INTERVAL
+
+# Vision prompt around the per-iteration part (iteration counter + history).
+# Filled once per request with str.format_map, so literal braces are doubled.
+_PROMPT_HEAD = """
+You are controlling a Windows PC to accomplish this goal: "{goal}"
+
+CURRENT ITERATION: """
+
+_PROMPT_TAIL = """
+
+Look at the current screenshot and decide:
+1. What do you see on the screen right now?
+2. What is the SINGLE next action to take?
+3. Is the goal fully accomplished?
+
+Respond in JSON format:
+{{
+  "observation": "What I see on screen",
+  "next_action": {{
+    "tool": "tool_name",
+    "parameters": {{"param": "value"}},
+    "reasoning": "Why this action"
+  }},
+  "goal_achieved": false,
+  "progress": "Brief progress summary"
+}}
+
+If goal is achieved, set "goal_achieved": true and "next_action": null
+
+AVAILABLE TOOLS:
+{tools}
+"""
+
+# ESC aborts a running vision-first request; polled, not hooked
+VK_ESCAPE = 0x1B
+ESC_POLL_INTERVAL = 0.05
+
+# Post-action wait caps for tools whose effect takes a while to show
+SLOW_TOOL_WAITS = {
+    'open_chrome': 3.0,
+    'open_youtube': 3.0,
+    'search_google': 2.5,
+    'launch_application': 2.0,
+    'click_first_result': 2.0,
+}
+DEFAULT_TOOL_WAIT = 1.5
+
+# Past iterations shown to the vision model
+HISTORY_WINDOW = 5
+
+# Decisions remembered per (goal, screen fingerprint, recent history)
+DECISION_CACHE_SIZE = 128
+
+# Grid size of the dHash used as the screen fingerprint (16 -> 256 bits)
+FINGERPRINT_GRID = 16
+
+# Decisions whose action takes any of these parameters are never replayed:
+# the fingerprint matches screens with the same layout but different content
+# (another chat, another result list), where a stored position or text is wrong
+UNCACHEABLE_ACTION_PARAMS = frozenset({
+    "x", "y", "text", "content", "message", "body", "selector",
+    "contact_name", "contacts_and_messages",
+})
+
+
+class ScreenshotPump:
+    """
+    Background thread that keeps the latest screen capture at hand
+
+    Consumers read the newest frame instead of blocking on ImageGrab.grab()
+    themselves. Frames are tagged with their capture time so a consumer can
+    ask for one taken after a given moment.
+    """
+
+    def __init__(self, interval: float = PUMP_INTERVAL):
+        self.interval = interval
+        self._latest: Optional[Tuple[float, Image.Image]] = None
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start capturing (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="screenshot-pump", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop capturing and drop the held frame"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with self._cond:
+            self._latest = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            captured_at = time.monotonic()
+            try:
+                frame = ImageGrab.grab()
+            except Exception as e:
+                print(f"[VISION] Screen capture failed: {e}")
+            else:
+                with self._cond:
+                    self._latest = (captured_at, frame)
+                    self._cond.notify_all()
+            self._stop.wait(self.interval)
+
+    def grab(self, since: float = 0.0, timeout: float = 1.0) -> Tuple[float, Image.Image]:
+        """
+        Latest frame captured at or after since (time.monotonic())
+
+        Waits up to timeout for the pump to produce one, then falls back to
+        capturing directly, so this also works when the pump isn't running.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._latest is not None and self._latest[0] >= since,
+                timeout=timeout if self._thread else 0
+            )
+            if ready:
+                return self._latest
+        return time.monotonic(), ImageGrab.grab()
 
 
 class VisionFirstOrchestrator:
@@ -29,6 +182,29 @@ class VisionFirstOrchestrator:
         self.verifier = verifier
         self.max_iterations = 15  # Prevent infinite loops
         self.iteration = 0
+        self._decision_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pump = ScreenshotPump()
+        # Last (frame, change frame) pair, so a frame is only downsampled once
+        self._change_memo: Tuple[Optional[Image.Image], Optional[Image.Image]] = (None, None)
+        self._abort_event = threading.Event()
+        # Set while an action runs; GetAsyncKeyState also sees synthetic
+        # input, so an ESC the loop sends itself must not abort the request
+        self._acting = threading.Event()
+        self._prompt_head = self._prompt_tail = ""
+
+        # Pay first-use costs now instead of on the first request
+        threading.Thread(target=self._warm_up, name="vision-warmup", daemon=True).start()
+
+    @staticmethod
+    def _warm_up():
+        """Load the PIL codec plugins and initialize screen capture in the background"""
+        try:
+            Image.init()
+            buffer = BytesIO()
+            Image.new("RGB", (8, 8)).save(buffer, format="JPEG", quality=SCREENSHOT_JPEG_QUALITY)
+            ImageGrab.grab(bbox=(0, 0, 1, 1))
+        except Exception as e:
+            print(f"[VISION] Warm-up skipped: {e}")
 
     def capture_screen(self) -> str:
         """
@@ -37,11 +213,16 @@ class VisionFirstOrchestrator:
         Returns:
             Base64 encoded screenshot
         """
-        screenshot = ImageGrab.grab()
+        return base64.b64encode(self._encode_screenshot(self._pump.grab()[1])).decode()
+
+    @staticmethod
+    def _encode_screenshot(screenshot: Image.Image) -> bytes:
+        """Encode a captured frame for the vision planner as downscaled JPEG bytes"""
+        image = screenshot.convert("RGB")  # copy, so the shared frame isn't resized
+        image.thumbnail((SCREENSHOT_MAX_EDGE, SCREENSHOT_MAX_EDGE), Image.Resampling.BILINEAR)
         buffered = BytesIO()
-        screenshot.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        return img_str
+        image.save(buffered, format="JPEG", quality=SCREENSHOT_JPEG_QUALITY)
+        return buffered.getvalue()
 
     def process_request_vision_first(self, user_request: str) -> str:
         """
@@ -57,11 +238,54 @@ class VisionFirstOrchestrator:
         print("[VISION-FIRST] Starting vision-guided execution")
         print("=" * 60)
 
-        goal = user_request
-        conversation_history = []
+        # ESC is only watched while a request runs, by a short-lived poll thread
+        # rather than a system-wide keyboard hook
+        self._abort_event.clear()
+        esc_stop = threading.Event()
+        esc_thread = threading.Thread(target=self._esc_poller, args=(esc_stop,), name="esc-poller", daemon=True)
+        esc_thread.start()
+
+        self._pump.start()
+        try:
+            return self._vision_loop(user_request)
+        finally:
+            esc_stop.set()
+            esc_thread.join()
+            self._pump.stop()
+            self._change_memo = (None, None)
+
+    def _esc_poller(self, stop: threading.Event):
+        """Set the abort flag when ESC is pressed (Windows only)"""
+        try:
+            import ctypes
+            get_key_state = ctypes.windll.user32.GetAsyncKeyState
+        except (ImportError, AttributeError):
+            return
+
+        while not stop.wait(ESC_POLL_INTERVAL):
+            if self._acting.is_set():
+                continue
+            # Only "held down right now"; the low "pressed since last call"
+            # bit also reports presses from before the request started
+            if get_key_state(VK_ESCAPE) & 0x8000:
+                print("\n[VISION] ESC pressed - stopping")
+                self._abort_event.set()
+                return
+
+    def _vision_loop(self, goal: str) -> str:
+        """See -> decide -> act iterations until the goal is reached or max_iterations"""
+        # Only the last HISTORY_WINDOW entries reach the prompt, so keep no more
+        conversation_history = deque(maxlen=HISTORY_WINDOW)
         self.iteration = 0
+        settled_at = 0.0
+        # Goal and tool list don't change during a request; format them once
+        self._prompt_head = _PROMPT_HEAD.format_map({"goal": goal})
+        self._prompt_tail = _PROMPT_TAIL.format_map({"tools": self._get_available_tools()})
 
         while self.iteration < self.max_iterations:
+            if self._abort_event.is_set():
+                return f"Stopped by user after {self.iteration} actions."
+
             self.iteration += 1
 
             print(f"\n{'=' * 60}")
@@ -70,47 +294,29 @@ class VisionFirstOrchestrator:
 
             # Step 1: Capture screen
             print("[VISION] Capturing screenshot...")
-            screenshot_b64 = self.capture_screen()
-
-            # Step 2: Analyze with vision + decide next action
-            print("[VISION] Analyzing screen and deciding next action...")
-
-            analysis_prompt = f"""
-You are controlling a Windows PC to accomplish this goal: "{goal}"
-
-CURRENT ITERATION: {self.iteration}/{self.max_iterations}
-
-CONVERSATION HISTORY:
-{self._format_history(conversation_history)}
-
-Look at the current screenshot and decide:
-1. What do you see on the screen right now?
-2. What is the SINGLE next action to take?
-3. Is the goal fully accomplished?
-
-Respond in JSON format:
-{{
-  "observation": "What I see on screen",
-  "next_action": {{
-    "tool": "tool_name",
-    "parameters": {{"param": "value"}},
-    "reasoning": "Why this action"
-  }},
-  "goal_achieved": false,
-  "progress": "Brief progress summary"
-}}
-
-If goal is achieved, set "goal_achieved": true and "next_action": null
-
-AVAILABLE TOOLS:
-{self._get_available_tools()}
-"""
+            _, screen = self._pump.grab(since=settled_at)
+            history_text = self._format_history(conversation_history)
 
             try:
-                decision = self.planner.analyze_screen_and_decide(
-                    prompt=analysis_prompt,
-                    screenshot_b64=screenshot_b64
-                )
+                # Step 2: Analyze with vision + decide next action
+                decision_key = self._decision_key(goal, screen, history_text)
+                decision = self._decision_cache.get(decision_key)
+
+                if decision is not None:
+                    self._decision_cache.move_to_end(decision_key)
+                    print("[VISION] Same goal, screen and history as before - reusing decision")
+                else:
+                    print("[VISION] Analyzing screen and deciding next action...")
+                    decision = self.planner.analyze_screen_and_decide(
+                        prompt=self._build_prompt(history_text),
+                        screenshot_b64=self._encode_screenshot(screen),
+                        mime_type="image/jpeg"
+                    )
+                    # Only mid-task actions are replayed; completion is always re-checked
+                    if self._replayable(decision):
+                        self._decision_cache[decision_key] = decision
+                        if len(self._decision_cache) > DECISION_CACHE_SIZE:
+                            self._decision_cache.popitem(last=False)
 
                 print(f"[OBSERVATION] {decision.get('observation', 'N/A')}")
                 print(f"[PROGRESS] {decision.get('progress', 'N/A')}")
@@ -125,7 +331,7 @@ AVAILABLE TOOLS:
                 next_action = decision.get('next_action')
                 if not next_action:
                     print("[WARNING] No action decided, continuing...")
-                    time.sleep(1)
+                    self._abort_event.wait(1)
                     continue
 
                 tool_name = next_action.get('tool')
@@ -136,8 +342,11 @@ AVAILABLE TOOLS:
                 print(f"[REASONING] {reasoning}")
                 print(f"[PARAMS] {parameters}")
 
-                # Execute the action
-                result = self.executor.execute_tool(tool_name, parameters)
+                # Execute the action (unless ESC came in while deciding)
+                if self._abort_event.is_set():
+                    continue
+                before_at, before = self._pump.grab()
+                result = self._execute_action(tool_name, parameters)
 
                 print(f"[RESULT] {result}")
 
@@ -152,7 +361,8 @@ AVAILABLE TOOLS:
                 # Step 5: Wait for action to take effect
                 print("[WAIT] Waiting for action to complete...")
                 wait_time = self._get_wait_time(tool_name)
-                time.sleep(wait_time)
+                self._wait_for_screen_change(self._change_frame(before), before_at, wait_time)
+                settled_at = time.monotonic()
 
             except Exception as e:
                 print(f"[ERROR] {str(e)}")
@@ -161,20 +371,127 @@ AVAILABLE TOOLS:
                     'error': str(e)
                 })
 
-                # If error, wait and try to recover
-                time.sleep(2)
+                # If error, wait and try to recover (ESC cuts the wait short)
+                self._abort_event.wait(2)
 
         # Max iterations reached
         print("\n[WARNING] Maximum iterations reached")
         return f"Partially completed task. Performed {self.iteration} actions but did not fully achieve goal."
 
+    def _execute_action(self, tool_name: str, parameters: Dict[str, Any]) -> str:
+        """Run a decided action by looking the tool up directly in the registry"""
+        tool = self.executor.tool_registry.get(tool_name)
+        if tool is None:
+            return f"Error: Unknown tool '{tool_name}'"
+
+        self._acting.set()
+        try:
+            result = tool(**(parameters or {}))
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+        finally:
+            self._acting.clear()
+        return str(result)
+
+    @staticmethod
+    def _replayable(decision: Dict[str, Any]) -> bool:
+        """Whether a decision may be reused for the same fingerprint and history"""
+        action = decision.get('next_action')
+        if not action or decision.get('goal_achieved'):
+            return False
+        parameters = action.get('parameters') or {}
+        return UNCACHEABLE_ACTION_PARAMS.isdisjoint(parameters)
+
+    def _build_prompt(self, history_text: str) -> str:
+        """Vision prompt for the current iteration (the goal/tool parts are built once per request)"""
+        return (
+            f"{self._prompt_head}{self.iteration}/{self.max_iterations}\n\n"
+            f"CONVERSATION HISTORY:\n{history_text}{self._prompt_tail}"
+        )
+
+    def _decision_key(self, goal: str, screen: Image.Image, history_text: str) -> str:
+        """Key a decision on the goal, a screen fingerprint and the recent history"""
+        fingerprint = self._dhash(self._change_frame(screen), FINGERPRINT_GRID)
+        return hashlib.blake2b(
+            f"{goal}|{fingerprint:x}|{history_text}".encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def _change_frame(self, screen: Image.Image) -> Image.Image:
+        """Downsampled grayscale copy of a frame for change detection"""
+        source, frame = self._change_memo
+        if source is not screen:
+            frame = screen.resize(CHANGE_FRAME_SIZE, Image.Resampling.BILINEAR).convert("L")
+            self._change_memo = (screen, frame)
+        return frame
+
+    @staticmethod
+    def _mean_abs_diff(a: Image.Image, b: Image.Image) -> float:
+        """Mean absolute per-pixel difference between two frames (0-255)"""
+        if a.size != b.size or a.mode != b.mode:
+            return 255.0
+        # ImageChops works on the uint8 buffers in C: one pass, no int upcast
+        return ImageStat.Stat(ImageChops.difference(a, b)).mean[0]
+
+    @staticmethod
+    def _dhash(frame: Image.Image, grid: int = 8) -> int:
+        """Difference hash of a change frame (brightness gradient, grid*grid bits)"""
+        width = grid + 1
+        px = frame.resize((width, grid), Image.Resampling.BILINEAR).tobytes()
+        bits = 0
+        for row in range(0, width * grid, width):
+            for i in range(row, row + grid):
+                bits = (bits << 1) | (px[i + 1] > px[i])
+        return bits
+
+    def _wait_for_screen_change(self, before: Image.Image, before_at: float, timeout: float) -> bool:
+        """
+        Wait until the screen changes and then settles, or until timeout
+
+        Args:
+            before: Change frame captured just before the action ran
+            before_at: Capture time of before (time.monotonic())
+            timeout: Upper bound on the wait (the old fixed delay)
+
+        Returns:
+            True if a change was seen
+        """
+        deadline = time.monotonic() + timeout
+        previous, previous_at = before, before_at
+        previous_hash = self._dhash(before)
+        changed = False
+
+        while not self._abort_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Block on the pump's next capture rather than sleeping and grabbing again
+            previous_at, screen = self._pump.grab(since=previous_at + 1e-6, timeout=remaining)
+            frame = self._change_frame(screen)
+            frame_hash = self._dhash(frame)
+
+            # Large layout changes show up in the hash; only small ones need the pixel diff
+            moved = (
+                (frame_hash ^ previous_hash).bit_count() > DHASH_CHANGE_BITS
+                or self._mean_abs_diff(previous, frame) >= SCREEN_CHANGE_THRESHOLD
+            )
+
+            if moved:
+                changed = True
+            elif changed:
+                # Changed earlier and two consecutive frames now agree
+                return True
+            previous, previous_hash = frame, frame_hash
+
+        return changed
+
     def _format_history(self, history):
         """Format conversation history for prompt"""
         if not history:
             return "No previous actions"
 
         formatted = []
-        for entry in history[-5:]:  # Last 5 actions
+        for entry in history:  # Bounded to HISTORY_WINDOW by the deque
             iter_num = entry.get('iteration', '?')
             if 'error' in entry:
                 formatted.append(f"  [{iter_num}] ERROR: {entry['error']}")
@@ -195,13 +512,4 @@ AVAILABLE TOOLS:
 
     def _get_wait_time(self, tool_name: str) -> float:
         """Get appropriate wait time based on tool"""
-        # Tools that need more time
-        slow_tools = {
-            'open_chrome': 3.0,
-            'open_youtube': 3.0,
-            'search_google': 2.5,
-            'launch_application': 2.0,
-            'click_first_result': 2.0,
-        }
-
-        return slow_tools.get(tool_name, 1.5)
+        return SLOW_TOOL_WAITS.get(tool_name, DEFAULT_TOOL_WAIT)
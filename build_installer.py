@@ -8,6 +8,22 @@ import sys
 import subprocess
 from pathlib import Path
 
+# Modules GLOW never imports at runtime; keeping them out shrinks the bundle
+# and the file tree the bootloader and antivirus have to walk
+EXCLUDED_MODULES = [
+    'tkinter',
+    'test',
+    'matplotlib',
+    'pytest',
+    'numpy.tests',
+    'PIL.ImageQt',
+    'PyQt6.QtWebEngineCore',
+    'PyQt6.QtWebEngineWidgets',
+    'PyQt6.QtQml',
+    'PyQt6.QtQuick',
+    'PyQt6.Qt3DCore',
+]
+
 def build_executable():
     """Build the executable using PyInstaller"""
 
@@ -16,11 +32,19 @@ def build_executable():
     print("=" * 80)
 
     # PyInstaller command
+    # --onedir: a one-file build unpacks the whole bundle to a temp folder on
+    # every launch; the installers copy a folder anyway
+    # --optimize=1 drops asserts; level 2 would also strip the docstrings the
+    # agent turns into tool descriptions
     pyinstaller_cmd = [
         'pyinstaller',
         '--name=GLOW',
-        '--onefile',
+        '--onedir',
         '--windowed',
+        '--optimize=1',
+        # UPX-packed DLLs are unpacked in memory on every load and are a
+        # common antivirus false-positive trigger
+        '--noupx',
         '--icon=assets/glow_icon.ico' if Path('assets/glow_icon.ico').exists() else '',
         '--add-data=config.example.json;.',
         '--add-data=LICENSE;.',
@@ -33,10 +57,12 @@ def build_executable():
         '--hidden-import=pywin32',
         '--hidden-import=PIL',
         '--hidden-import=pytesseract',
-        '--collect-all=google.generativeai',
-        '--collect-all=anthropic',
-        '--collect-all=groq',
-        '--collect-all=PyQt6',
+        # Submodules only: --collect-all also dragged in every data file and
+        # test, and PyInstaller's own PyQt6 hook already picks up Qt plugins
+        '--collect-submodules=google.generativeai',
+        '--collect-submodules=anthropic',
+        '--collect-submodules=groq',
+        *[f'--exclude-module={name}' for name in EXCLUDED_MODULES],
         'glow_app.py'
     ]
 
@@ -49,7 +75,7 @@ def build_executable():
     try:
         subprocess.run(pyinstaller_cmd, check=True)
         print("\n✅ Executable built successfully!")
-        print(f"📁 Output: dist/GLOW.exe")
+        print(f"📁 Output: dist/GLOW/GLOW.exe")
         return True
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Build failed: {e}")
@@ -68,6 +94,12 @@ def create_inno_setup_script():
 #define MyAppURL "https://github.com/shivampal7405/GLOW"
 #define MyAppExeName "GLOW.exe"
 
+; Fast multi-threaded LZMA2 by default; for the smallest release download
+; compile with: iscc /DCompressLevel=max installer.iss
+#ifndef CompressLevel
+  #define CompressLevel "fast"
+#endif
+
 [Setup]
 AppId={{A1B2C3D4-E5F6-G7H8-I9J0-K1L2M3N4O5P6}
 AppName={#MyAppName}
@@ -83,8 +115,10 @@ LicenseFile=LICENSE
 OutputDir=installer_output
 OutputBaseFilename=GLOW-Setup-v{#MyAppVersion}
 SetupIconFile=assets\\glow_icon.ico
-Compression=lzma2/max
+Compression=lzma2/{#CompressLevel}
 SolidCompression=yes
+LZMAUseSeparateProcess=yes
+LZMANumBlockThreads=8
 WizardStyle=modern
 PrivilegesRequired=admin
 
@@ -95,7 +129,7 @@ Name: "english"; MessagesFile: "compiler:Default.isl"
 Name: "desktopicon"; Description: "{cm:CreateDesktopIcon}"; GroupDescription: "{cm:AdditionalIcons}"; Flags: unchecked
 
 [Files]
-Source: "dist\\{#MyAppExeName}"; DestDir: "{app}"; Flags: ignoreversion
+Source: "dist\\{#MyAppName}\\*"; DestDir: "{app}"; Flags: ignoreversion recursesubdirs createallsubdirs
 Source: "config.example.json"; DestDir: "{app}"; DestName: "config.json"; Flags: ignoreversion onlyifdoesntexist
 Source: "README.md"; DestDir: "{app}"; Flags: ignoreversion
 Source: "LICENSE"; DestDir: "{app}"; Flags: ignoreversion
@@ -152,10 +186,40 @@ begin
     Result := 'Claude (Anthropic)';
 end;
 
+function GetApiKeyField: String;
+begin
+  if ModelSelectionPage.Values[0] then
+    Result := 'groq_api_key'
+  else if ModelSelectionPage.Values[1] then
+    Result := 'gemini_api_key'
+  else
+    Result := 'anthropic_api_key';
+end;
+
+function JsonEscape(const Value: String): String;
+begin
+  Result := Value;
+  StringChangeEx(Result, '\\', '\\\\', True);
+  StringChangeEx(Result, '"', '\\"', True);
+end;
+
+// Replace the value on a '"key": value' line, keeping indentation and comma
+procedure SetJsonValue(Lines: TStringList; Index: Integer; const Value: String);
+var
+  Line, Trailer: String;
+begin
+  Line := TrimRight(Lines[Index]);
+  Trailer := '';
+  if Copy(Line, Length(Line), 1) = ',' then
+    Trailer := ',';
+  Lines[Index] := Copy(Line, 1, Pos(':', Line)) + ' "' + JsonEscape(Value) + '"' + Trailer;
+end;
+
 procedure CurStepChanged(CurStep: TSetupStep);
 var
-  ConfigFile: String;
+  ConfigFile, ModelKey, ApiKey, Line: String;
   ConfigContent: TStringList;
+  I: Integer;
 begin
   if CurStep = ssPostInstall then
   begin
@@ -165,28 +229,19 @@ begin
       if FileExists(ConfigFile) then
         ConfigContent.LoadFromFile(ConfigFile);
 
-      // Update config with user selections
-      // This is a simplified approach - in production, use proper JSON parsing
-      ConfigContent.Text := StringReplace(ConfigContent.Text,
-        '"conversational_model": "Groq (Fast API)"',
-        '"conversational_model": "' + GetModelName + '"',
-        [rfReplaceAll]);
-
-      if ModelSelectionPage.Values[0] then
-        ConfigContent.Text := StringReplace(ConfigContent.Text,
-          '"groq_api_key": "YOUR_GROQ_API_KEY_HERE"',
-          '"groq_api_key": "' + ApiKeyPage.Values[0] + '"',
-          [rfReplaceAll])
-      else if ModelSelectionPage.Values[1] then
-        ConfigContent.Text := StringReplace(ConfigContent.Text,
-          '"gemini_api_key": "YOUR_GEMINI_API_KEY_HERE"',
-          '"gemini_api_key": "' + ApiKeyPage.Values[0] + '"',
-          [rfReplaceAll])
-      else
-        ConfigContent.Text := StringReplace(ConfigContent.Text,
-          '"anthropic_api_key": "YOUR_ANTHROPIC_API_KEY_HERE"',
-          '"anthropic_api_key": "' + ApiKeyPage.Values[0] + '"',
-          [rfReplaceAll]);
+      // One pass over config.json (one key per line), matching on key names
+      // so the values are set whatever the template or an older config holds.
+      // Pascal Script has no JSON library to load and re-serialize with.
+      ModelKey := '"conversational_model":';
+      ApiKey := '"' + GetApiKeyField + '":';
+      for I := 0 to ConfigContent.Count - 1 do
+      begin
+        Line := Trim(ConfigContent[I]);
+        if Pos(ModelKey, Line) = 1 then
+          SetJsonValue(ConfigContent, I, GetModelName)
+        else if (Pos(ApiKey, Line) = 1) and (ApiKeyPage.Values[0] <> '') then
+          SetJsonValue(ConfigContent, I, ApiKeyPage.Values[0]);
+      end;
 
       ConfigContent.SaveToFile(ConfigFile);
     finally
@@ -204,6 +259,7 @@ end;
     print("📝 To build the installer:")
     print("   1. Install Inno Setup from: https://jrsoftware.org/isdl.php")
     print("   2. Right-click installer.iss and select 'Compile'")
+    print("      (or run: iscc installer.iss, adding /DCompressLevel=max for a smaller release build)")
     print("   3. The installer will be in installer_output/GLOW-Setup-v1.0.5.exe")
 
 def create_nsis_script():
@@ -215,6 +271,14 @@ def create_nsis_script():
 
 !include "MUI2.nsh"
 
+; Solid zlib installs fast (the payload is mostly already-compressed binaries);
+; compile with /DRELEASE (makensis /DRELEASE installer.nsi) for a smaller LZMA build
+!ifdef RELEASE
+    SetCompressor /SOLID lzma
+!else
+    SetCompressor /SOLID zlib
+!endif
+
 Name "GLOW - Windows AI Assistant"
 OutFile "installer_output\\GLOW-Setup.exe"
 InstallDir "$PROGRAMFILES\\GLOW"
@@ -241,7 +305,7 @@ RequestExecutionLevel admin
 Section "Install"
     SetOutPath "$INSTDIR"
 
-    File "dist\\GLOW.exe"
+    File /r "dist\\GLOW\\*.*"
     File "config.example.json"
     File "README.md"
     File "LICENSE"
@@ -269,6 +333,7 @@ SectionEnd
 ; Uninstaller Section
 Section "Uninstall"
     Delete "$INSTDIR\\GLOW.exe"
+    RMDir /r "$INSTDIR\\_internal"
     Delete "$INSTDIR\\config.example.json"
     Delete "$INSTDIR\\README.md"
     Delete "$INSTDIR\\LICENSE"
@@ -293,6 +358,7 @@ SectionEnd
     print("📝 To build with NSIS:")
     print("   1. Install NSIS from: https://nsis.sourceforge.io/")
     print("   2. Right-click installer.nsi and select 'Compile NSIS Script'")
+    print("      (or run: makensis installer.nsi, adding /DRELEASE for a smaller LZMA build)")
 
 def create_build_instructions():
     """Create detailed build instructions"""
@@ -317,7 +383,7 @@ python build_installer.py
 ```
 
 This will:
-- Create a standalone GLOW.exe in the `dist` folder
+- Create the `dist/GLOW` folder with GLOW.exe and its libraries
 - Bundle all dependencies
 - Create necessary data files
 
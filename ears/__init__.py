@@ -3,7 +3,27 @@ Perception Layer - The Ears of GLOW
 Handles wake word detection and speech-to-text transcription
 """
 
-from .wake_word import WakeWordDetector
-from .transcriber import Transcriber
+import importlib
+
+# Submodules load on first attribute access (PEP 562), so importing
+# ears.transcriber doesn't also pull in openWakeWord and ONNX Runtime,
+# and vice versa for ears.wake_word and faster-whisper
+_LAZY_IMPORTS = {
+    "WakeWordDetector": ".wake_word",
+    "Transcriber": ".transcriber",
+}
 
 __all__ = ["WakeWordDetector", "Transcriber"]
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
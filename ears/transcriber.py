@@ -5,20 +5,109 @@ Uses Faster-Whisper for high-speed, offline transcription
 
 import sounddevice as sd
 import numpy as np
-import queue
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import ctranslate2
 from faster_whisper import WhisperModel
 
 
+# Samples per audio callback, and how many blocks the callback ring holds
+# (256 x 1024 samples at 16 kHz is ~16 s of slack for the consumer)
+BLOCK_SIZE = 1024
+RING_SLOTS = 256
+
+# Recording is cut into segments at short pauses once this much audio has
+# accumulated, so Whisper can start on them while the user keeps talking
+SEGMENT_MIN_SECONDS = 3.0
+SEGMENT_GAP_SECONDS = 0.3
+
+# compute_type="auto" picks the first of these the device supports:
+# int8 weights with fp16 (or bf16) activations on GPUs, plain int8 on CPU
+_COMPUTE_TYPE_PREFERENCE = {
+    "cuda": ("int8_float16", "int8_bfloat16", "float16", "float32"),
+    "cpu": ("int8", "int8_float32", "float32"),
+}
+
+
+def _resolve_compute_type(device, compute_type):
+    """Turn device/compute_type "auto" into concrete values for this machine"""
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    if compute_type == "auto":
+        supported = ctranslate2.get_supported_compute_types(device)
+        compute_type = next(
+            (ct for ct in _COMPUTE_TYPE_PREFERENCE.get(device, ()) if ct in supported),
+            "default"
+        )
+    return device, compute_type
+
+
+# Decoder settings for short spoken commands: greedy search, a single
+# temperature, no timestamps and no conditioning across windows, with
+# Silero VAD trimming silence inside each segment before decoding
+DECODE_OPTIONS = dict(
+    beam_size=1,
+    best_of=1,
+    temperature=0.0,
+    language="en",
+    task="transcribe",
+    condition_on_previous_text=False,
+    without_timestamps=True,
+    vad_filter=True,
+    vad_parameters={"min_silence_duration_ms": 300},
+)
+
+
+# Loaded models shared by every Transcriber in the process
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _get_model(model_size, device, compute_type):
+    """
+    Load a Whisper model once per (size, device, compute type) and warm it up
+
+    The first decode pays for kernel setup and paging in the weights, so a
+    second of silence is run through it here rather than on the first
+    real utterance.
+    """
+    device, compute_type = _resolve_compute_type(device, compute_type)
+    key = (model_size, device, compute_type)
+    with _MODEL_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            print(f"Loading Whisper model: {model_size} ({device}, {compute_type})")
+            model = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type
+            )
+            segments, _ = model.transcribe(
+                np.zeros(16000, dtype=np.float32),
+                beam_size=1,
+                language="en",
+                without_timestamps=True
+            )
+            # transcribe() is lazy; decoding happens as segments are consumed
+            for _ in segments:
+                pass
+            _MODEL_CACHE[key] = model
+            print("Whisper model loaded successfully")
+    return model
+
+
 class Transcriber:
     def __init__(
         self,
         model_size="base",
         device="auto",
-        compute_type="int8",
+        compute_type="auto",
         sample_rate=16000,
         silence_threshold=0.01,
-        silence_duration=1.5
+        silence_duration=1.5,
+        beam_size=1,
+        vad_filter=True
     ):
         """
         Initialize the transcriber
@@ -26,86 +115,137 @@ class Transcriber:
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
             device: Device to run on (cpu, cuda, auto)
-            compute_type: Computation type (int8, float16, float32)
+            compute_type: Computation type (auto, int8, int8_float16, float16,
+                bfloat16, float32); auto picks the fastest the device supports
             sample_rate: Audio sample rate in Hz
             silence_threshold: RMS threshold to detect silence
             silence_duration: Seconds of silence before stopping recording
+            beam_size: Whisper beam width (1 = greedy decoding)
+            vad_filter: Drop silence inside segments with Silero VAD before decoding
         """
         self.sample_rate = sample_rate
         self.silence_threshold = silence_threshold
         self.silence_duration = silence_duration
+        # Compare mean energy against threshold**2 so the hot loop skips sqrt
+        self._silence_energy = silence_threshold ** 2
+        self._decode_options = dict(DECODE_OPTIONS, beam_size=beam_size, vad_filter=vad_filter)
 
-        print(f"Loading Whisper model: {model_size}")
-        self.model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type
-        )
-        print("Whisper model loaded successfully")
+        self.model = _get_model(model_size, device, compute_type)
 
-        self.audio_queue = queue.Queue()
         self.is_recording = False
 
+        # Slot numbers handed from the audio callback to record_segments.
+        # deque append/popleft are atomic, so the realtime thread takes no
+        # lock; the event only wakes the consumer when it has run dry
+        self._audio_slots = deque(maxlen=RING_SLOTS)
+        self._audio_ready = threading.Event()
+
+        # Preallocated blocks the callback copies into, so the realtime audio
+        # thread never allocates; only slot numbers are handed over
+        self._ring = np.empty((RING_SLOTS, BLOCK_SIZE), dtype=np.float32)
+        self._ring_bytes = [memoryview(row).cast("B") for row in self._ring]
+        self._ring_write = 0
+
+        # Single worker: segments are decoded in order while recording goes on
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream during recording"""
         if status:
             print(f"Audio status: {status}")
-        self.audio_queue.put(indata.copy())
-
-    def record_audio(self, max_duration=30):
+        # indata is the raw stream buffer; copy its bytes straight into the slot
+        slot = self._ring_write % RING_SLOTS
+        self._ring_bytes[slot][:len(indata)] = indata
+        self._ring_write += 1
+        self._audio_slots.append(slot)
+        self._audio_ready.set()
+
+    def record_segments(self, max_duration=30):
         """
-        Record audio until silence is detected or max duration reached
+        Record audio until silence is detected or max duration reached,
+        yielding it in pieces split at short pauses
 
         Args:
             max_duration: Maximum recording duration in seconds
 
-        Returns:
-            Recorded audio as numpy array
+        Yields:
+            Consecutive audio segments, as views into one recording buffer
         """
         print("Recording... (speak now)")
         self.is_recording = True
-        self.audio_queue = queue.Queue()
-
-        audio_data = []
+        self._audio_slots.clear()
+        self._audio_ready.clear()
+        self._ring_write = 0
+
+        max_chunks = int(max_duration * self.sample_rate / BLOCK_SIZE)
+        # The whole recording goes into one buffer sized for max_duration;
+        # segments are handed out as views of it, so nothing is concatenated
+        audio = np.empty(max_chunks * BLOCK_SIZE, dtype=np.float32)
+        segment_start = 0
         silence_chunks = 0
-        silence_chunks_needed = int(self.silence_duration * self.sample_rate / 1024)
-
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype=np.float32,
-            blocksize=1024,
-            callback=self.audio_callback
-        ):
-            total_chunks = 0
-            max_chunks = int(max_duration * self.sample_rate / 1024)
-
-            while self.is_recording and total_chunks < max_chunks:
-                try:
-                    chunk = self.audio_queue.get(timeout=0.1)
-                    audio_data.append(chunk)
+        silence_chunks_needed = int(self.silence_duration * self.sample_rate / BLOCK_SIZE)
+        gap_chunks_needed = max(1, int(SEGMENT_GAP_SECONDS * self.sample_rate / BLOCK_SIZE))
+        segment_min_chunks = int(SEGMENT_MIN_SECONDS * self.sample_rate / BLOCK_SIZE)
+
+        try:
+            with sd.RawInputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype="float32",
+                blocksize=BLOCK_SIZE,
+                callback=self.audio_callback
+            ):
+                total_chunks = 0
+
+                while self.is_recording and total_chunks < max_chunks:
+                    try:
+                        slot = self._audio_slots.popleft()
+                    except IndexError:
+                        self._audio_ready.wait(0.1)
+                        self._audio_ready.clear()
+                        continue
+
+                    chunk = self._ring[slot]
+                    audio[total_chunks * BLOCK_SIZE:(total_chunks + 1) * BLOCK_SIZE] = chunk
                     total_chunks += 1
 
-                    # Check for silence
-                    rms = np.sqrt(np.mean(chunk**2))
-                    if rms < self.silence_threshold:
+                    # Check for silence (mean energy via one dot product, no temporary)
+                    energy = float(np.dot(chunk, chunk)) / chunk.size
+                    if energy < self._silence_energy:
                         silence_chunks += 1
                         if silence_chunks >= silence_chunks_needed:
                             print("Silence detected, stopping recording")
                             break
+                        # Hand off a long enough segment at the first short pause
+                        if silence_chunks == gap_chunks_needed and total_chunks - segment_start >= segment_min_chunks:
+                            yield audio[segment_start * BLOCK_SIZE:total_chunks * BLOCK_SIZE]
+                            segment_start = total_chunks
                     else:
                         silence_chunks = 0
+        finally:
+            self.is_recording = False
 
-                except queue.Empty:
-                    continue
+        if total_chunks > segment_start:
+            yield audio[segment_start * BLOCK_SIZE:total_chunks * BLOCK_SIZE]
 
-        self.is_recording = False
+    def record_audio(self, max_duration=30):
+        """
+        Record audio until silence is detected or max duration reached
 
-        if not audio_data:
+        Args:
+            max_duration: Maximum recording duration in seconds
+
+        Returns:
+            Recorded audio as numpy array
+        """
+        segments = list(self.record_segments(max_duration))
+
+        if not segments:
             return None
 
-        # Concatenate all chunks
-        audio_array = np.concatenate(audio_data, axis=0).flatten()
+        # Segments are back-to-back views of one buffer starting at its first
+        # sample, so the whole recording is just a longer view of it
+        audio_array = segments[0].base[:sum(len(segment) for segment in segments)]
         print(f"Recording complete ({len(audio_array) / self.sample_rate:.2f}s)")
 
         return audio_array
@@ -124,22 +264,18 @@ class Transcriber:
             return ""
 
         print("Transcribing...")
-
-        # Run transcription
-        segments, info = self.model.transcribe(
-            audio_data,
-            beam_size=5,
-            language="en",
-            task="transcribe"
-        )
-
-        # Combine all segments
-        text = " ".join([segment.text for segment in segments])
-        text = text.strip()
+        text = self._decode(audio_data)
 
         print(f"Transcription: {text}")
         return text
 
+    def _decode(self, audio_data):
+        """Run Whisper on one block of audio and return the stripped text"""
+        segments, info = self.model.transcribe(audio_data, **self._decode_options)
+
+        # Combine all segments
+        return " ".join([segment.text for segment in segments]).strip()
+
     def listen_and_transcribe(self, max_duration=30):
         """
         Record audio and transcribe in one call
@@ -150,8 +286,20 @@ class Transcriber:
         Returns:
             Transcribed text string
         """
-        audio_data = self.record_audio(max_duration)
-        return self.transcribe(audio_data)
+        # Decode each finished segment in the background while recording
+        # continues, then join the partial transcripts in order
+        futures = [
+            self._pool.submit(self._decode, segment)
+            for segment in self.record_segments(max_duration)
+        ]
+        if not futures:
+            return ""
+
+        print("Transcribing...")
+        text = " ".join(filter(None, (future.result() for future in futures)))
+
+        print(f"Transcription: {text}")
+        return text
 
     def stop_recording(self):
         """Manually stop the current recording"""
@@ -160,7 +308,7 @@ class Transcriber:
 
 if __name__ == "__main__":
     # Test the transcriber
-    transcriber = Transcriber(model_size="base", compute_type="int8")
+    transcriber = Transcriber(model_size="base")
 
     print("\n=== Testing Transcriber ===")
     text = transcriber.listen_and_transcribe()
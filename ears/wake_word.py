@@ -3,13 +3,36 @@ Wake Word Detection Module
 Uses openWakeWord for lightweight, always-on wake word detection
 """
 
+import os
 import threading
 import queue
+from collections import deque
 import numpy as np
 from openwakeword.model import Model
 import sounddevice as sd
 
 
+# ONNX Runtime intra-op threads for openWakeWord's feature models
+ONNX_THREADS = min(2, os.cpu_count() or 1)
+
+# 80 ms chunks handed to openWakeWord per predict() call. It computes the
+# melspectrogram for the whole batch in one session run and reports the
+# highest score in it, at the cost of up to 80 ms extra detection latency
+BATCH_CHUNKS = 2
+
+# Audio used to measure the mic's noise floor each time listening starts;
+# afterwards batches quieter than the floor skip inference entirely
+CALIBRATION_SECONDS = 0.5
+
+# The floor never goes above this sample RMS (int16 units), so calibrating
+# while music or a TV is playing can't gate out a normally spoken wake word
+NOISE_FLOOR_MAX_RMS = 300
+
+# How fast the floor follows quieter audio once calibrated (per gated batch),
+# so a floor measured over a noisy start comes down when the room does
+NOISE_FLOOR_ADAPT = 0.05
+
+
 class WakeWordDetector:
     def __init__(self, wake_word="hey_jarvis", threshold=0.5, sample_rate=16000):
         """
@@ -27,29 +50,64 @@ class WakeWordDetector:
         self.is_running = False
         self.detection_queue = queue.Queue()
 
-        # Initialize the wake word model
+        # Initialize the wake word model. openWakeWord pins its ONNX sessions
+        # to one thread; the melspectrogram and embedding models it runs on
+        # every chunk do nearly all the work, so give those a second core
         self.model = Model(
             wakeword_models=[wake_word],
-            inference_framework="onnx"
+            inference_framework="onnx",
+            ncpu=ONNX_THREADS
         )
 
         # Audio buffer settings
         self.chunk_size = 1280  # 80ms at 16kHz
-        self.audio_buffer = np.array([], dtype=np.int16)
+        self.batch_size = self.chunk_size * BATCH_CHUNKS
+        # Blocks not yet fed to the model; consumed batch_size samples at a time
+        # without ever regrowing one big buffer
+        self._pending = deque()
+        self._pending_samples = 0
+
+        # Mean per-sample energy below which a batch is treated as silence;
+        # None until calibrated from the first CALIBRATION_SECONDS of audio
+        self._noise_floor = None
+        self._calibration = []
+        # True once a batch was skipped; the model's rolling buffers then
+        # hold audio from before the quiet stretch
+        self._gated = False
 
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream"""
         if status:
             print(f"Audio status: {status}")
 
-        # Convert to the format expected by openWakeWord
-        audio_data = indata.copy().flatten()
-        self.audio_buffer = np.concatenate([self.audio_buffer, audio_data])
-
-        # Process in chunks
-        while len(self.audio_buffer) >= self.chunk_size:
-            chunk = self.audio_buffer[:self.chunk_size]
-            self.audio_buffer = self.audio_buffer[self.chunk_size:]
+        # Mono int16 block from the raw stream buffer (copied: the stream
+        # reuses it after we return)
+        self._pending.append(np.frombuffer(indata, dtype=np.int16).copy())
+        self._pending_samples += frames
+
+        # Process in batches of whole chunks
+        while self._pending_samples >= self.batch_size:
+            chunk = self._take_chunk()
+
+            # Skip the model on silence (mean energy via one dot product)
+            if self._noise_floor is None:
+                self._calibrate(chunk)
+            else:
+                samples = chunk.astype(np.float32)
+                energy = float(np.dot(samples, samples)) / samples.size
+                if energy < self._noise_floor:
+                    # Let the floor drift down toward the quiet level
+                    target = 3 * energy
+                    if target < self._noise_floor:
+                        self._noise_floor += NOISE_FLOOR_ADAPT * (target - self._noise_floor)
+                    self._gated = True
+                    continue
+
+            if self._gated:
+                # Don't let the model join pre-silence audio onto new speech;
+                # reset() refills its audio and feature buffers with silence
+                self.model.reset()
+                self._gated = False
 
             # Get predictions
             prediction = self.model.predict(chunk)
@@ -60,6 +118,37 @@ class WakeWordDetector:
                     print(f"Wake word detected! Confidence: {score:.2f}")
                     self.detection_queue.put({"wake_word": key, "confidence": score})
 
+    def _calibrate(self, chunk: np.ndarray):
+        """Collect startup audio and set the noise floor once there is enough"""
+        self._calibration.append(chunk)
+        if sum(len(c) for c in self._calibration) < CALIBRATION_SECONDS * self.sample_rate:
+            return
+
+        level = float(np.median(np.abs(np.concatenate(self._calibration).astype(np.float32))))
+        self._noise_floor = min(3 * level ** 2, NOISE_FLOOR_MAX_RMS ** 2)
+        self._calibration = []
+
+    def _take_chunk(self) -> np.ndarray:
+        """Pop exactly batch_size samples off the pending blocks"""
+        self._pending_samples -= self.batch_size
+
+        # Usual case: the stream delivers blocks of exactly batch_size
+        if len(self._pending[0]) == self.batch_size:
+            return self._pending.popleft()
+
+        pieces = []
+        needed = self.batch_size
+        while needed:
+            block = self._pending[0]
+            if len(block) <= needed:
+                pieces.append(self._pending.popleft())
+                needed -= len(block)
+            else:
+                pieces.append(block[:needed])
+                self._pending[0] = block[needed:]
+                needed = 0
+        return np.concatenate(pieces)
+
     def start(self):
         """Start listening for wake word"""
         if self.is_running:
@@ -69,12 +158,17 @@ class WakeWordDetector:
         self.is_running = True
         print(f"Listening for wake word: {self.wake_word}")
 
+        # Re-measure the noise floor; the mic or room may have changed
+        self._noise_floor = None
+        self._calibration = []
+        self._gated = False
+
         # Start audio stream
-        self.stream = sd.InputStream(
+        self.stream = sd.RawInputStream(
             samplerate=self.sample_rate,
             channels=1,
-            dtype=np.int16,
-            blocksize=self.chunk_size,
+            dtype="int16",
+            blocksize=self.batch_size,
             callback=self.audio_callback
         )
         self.stream.start()
@@ -6,34 +6,80 @@ Complete GUI with visual orb and text interface
 
 import sys
 import json
+import threading
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QTextEdit, QLineEdit, QPushButton, QLabel, QMenuBar, QMessageBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QFontDatabase, QAction
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QFontDatabase, QAction, QColor, QTextCursor, QTextCharFormat
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Recently used tools whose modules are imported in the background at startup
+TOOL_PREWARM_COUNT = 8
+
+# Chat message HTML per sender, built once; "{}" is replaced by the message
+_MESSAGE_STYLE = "<div style='font-family: \"Segoe UI\", sans-serif; margin: 8px 0;'>"
+_MESSAGE_TEMPLATES = {
+    "GLOW": _MESSAGE_STYLE + "<b style='color: #4A90E2;'>✨ GLOW:</b> <span style='color: #2C3E50;'>{}</span></div>",
+    "You": _MESSAGE_STYLE + "<b style='color: #27AE60;'>👤 You:</b> <span style='color: #34495E;'>{}</span></div>",
+    "ERROR": _MESSAGE_STYLE + "<b style='color: #E74C3C;'>⚠️ ERROR:</b> <span style='color: #C0392B;'>{}</span></div>",
+    "System": _MESSAGE_STYLE + "<b style='color: #9B59B6;'>⚙️ System:</b> <span style='color: #8E44AD;'>{}</span></div>",
+}
+
+_WELCOME_HTML = """<div style='font-family: "Segoe UI", sans-serif; color: #4A90E2; font-size: 11pt;'>
+<b>✨ Hello! I am GLOW</b><br>
+<span style='color: #7B8A9B;'>Your General Local Offline Windows-agent. How can I help you today?</span>
+</div>"""
+
+_ABOUT_HTML = """<h2 style='font-family: "Segoe UI", "Inter", sans-serif; color: #4A90E2;'>GLOW</h2>
+<p style='font-family: "Segoe UI", "Inter", sans-serif; font-size: 11pt;'><b>General Local Offline Windows-agent</b></p>
+<p style='font-family: "Segoe UI", sans-serif;'>Version 1.0.5 (Patched)</p>
+<p style='font-family: "Segoe UI", sans-serif;'>Intelligent Windows PC automation with vision and multi-agent planning.</p>
+<p style='font-family: "Segoe UI", sans-serif;'><b>Features:</b></p>
+<ul style='font-family: "Segoe UI", sans-serif;'>
+<li>Intelligent Vision (AI can SEE your screen)</li>
+<li>Multi-Agent System (Planning, Execution, Verification)</li>
+<li>88+ Windows automation tools</li>
+<li>Beautiful glowing orb interface</li>
+</ul>
+"""
 
-class CommandWorker(QThread):
-    """Worker thread for processing commands"""
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
 
-    def __init__(self, agent_system, command):
+class CommandTask(QRunnable):
+    """Pooled task for processing commands"""
+
+    class Signals(QObject):
+        # QRunnable isn't a QObject, so the task emits through this. Every
+        # signal carries the task id, since several tasks can run at once
+        finished = pyqtSignal(int, str)
+        error = pyqtSignal(int, str)
+        delta = pyqtSignal(int, str)  # Conversational reply text as the model streams it
+
+    def __init__(self, agent_system, command, task_id):
         super().__init__()
         self.agent_system = agent_system
         self.command = command
+        self.task_id = task_id
+        self.signals = self.Signals()
 
     def run(self):
         try:
-            response = self.agent_system.process_request(self.command)
-            self.finished.emit(response)
+            response = self.agent_system.process_request(
+                self.command,
+                on_delta=lambda text: self.signals.delta.emit(self.task_id, text)
+            )
+            self.signals.finished.emit(self.task_id, response)
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(self.task_id, str(e))
 
 
 class VoiceWorker(QThread):
@@ -117,8 +163,15 @@ class GlowApp(QMainWindow):
         # Hide the main window - we only want the orb!
         self.hide()
 
-        # Worker thread
-        self.worker = None
+        # Latest command task (keeps its signal object alive until it reports)
+        self.command_task = None
+        self._task_count = 0
+        # Task id -> (cursor at the start of its GLOW message block, offset of
+        # the reply text in that block) for replies being streamed
+        self._streams = {}
+
+        # About dialog, created the first time it's shown
+        self._about_box = None
 
     def _load_config(self):
         """Load configuration"""
@@ -128,8 +181,8 @@ class GlowApp(QMainWindow):
             print("Config not found. Please run: python main.py")
             sys.exit(1)
 
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        data = Path(config_path).read_bytes()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
 
     def _init_glow(self):
         """Initialize GLOW components"""
@@ -187,9 +240,15 @@ class GlowApp(QMainWindow):
 
         self.agent_system = MultiAgentSystem(
             planner=self.planner,
-            tool_registry=TOOL_REGISTRY
+            tool_registry=TOOL_REGISTRY,
+            verify_sample_rate=self.config.get('verify_sample_rate', 0),
+            fuzzy_plan_cache=self.config.get('fuzzy_plan_cache', False)
         )
 
+        # Commands run on the shared pool instead of a new thread each time
+        self.command_pool = QThreadPool.globalInstance()
+        self.command_pool.setMaxThreadCount(4)
+
         # Worker threads
         self.voice_worker = None
         self.speak_worker = None
@@ -209,7 +268,13 @@ class GlowApp(QMainWindow):
 
         try:
             from ears.transcriber import Transcriber
-            self.transcriber = Transcriber(model_size="base", compute_type="int8")
+            self.transcriber = Transcriber(
+                model_size=self.config.get('whisper_model', 'base'),
+                device=self.config.get('whisper_device', 'auto'),
+                silence_duration=self.config.get('whisper_silence_duration', 1.5),
+                beam_size=self.config.get('whisper_beam_size', 1),
+                vad_filter=self.config.get('whisper_vad_filter', True)
+            )
             print("Transcriber initialized")
         except Exception as e:
             print(f"Transcriber not available: {e}")
@@ -242,8 +307,25 @@ class GlowApp(QMainWindow):
             print(f"Orb not available: {e}")
             self.orb = None
 
+        # Once the window is up, load the tools the last sessions used most
+        QTimer.singleShot(0, self._prewarm_tools)
+
         print("GLOW ready!")
 
+    def _prewarm_tools(self):
+        """Import recently used tools' modules on a background thread"""
+        executor = self.agent_system.executor
+        if not hasattr(executor.tool_registry, "prefetch"):
+            return
+
+        def warm():
+            names = executor.recent_tools(TOOL_PREWARM_COUNT)
+            if names:
+                loaded = executor.tool_registry.prefetch(names)
+                print(f"Warmed up {loaded} recently used tools")
+
+        threading.Thread(target=warm, name="tool-prewarm", daemon=True).start()
+
     def _create_menu_bar(self):
         """Create menu bar with settings option"""
         menubar = self.menuBar()
@@ -291,22 +373,17 @@ class GlowApp(QMainWindow):
 
     def _show_about(self):
         """Show about dialog"""
-        QMessageBox.about(
-            self,
-            "About GLOW",
-            """<h2 style='font-family: "Segoe UI", "Inter", sans-serif; color: #4A90E2;'>GLOW</h2>
-            <p style='font-family: "Segoe UI", "Inter", sans-serif; font-size: 11pt;'><b>General Local Offline Windows-agent</b></p>
-            <p style='font-family: "Segoe UI", sans-serif;'>Version 1.0.5 (Patched)</p>
-            <p style='font-family: "Segoe UI", sans-serif;'>Intelligent Windows PC automation with vision and multi-agent planning.</p>
-            <p style='font-family: "Segoe UI", sans-serif;'><b>Features:</b></p>
-            <ul style='font-family: "Segoe UI", sans-serif;'>
-            <li>Intelligent Vision (AI can SEE your screen)</li>
-            <li>Multi-Agent System (Planning, Execution, Verification)</li>
-            <li>88+ Windows automation tools</li>
-            <li>Beautiful glowing orb interface</li>
-            </ul>
-            """
-        )
+        # Built on first use and reused, so reopening it doesn't parse and
+        # lay out the HTML again
+        if self._about_box is None:
+            self._about_box = QMessageBox(
+                QMessageBox.Icon.NoIcon,
+                "About GLOW",
+                _ABOUT_HTML,
+                QMessageBox.StandardButton.Ok,
+                self
+            )
+        self._about_box.exec()
 
     def _init_ui(self):
         """Initialize user interface with aesthetic fonts"""
@@ -407,38 +484,15 @@ class GlowApp(QMainWindow):
         layout.addWidget(self.send_button)
 
         # Welcome message with styled HTML
-        welcome_msg = """<div style='font-family: "Segoe UI", sans-serif; color: #4A90E2; font-size: 11pt;'>
-        <b>✨ Hello! I am GLOW</b><br>
-        <span style='color: #7B8A9B;'>Your General Local Offline Windows-agent. How can I help you today?</span>
-        </div>"""
-        self.chat_display.append(welcome_msg)
+        self.chat_display.append(_WELCOME_HTML)
 
     def append_message(self, sender, message):
         """Append message to chat display with aesthetic styling"""
-        if sender == "GLOW":
-            styled_msg = f"""<div style='font-family: "Segoe UI", sans-serif; margin: 8px 0;'>
-            <b style='color: #4A90E2;'>✨ {sender}:</b>
-            <span style='color: #2C3E50;'>{message}</span>
-            </div>"""
-        elif sender == "You":
-            styled_msg = f"""<div style='font-family: "Segoe UI", sans-serif; margin: 8px 0;'>
-            <b style='color: #27AE60;'>👤 {sender}:</b>
-            <span style='color: #34495E;'>{message}</span>
-            </div>"""
-        elif sender == "ERROR":
-            styled_msg = f"""<div style='font-family: "Segoe UI", sans-serif; margin: 8px 0;'>
-            <b style='color: #E74C3C;'>⚠️ {sender}:</b>
-            <span style='color: #C0392B;'>{message}</span>
-            </div>"""
-        elif sender == "System":
-            styled_msg = f"""<div style='font-family: "Segoe UI", sans-serif; margin: 8px 0;'>
-            <b style='color: #9B59B6;'>⚙️ {sender}:</b>
-            <span style='color: #8E44AD;'>{message}</span>
-            </div>"""
+        template = _MESSAGE_TEMPLATES.get(sender)
+        if template is not None:
+            styled_msg = template.format(message)
         else:
-            styled_msg = f"""<div style='font-family: "Segoe UI", sans-serif; margin: 8px 0;'>
-            <b>{sender}:</b> {message}
-            </div>"""
+            styled_msg = f"{_MESSAGE_STYLE}<b>{sender}:</b> {message}</div>"
 
         self.chat_display.append(styled_msg)
 
@@ -483,11 +537,13 @@ class GlowApp(QMainWindow):
             self.orb.set_state_thinking()
             self.orb.set_status_text("GLOW is thinking...")
 
-        # Process command in background thread
-        self.worker = CommandWorker(self.agent_system, command)
-        self.worker.finished.connect(self.on_command_finished)
-        self.worker.error.connect(self.on_command_error)
-        self.worker.start()
+        # Process command on a pooled background thread
+        self._task_count += 1
+        self.command_task = CommandTask(self.agent_system, command, self._task_count)
+        self.command_task.signals.delta.connect(self.on_command_delta)
+        self.command_task.signals.finished.connect(self.on_command_finished)
+        self.command_task.signals.error.connect(self.on_command_error)
+        self.command_pool.start(self.command_task)
 
     def toggle_voice_input(self):
         """Toggle voice input mode"""
@@ -557,10 +613,50 @@ class GlowApp(QMainWindow):
         if self.orb and self.orb.current_state == "idle":
             self.toggle_voice_input()
 
-    def on_command_finished(self, response):
+    def on_command_delta(self, task_id, text):
+        """Add streamed reply text to the task's chat message as it arrives"""
+        if task_id not in self._streams:
+            # Open an empty GLOW message on the first piece and fill it in place.
+            # The cursor sits at the block start, so it stays on this message
+            # while text is added to it or other messages are appended
+            self.append_message("GLOW", "")
+            block_start = self.chat_display.textCursor()
+            block_start.movePosition(QTextCursor.MoveOperation.End)
+            reply_offset = block_start.positionInBlock()
+            block_start.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+            self._streams[task_id] = (block_start, reply_offset)
+            if self.orb:
+                self.orb.set_state_speaking()
+
+        cursor = QTextCursor(self._streams[task_id][0])
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock)
+        self._insert_reply_text(cursor, text)
+        scrollbar = self.chat_display.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+
+    @staticmethod
+    def _insert_reply_text(cursor, text):
+        """Insert GLOW reply text, keeping line breaks inside the message block"""
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor("#2C3E50"))
+        cursor.insertText(text.replace("\n", "\u2028"), fmt)
+
+    def on_command_finished(self, task_id, response):
         """Handle command completion"""
-        # Display response
-        self.append_message("GLOW", response)
+        # Display response. A streamed one is already shown, but the returned
+        # text wins if they differ (e.g. the stream broke off with an error)
+        stream = self._streams.pop(task_id, None)
+        if stream is None:
+            self.append_message("GLOW", response)
+        else:
+            block_start, reply_offset = stream
+            cursor = QTextCursor(block_start)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            shown = cursor.selectedText()[reply_offset:].replace("\u2028", "\n")
+            if shown != response:
+                cursor.setPosition(block_start.position() + reply_offset)
+                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+                self._insert_reply_text(cursor, response)
 
         # Update Orb text
         if self.orb:
@@ -583,8 +679,10 @@ class GlowApp(QMainWindow):
         self.input_field.setFocus()
         self.status_label.setText(f"Model: {self.config.get('conversational_model')}")
 
-    def on_command_error(self, error):
+    def on_command_error(self, task_id, error):
         """Handle command error"""
+        self._streams.pop(task_id, None)
+
         # Display error
         self.append_message("ERROR", error)
 
@@ -624,5 +722,6 @@ class GlowApp(QMainWindow):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = GlowApp()
+    app.aboutToQuit.connect(window.agent_system.close)
     # The window is hidden, but the orb is shown inside __init__
     sys.exit(app.exec())
@@ -4,383 +4,305 @@ General Local Offline Windows-agent
 Provides tools for complete Windows PC control
 """
 
-from .os_tools import (
-    create_folder,
-    delete_file_or_folder,
-    list_directory,
-    launch_application,
-    kill_process,
-    get_running_processes,
-    set_volume,
-    shutdown_system,
-    get_desktop_path,
-    get_documents_path
-)
-
-from .coding_tools import (
-    create_project,
-    write_file,
-    read_file,
-    open_in_vscode,
-    run_python_script,
-    install_package,
-    create_snake_game
-)
-
-from .vision_automation import (
-    # Chrome (Personal Profile - No ChromeDriver!)
-    open_chrome_personal,
-    chrome_search_google,
-    chrome_open_youtube,
-    chrome_click_first_result,
-
-    # WhatsApp Desktop Automation
-    open_whatsapp_desktop,
-    whatsapp_send_message,
-    whatsapp_send_bulk_messages,
-
-    # Vision-Based Automation
-    click_at_coordinates,
-    type_text_gui,
-    press_keyboard_shortcut,
-    scroll_page
-)
-
-# Import intelligent vision tools (preferred over hardcoded coordinates)
-from .intelligent_vision import (
-    intelligent_chrome_search_google,
-    intelligent_chrome_open_youtube,
-    intelligent_chrome_click_first_result,
-)
-
-from .windows_tools import (
-    # Window Management
-    get_active_window,
-    list_all_windows,
-    focus_window,
-    minimize_window,
-    maximize_window,
-
-    # System Information
-    get_system_info,
-    get_resource_usage,
-    get_battery_status,
-
-    # Clipboard
-    get_clipboard,
-    set_clipboard,
-
-    # Keyboard & Mouse
-    type_text,
-    press_key,
-    hotkey,
-    click_at,
-    get_mouse_position,
-
-    # Screenshots & Screen
-    take_screenshot,
-    get_screen_resolution,
-
-    # Network
-    get_network_info,
-    check_internet_connection,
-
-    # Sound & Volume
-    get_volume,
-    set_volume as windows_set_volume,
-    mute_volume,
-    unmute_volume,
-
-    # Power
-    lock_computer,
-    shutdown_computer,
-    restart_computer,
-    sleep_computer
-)
-
-# Import NEW productivity tools
-from .productivity_tools import (
-    # Email
-    draft_email,
-    check_screen_for_text,
-
-    # Documents
-    open_word,
-    open_excel,
-    open_powerpoint,
-    create_word_document,
-    create_excel_spreadsheet,
+import importlib
+import threading
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class LazyToolRegistry(MutableMapping):
+    """
+    Tool name -> function mapping that imports each tool module on first use
+
+    The tool modules pull in pyautogui, OpenCV, Tesseract, Selenium and the
+    model SDKs, so importing them all up front dominated startup. Names,
+    order, len() and membership come from the spec table without importing
+    anything; looking a tool up loads its module once. Tools registered at
+    runtime (generated by the agents) are stored directly.
+    """
+
+    def __init__(self, specs: Dict[str, Tuple[str, str]]):
+        """
+        Args:
+            specs: Tool name -> (module within hands, attribute name)
+        """
+        self._specs: Dict[str, Optional[Tuple[str, str]]] = dict(specs)
+        self._loaded: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Callable:
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        module, attr = self._specs[name]
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = getattr(importlib.import_module(f".{module}", __name__), attr)
+            return self._loaded[name]
+
+    def __setitem__(self, name: str, fn: Callable):
+        with self._lock:
+            self._specs.setdefault(name, None)
+            self._loaded[name] = fn
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            del self._specs[name]
+            self._loaded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def prefetch(self, names: Iterable[str]) -> int:
+        """
+        Import the modules behind the given tools ahead of their first use
+
+        Unknown names and tools whose module fails to import are skipped (the
+        error resurfaces when the tool is actually called).
+
+        Returns:
+            Number of tools loaded by this call
+        """
+        loaded = 0
+        for name in names:
+            if self._specs.get(name) is None or name in self._loaded:
+                continue
+            try:
+                self[name]
+            except Exception:
+                continue
+            loaded += 1
+        return loaded
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self._specs)} tools, {len(self._loaded)} loaded)"
 
-    # Live Typing Tools
-    open_word_and_type,
-    open_excel_and_enter_data,
-    type_in_active_window,
-
-    # Notepad
-    open_notepad,
-    save_notepad,
-
-    # Calendar & Reminders
-    create_reminder,
-    list_reminders,
-
-    # Web Search
-    search_web,
-    open_website,
-
-    # File Organization
-    organize_downloads,
-    find_large_files,
-
-    # Quick Actions
-    open_calculator,
-    open_calendar,
-    open_task_manager,
-    open_file_explorer,
-    empty_recycle_bin
-)
-
-# Import NEW AI-powered tools
-from .ai_tools import (
-    # Code Analysis
-    analyze_code_on_screen,
-    fix_code_errors,
-    explain_code,
-    optimize_code,
-
-    # Writing Assistance
-    improve_writing,
-    generate_email_reply,
-    summarize_text,
-
-    # Screen Reading
-    read_screen_text,
-    extract_text_from_image,
-    analyze_screen_with_ai,
-
-    # AI Tasks
-    translate_text,
-    generate_code,
-    answer_question,
-    brainstorm_ideas,
-
-    # Document Analysis
-    analyze_document_structure,
-    extract_key_points
-)
 
 # Complete Tool Registry - ALL Windows Capabilities (80+ tools!)
-TOOL_REGISTRY = {
+# Tool name -> (hands module, function name); read-only, runtime tools go
+# into TOOL_REGISTRY itself
+_TOOL_SPECS = MappingProxyType({
     # ===== FILE & FOLDER MANAGEMENT =====
-    "create_folder": create_folder,
-    "delete_file_or_folder": delete_file_or_folder,
-    "list_directory": list_directory,
-    "get_desktop_path": get_desktop_path,
-    "get_documents_path": get_documents_path,
+    "create_folder": ("os_tools", "create_folder"),
+    "delete_file_or_folder": ("os_tools", "delete_file_or_folder"),
+    "list_directory": ("os_tools", "list_directory"),
+    "get_desktop_path": ("os_tools", "get_desktop_path"),
+    "get_documents_path": ("os_tools", "get_documents_path"),
 
     # ===== APPLICATION CONTROL =====
-    "launch_application": launch_application,
-    "kill_process": kill_process,
-    "get_running_processes": get_running_processes,
+    "launch_application": ("os_tools", "launch_application"),
+    "kill_process": ("os_tools", "kill_process"),
+    "get_running_processes": ("os_tools", "get_running_processes"),
 
     # ===== WINDOW MANAGEMENT =====
-    "get_active_window": get_active_window,
-    "list_all_windows": list_all_windows,
-    "focus_window": focus_window,
-    "minimize_window": minimize_window,
-    "maximize_window": maximize_window,
+    "get_active_window": ("windows_tools", "get_active_window"),
+    "list_all_windows": ("windows_tools", "list_all_windows"),
+    "focus_window": ("windows_tools", "focus_window"),
+    "minimize_window": ("windows_tools", "minimize_window"),
+    "maximize_window": ("windows_tools", "maximize_window"),
 
     # ===== CHROME AUTOMATION (PERSONAL PROFILE) =====
-    "open_chrome": open_chrome_personal,
+    "open_chrome": ("vision_automation", "open_chrome_personal"),
     # Use intelligent vision-based tools (adapts to any layout)
-    "search_google": intelligent_chrome_search_google,
-    "open_youtube": intelligent_chrome_open_youtube,
-    "click_first_result": intelligent_chrome_click_first_result,
+    "search_google": ("intelligent_vision", "intelligent_chrome_search_google"),
+    "open_youtube": ("intelligent_vision", "intelligent_chrome_open_youtube"),
+    "click_first_result": ("intelligent_vision", "intelligent_chrome_click_first_result"),
 
     # ===== WHATSAPP AUTOMATION =====
-    "open_whatsapp": open_whatsapp_desktop,
-    "send_whatsapp_message": whatsapp_send_message,
-    "send_bulk_whatsapp_messages": whatsapp_send_bulk_messages,
+    "open_whatsapp": ("vision_automation", "open_whatsapp_desktop"),
+    "send_whatsapp_message": ("vision_automation", "whatsapp_send_message"),
+    "send_bulk_whatsapp_messages": ("vision_automation", "whatsapp_send_bulk_messages"),
 
     # ===== VISION-BASED GUI AUTOMATION =====
-    "click_coordinates": click_at_coordinates,
-    "type_gui": type_text_gui,
-    "keyboard_shortcut": press_keyboard_shortcut,
-    "scroll": scroll_page,
+    "click_coordinates": ("vision_automation", "click_at_coordinates"),
+    "type_gui": ("vision_automation", "type_text_gui"),
+    "keyboard_shortcut": ("vision_automation", "press_keyboard_shortcut"),
+    "scroll": ("vision_automation", "scroll_page"),
 
     # ===== DEVELOPMENT & CODING =====
-    "create_project": create_project,
-    "write_file": write_file,
-    "read_file": read_file,
-    "open_in_vscode": open_in_vscode,
-    "run_python_script": run_python_script,
-    "install_package": install_package,
-    "create_snake_game": create_snake_game,
+    "create_project": ("coding_tools", "create_project"),
+    "write_file": ("coding_tools", "write_file"),
+    "read_file": ("coding_tools", "read_file"),
+    "open_in_vscode": ("coding_tools", "open_in_vscode"),
+    "run_python_script": ("coding_tools", "run_python_script"),
+    "install_package": ("coding_tools", "install_package"),
+    "create_snake_game": ("coding_tools", "create_snake_game"),
 
     # ===== SYSTEM INFORMATION =====
-    "get_system_info": get_system_info,
-    "get_resource_usage": get_resource_usage,
-    "get_battery_status": get_battery_status,
-    "get_network_info": get_network_info,
-    "check_internet_connection": check_internet_connection,
-    "get_screen_resolution": get_screen_resolution,
+    "get_system_info": ("windows_tools", "get_system_info"),
+    "get_resource_usage": ("windows_tools", "get_resource_usage"),
+    "get_battery_status": ("windows_tools", "get_battery_status"),
+    "get_network_info": ("windows_tools", "get_network_info"),
+    "check_internet_connection": ("windows_tools", "check_internet_connection"),
+    "get_screen_resolution": ("windows_tools", "get_screen_resolution"),
 
     # ===== CLIPBOARD OPERATIONS =====
-    "get_clipboard": get_clipboard,
-    "set_clipboard": set_clipboard,
+    "get_clipboard": ("windows_tools", "get_clipboard"),
+    "set_clipboard": ("windows_tools", "set_clipboard"),
 
     # ===== KEYBOARD & MOUSE AUTOMATION =====
-    "type_text": type_text,
-    "press_key": press_key,
-    "hotkey": hotkey,
-    "click_at": click_at,
-    "get_mouse_position": get_mouse_position,
+    "type_text": ("windows_tools", "type_text"),
+    "press_key": ("windows_tools", "press_key"),
+    "hotkey": ("windows_tools", "hotkey"),
+    "click_at": ("windows_tools", "click_at"),
+    "get_mouse_position": ("windows_tools", "get_mouse_position"),
 
     # ===== SCREENSHOTS & SCREEN =====
-    "take_screenshot": take_screenshot,
+    "take_screenshot": ("windows_tools", "take_screenshot"),
 
     # ===== SOUND & VOLUME =====
-    "get_volume": get_volume,
-    "set_volume": windows_set_volume,
-    "mute_volume": mute_volume,
-    "unmute_volume": unmute_volume,
+    "get_volume": ("windows_tools", "get_volume"),
+    "set_volume": ("windows_tools", "set_volume"),
+    "mute_volume": ("windows_tools", "mute_volume"),
+    "unmute_volume": ("windows_tools", "unmute_volume"),
 
     # ===== POWER MANAGEMENT =====
-    "lock_computer": lock_computer,
-    "shutdown_computer": shutdown_computer,
-    "restart_computer": restart_computer,
-    "sleep_computer": sleep_computer,
+    "lock_computer": ("windows_tools", "lock_computer"),
+    "shutdown_computer": ("windows_tools", "shutdown_computer"),
+    "restart_computer": ("windows_tools", "restart_computer"),
+    "sleep_computer": ("windows_tools", "sleep_computer"),
 
     # ===== EMAIL & COMMUNICATION =====
-    "draft_email": draft_email,
-    "check_screen_for_text": check_screen_for_text,
+    "draft_email": ("productivity_tools", "draft_email"),
+    "check_screen_for_text": ("productivity_tools", "check_screen_for_text"),
 
     # ===== DOCUMENT CREATION =====
-    "open_word": open_word,
-    "open_excel": open_excel,
-    "open_powerpoint": open_powerpoint,
-    "create_word_document": create_word_document,
-    "create_excel_spreadsheet": create_excel_spreadsheet,
+    "open_word": ("productivity_tools", "open_word"),
+    "open_excel": ("productivity_tools", "open_excel"),
+    "open_powerpoint": ("productivity_tools", "open_powerpoint"),
+    "create_word_document": ("productivity_tools", "create_word_document"),
+    "create_excel_spreadsheet": ("productivity_tools", "create_excel_spreadsheet"),
 
     # Live Typing Tools
-    "open_word_and_type": open_word_and_type,
-    "open_excel_and_enter_data": open_excel_and_enter_data,
-    "type_in_active_window": type_in_active_window,
+    "open_word_and_type": ("productivity_tools", "open_word_and_type"),
+    "open_excel_and_enter_data": ("productivity_tools", "open_excel_and_enter_data"),
+    "type_in_active_window": ("productivity_tools", "type_in_active_window"),
 
     # ===== NOTEPAD =====
-    "open_notepad": open_notepad,
-    "save_notepad": save_notepad,
+    "open_notepad": ("productivity_tools", "open_notepad"),
+    "save_notepad": ("productivity_tools", "save_notepad"),
 
     # ===== CALENDAR & REMINDERS =====
-    "create_reminder": create_reminder,
-    "list_reminders": list_reminders,
+    "create_reminder": ("productivity_tools", "create_reminder"),
+    "list_reminders": ("productivity_tools", "list_reminders"),
 
     # ===== WEB SEARCH =====
-    "search_web": search_web,
-    "open_website": open_website,
+    "search_web": ("productivity_tools", "search_web"),
+    "open_website": ("productivity_tools", "open_website"),
 
     # ===== FILE ORGANIZATION =====
-    "organize_downloads": organize_downloads,
-    "find_large_files": find_large_files,
+    "organize_downloads": ("productivity_tools", "organize_downloads"),
+    "find_large_files": ("productivity_tools", "find_large_files"),
 
     # ===== QUICK ACTIONS =====
-    "open_calculator": open_calculator,
-    "open_calendar": open_calendar,
-    "open_task_manager": open_task_manager,
-    "open_file_explorer": open_file_explorer,
-    "empty_recycle_bin": empty_recycle_bin,
+    "open_calculator": ("productivity_tools", "open_calculator"),
+    "open_calendar": ("productivity_tools", "open_calendar"),
+    "open_task_manager": ("productivity_tools", "open_task_manager"),
+    "open_file_explorer": ("productivity_tools", "open_file_explorer"),
+    "empty_recycle_bin": ("productivity_tools", "empty_recycle_bin"),
 
     # ===== CODE ANALYSIS (AI-POWERED) =====
-    "analyze_code_on_screen": analyze_code_on_screen,
-    "fix_code_errors": fix_code_errors,
-    "explain_code": explain_code,
-    "optimize_code": optimize_code,
+    "analyze_code_on_screen": ("ai_tools", "analyze_code_on_screen"),
+    "fix_code_errors": ("ai_tools", "fix_code_errors"),
+    "explain_code": ("ai_tools", "explain_code"),
+    "optimize_code": ("ai_tools", "optimize_code"),
 
     # ===== WRITING ASSISTANCE (AI-POWERED) =====
-    "improve_writing": improve_writing,
-    "generate_email_reply": generate_email_reply,
-    "summarize_text": summarize_text,
+    "improve_writing": ("ai_tools", "improve_writing"),
+    "generate_email_reply": ("ai_tools", "generate_email_reply"),
+    "summarize_text": ("ai_tools", "summarize_text"),
 
     # ===== SCREEN READING & OCR =====
-    "read_screen_text": read_screen_text,
-    "extract_text_from_image": extract_text_from_image,
-    "analyze_screen_with_ai": analyze_screen_with_ai,
+    "read_screen_text": ("ai_tools", "read_screen_text"),
+    "extract_text_from_image": ("ai_tools", "extract_text_from_image"),
+    "analyze_screen_with_ai": ("ai_tools", "analyze_screen_with_ai"),
 
     # ===== AI TASKS =====
-    "translate_text": translate_text,
-    "generate_code": generate_code,
-    "answer_question": answer_question,
-    "brainstorm_ideas": brainstorm_ideas,
+    "translate_text": ("ai_tools", "translate_text"),
+    "generate_code": ("ai_tools", "generate_code"),
+    "answer_question": ("ai_tools", "answer_question"),
+    "brainstorm_ideas": ("ai_tools", "brainstorm_ideas"),
 
     # ===== DOCUMENT ANALYSIS =====
-    "analyze_document_structure": analyze_document_structure,
-    "extract_key_points": extract_key_points,
-}
+    "analyze_document_structure": ("ai_tools", "analyze_document_structure"),
+    "extract_key_points": ("ai_tools", "extract_key_points"),
+})
+
+
+TOOL_REGISTRY = LazyToolRegistry(_TOOL_SPECS)
 
-# Tool categories for organization
-TOOL_CATEGORIES = {
-    "File Management": [
+# Tool categories for organization (read-only; tuples keep the display order)
+TOOL_CATEGORIES = MappingProxyType({
+    "File Management": (
         "create_folder", "delete_file_or_folder", "list_directory",
         "get_desktop_path", "get_documents_path", "organize_downloads", "find_large_files"
-    ],
-    "Application Control": [
+    ),
+    "Application Control": (
         "launch_application", "kill_process", "get_running_processes",
         "open_calculator", "open_task_manager", "open_file_explorer"
-    ],
-    "Window Management": [
+    ),
+    "Window Management": (
         "get_active_window", "list_all_windows", "focus_window",
         "minimize_window", "maximize_window"
-    ],
-    "Web Browsing": [
+    ),
+    "Web Browsing": (
         "search_google", "open_youtube", "search_web", "open_website",
         "open_chrome", "click_first_result"
-    ],
-    "Communication": [
+    ),
+    "Communication": (
         "draft_email", "send_whatsapp_message", "send_bulk_whatsapp_messages",
         "generate_email_reply"
-    ],
-    "Documents & Office": [
+    ),
+    "Documents & Office": (
         "open_word", "open_excel", "open_powerpoint", "create_word_document",
         "create_excel_spreadsheet", "open_word_and_type", "open_excel_and_enter_data",
         "type_in_active_window", "open_notepad", "save_notepad"
-    ],
-    "Development & Coding": [
+    ),
+    "Development & Coding": (
         "create_project", "write_file", "read_file", "open_in_vscode",
         "run_python_script", "install_package", "create_snake_game"
-    ],
-    "AI Code Analysis": [
+    ),
+    "AI Code Analysis": (
         "analyze_code_on_screen", "fix_code_errors", "explain_code",
         "optimize_code", "generate_code"
-    ],
-    "AI Writing & Content": [
+    ),
+    "AI Writing & Content": (
         "improve_writing", "summarize_text", "translate_text",
         "answer_question", "brainstorm_ideas"
-    ],
-    "Screen & Document Reading": [
+    ),
+    "Screen & Document Reading": (
         "take_screenshot", "read_screen_text", "extract_text_from_image",
         "check_screen_for_text", "analyze_document_structure", "extract_key_points"
-    ],
-    "Productivity & Calendar": [
+    ),
+    "Productivity & Calendar": (
         "create_reminder", "list_reminders", "open_calendar", "empty_recycle_bin"
-    ],
-    "System Information": [
+    ),
+    "System Information": (
         "get_system_info", "get_resource_usage", "get_battery_status",
         "get_network_info", "check_internet_connection", "get_screen_resolution"
-    ],
-    "Automation": [
+    ),
+    "Automation": (
         "type_text", "press_key", "hotkey", "click_at",
         "get_mouse_position", "get_clipboard", "set_clipboard"
-    ],
-    "Audio & Volume": [
+    ),
+    "Audio & Volume": (
         "get_volume", "set_volume", "mute_volume", "unmute_volume"
-    ],
-    "Power Management": [
+    ),
+    "Power Management": (
         "lock_computer", "shutdown_computer", "restart_computer", "sleep_computer"
-    ]
-}
+    )
+})
 
-# Total tool count
-TOTAL_TOOLS = len(TOOL_REGISTRY)
+# Total tool count (from the spec table, so nothing is imported)
+TOTAL_TOOLS = len(_TOOL_SPECS)
 print(f"GLOW loaded with {TOTAL_TOOLS} tools!")
 
-__all__ = ["TOOL_REGISTRY", "TOOL_CATEGORIES"]
+__all__ = ["TOOL_REGISTRY", "TOOL_CATEGORIES", "LazyToolRegistry"]
@@ -285,6 +285,10 @@ Provide a clear, detailed analysis focusing on the most important information vi
     return analysis
 
 
+# Set once Tesseract has been found, so later OCR calls skip the path probing
+_tesseract_ready = False
+
+
 def _configure_tesseract() -> bool:
     """
     Configure Tesseract OCR path for Windows
@@ -292,6 +296,10 @@ def _configure_tesseract() -> bool:
     Returns:
         True if Tesseract is found and configured, False otherwise
     """
+    global _tesseract_ready
+    if _tesseract_ready:
+        return True
+
     import pytesseract
     
     # Common Tesseract installation paths on Windows
@@ -305,16 +313,34 @@ def _configure_tesseract() -> bool:
     for path in tesseract_paths:
         if os.path.exists(path):
             pytesseract.pytesseract.tesseract_cmd = path
+            _tesseract_ready = True
             return True
     
     # Check if tesseract is in PATH
     import shutil
     if shutil.which("tesseract"):
+        _tesseract_ready = True
         return True
     
     return False
 
 
+def _ocr_image(image) -> str:
+    """
+    Run Tesseract on a PIL image
+
+    Tesseract itself runs as a separate process; what happens in ours is
+    writing the image to a temp PNG for it. Tesseract binarizes from
+    grayscale anyway, so converting first loses nothing it uses and leaves
+    a third of the pixel data to encode and hand over.
+    """
+    import pytesseract
+
+    if image.mode not in ("L", "1"):
+        image = image.convert("L")
+    return pytesseract.image_to_string(image)
+
+
 def read_screen_text() -> str:
     """
     Extract all text from current screen using OCR (Tesseract)
@@ -338,7 +364,7 @@ def read_screen_text() -> str:
         screenshot = pyautogui.screenshot()
         
         # Extract text
-        text = pytesseract.image_to_string(screenshot)
+        text = _ocr_image(screenshot)
         
         if not text.strip():
             return "No text found on screen"
@@ -374,7 +400,7 @@ def extract_text_from_image(image_path: str) -> str:
             )
         
         image = Image.open(image_path)
-        text = pytesseract.image_to_string(image)
+        text = _ocr_image(image)
         
         if not text.strip():
             return f"No text found in {image_path}"
@@ -61,8 +61,9 @@ def check_screen_for_text(search_text: str) -> str:
         # Take screenshot
         screenshot = pyautogui.screenshot()
 
-        # OCR to extract text
-        text = pytesseract.image_to_string(screenshot)
+        # OCR to extract text (grayscale, which Tesseract binarizes from
+        # anyway, so there's less image data to encode for its process)
+        text = pytesseract.image_to_string(screenshot.convert("L"))
 
         if search_text.lower() in text.lower():
             return f"Found '{search_text}' on screen"
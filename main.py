@@ -17,6 +17,11 @@ import json
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -60,8 +65,8 @@ class GLOW:
             print(f"[WARNING] Config file not found. Creating default config...")
             self._create_default_config(config_path)
 
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        data = Path(config_path).read_bytes()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
 
         print(f"[OK] Configuration loaded")
         print(f"  Model: {config.get('conversational_model', 'Unknown')}")
@@ -135,8 +140,11 @@ class GLOW:
                 "wake_word_enabled": False
             }
 
-        with open(config_path, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        if orjson is not None:
+            Path(config_path).write_bytes(orjson.dumps(default_config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(config_path, 'w') as f:
+                json.dump(default_config, f, indent=2)
 
         print(f"\n[OK] Configuration saved to {config_path}")
         print(f"[OK] Using: {model_name}")
@@ -206,7 +214,9 @@ class GLOW:
 
         self.agent_system = MultiAgentSystem(
             planner=self.planner,
-            tool_registry=TOOL_REGISTRY
+            tool_registry=TOOL_REGISTRY,
+            verify_sample_rate=self.config.get('verify_sample_rate', 0),
+            fuzzy_plan_cache=self.config.get('fuzzy_plan_cache', False)
         )
 
         print(f"  [OK] Multi-agent system ready")
@@ -257,7 +267,13 @@ class GLOW:
             try:
                 from ears.transcriber import Transcriber
                 print(f"  Loading Whisper transcriber...")
-                self.transcriber = Transcriber(model_size="base", compute_type="int8")
+                self.transcriber = Transcriber(
+                    model_size=self.config.get('whisper_model', 'base'),
+                    device=self.config.get('whisper_device', 'auto'),
+                    silence_duration=self.config.get('whisper_silence_duration', 1.5),
+                    beam_size=self.config.get('whisper_beam_size', 1),
+                    vad_filter=self.config.get('whisper_vad_filter', True)
+                )
                 print(f"  [OK] Transcriber ready")
             except Exception as e:
                 print(f"  [SKIP] Transcriber not available: {e}")